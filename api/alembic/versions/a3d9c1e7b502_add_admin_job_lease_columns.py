@@ -0,0 +1,42 @@
+"""add lease/heartbeat columns to admin_jobs
+
+Revision ID: a3d9c1e7b502
+Revises: 18658707bc59
+Create Date: 2026-10-19 10:12:41.204117
+
+"""
+from alembic import op  # noqa: F401
+import sqlalchemy as sa  # noqa: F401
+import sqlmodel # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9c1e7b502'
+down_revision = '18658707bc59'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('admin_jobs', sa.Column('worker_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('admin_jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('admin_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('admin_jobs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_admin_jobs_worker_id'), 'admin_jobs', ['worker_id'], unique=False)
+    # Partial index backing the claim query (queued jobs in FIFO order)
+    op.create_index(
+        'ix_admin_jobs_queued_created_at',
+        'admin_jobs',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_jobs_queued_created_at', table_name='admin_jobs')
+    op.drop_index(op.f('ix_admin_jobs_worker_id'), table_name='admin_jobs')
+    op.drop_column('admin_jobs', 'attempts')
+    op.drop_column('admin_jobs', 'heartbeat_at')
+    op.drop_column('admin_jobs', 'lease_expires_at')
+    op.drop_column('admin_jobs', 'worker_id')
@@ -0,0 +1,26 @@
+"""add checkpoint column to admin_jobs
+
+Revision ID: b7e2f4a91c3d
+Revises: a3d9c1e7b502
+Create Date: 2026-10-19 11:40:05.518902
+
+"""
+from alembic import op  # noqa: F401
+import sqlalchemy as sa  # noqa: F401
+import sqlmodel # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f4a91c3d'
+down_revision = 'a3d9c1e7b502'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('admin_jobs', sa.Column('checkpoint', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('admin_jobs', 'checkpoint')
@@ -0,0 +1,27 @@
+"""add file_sha256 column to admin_jobs
+
+Revision ID: c41f8e2d6a90
+Revises: b7e2f4a91c3d
+Create Date: 2026-10-19 14:02:37.104522
+
+"""
+from alembic import op  # noqa: F401
+import sqlalchemy as sa  # noqa: F401
+import sqlmodel # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f8e2d6a90'
+down_revision = 'b7e2f4a91c3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('admin_jobs', sa.Column('file_sha256', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+    op.create_index(op.f('ix_admin_jobs_file_sha256'), 'admin_jobs', ['file_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_admin_jobs_file_sha256'), table_name='admin_jobs')
+    op.drop_column('admin_jobs', 'file_sha256')
@@ -0,0 +1,46 @@
+"""add catalog_state and catalog_payloads tables
+
+Revision ID: d7a3c19e5b42
+Revises: c41f8e2d6a90
+Create Date: 2026-10-19 16:40:12.518203
+
+"""
+from alembic import op  # noqa: F401
+import sqlalchemy as sa  # noqa: F401
+import sqlmodel # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3c19e5b42'
+down_revision = 'c41f8e2d6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'catalog_state',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("INSERT INTO catalog_state (id, version) VALUES (1, 0)")
+    op.create_table(
+        'catalog_payloads',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('lang', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('body', sa.TEXT(), nullable=True),
+        sa.PrimaryKeyConstraint('kind', 'lang'),
+    )
+    op.create_index(op.f('ix_catalog_payloads_version'), 'catalog_payloads', ['version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_catalog_payloads_version'), table_name='catalog_payloads')
+    op.drop_table('catalog_payloads')
+    op.drop_table('catalog_state')
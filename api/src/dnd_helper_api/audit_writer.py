@@ -0,0 +1,313 @@
+"""Asynchronous, batched writer for `AdminAudit` rows.
+
+Admin changes are captured in the flush hook as compact events: only the
+changed columns for updates (from SQLAlchemy attribute history), the full row
+for creates and deletes. Attributes assigned while expired (e.g. after a
+commit) have no old value in their history; `remember_originals` reads those
+from the row before the flush overwrites it. Events are buffered in `session.info` and handed to
+the writer when the transaction commits; a rollback drops them. A daemon thread
+drains the in-process queue and inserts up to `BATCH_ROWS` rows per statement,
+at least every `FLUSH_SECONDS`.
+
+The queue is bounded by `QUEUE_MAX`; when it is full, callers block instead of
+dropping events. `stop()` drains everything before returning, and events
+submitted while the writer is not running are written synchronously, so a
+clean shutdown loses nothing.
+
+A batch that still fails after `MAX_ATTEMPTS` tries is split into single rows;
+rows that fail on their own are logged as unwritten events (the dead letter)
+and counted in `dead_lettered`, so one bad event cannot stall auditing.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from shared_models.admin_audit import AdminAudit
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as SASession
+
+from dnd_helper_api.utils.serialization import json_value, serialize_instance
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = max(1, int(os.getenv("ADMIN_AUDIT_BATCH_ROWS", "200")))
+FLUSH_SECONDS = max(0.05, float(os.getenv("ADMIN_AUDIT_FLUSH_SECONDS", "0.5")))
+QUEUE_MAX = max(1, int(os.getenv("ADMIN_AUDIT_QUEUE_MAX", "10000")))
+MAX_ATTEMPTS = max(1, int(os.getenv("ADMIN_AUDIT_MAX_ATTEMPTS", "8")))
+
+_PENDING_KEY = "admin_audit_events"
+_ORIGINALS_KEY = "admin_audit_originals"
+
+
+def _row_pk(obj: Any) -> str:
+    for col in obj.__table__.primary_key.columns:  # type: ignore[attr-defined]
+        pk = getattr(obj, col.name)
+        return str(pk) if pk is not None else ""
+    return ""
+
+
+def _unknown_originals(obj: Any) -> list[Any]:
+    """Changed columns of a persistent `obj` whose old value was never loaded."""
+    state = inspect(obj)
+    if state.identity is None:
+        return []
+    unknown = []
+    for col in obj.__table__.columns:  # type: ignore[attr-defined]
+        attr = state.attrs.get(col.name)
+        if attr is None:
+            continue
+        hist = attr.history
+        if hist.added and not hist.deleted and not hist.unchanged:
+            unknown.append(col)
+    return unknown
+
+
+def remember_originals(session: SASession, objs: Iterable[Any]) -> None:
+    """Read the stored values `changed_columns` cannot get from attribute history.
+
+    Call before the flush (the row still holds them); `capture_event` uses them.
+    """
+    originals: dict[int, dict[str, Any]] = {}
+    for obj in objs:
+        unknown = _unknown_originals(obj)
+        if not unknown:
+            continue
+        pk_cols = obj.__table__.primary_key.columns  # type: ignore[attr-defined]
+        identity = inspect(obj).identity
+        row = (
+            session.connection()
+            .execute(
+                select(*unknown).where(*(c == v for c, v in zip(pk_cols, identity, strict=True)))
+            )
+            .mappings()
+            .first()
+        )
+        if row is not None:
+            originals[id(obj)] = dict(row)
+    session.info[_ORIGINALS_KEY] = originals
+
+
+def changed_columns(obj: Any, originals: Optional[dict[str, Any]] = None) -> tuple[dict, dict]:
+    """(before, after) values of the columns whose attribute history changed.
+
+    `originals` supplies old values missing from the history (see `remember_originals`).
+    """
+    state = inspect(obj)
+    originals = originals or {}
+    before: dict[str, Any] = {}
+    after: dict[str, Any] = {}
+    for col in obj.__table__.columns:  # type: ignore[attr-defined]
+        attr = state.attrs.get(col.name)
+        if attr is None:
+            continue
+        hist = attr.history
+        if not hist.has_changes():
+            continue
+        if col.name in originals:
+            old = originals[col.name]
+        else:
+            old = hist.deleted[0] if hist.deleted else None
+        new = hist.added[0] if hist.added else None
+        if old == new:
+            continue
+        before[col.name] = json_value(old)
+        after[col.name] = json_value(new)
+    return before, after
+
+
+def capture_event(
+    session: SASession, op: str, obj: Any, context: dict[str, Optional[str]]
+) -> None:
+    """Build the audit event for `obj` and park it until the transaction commits."""
+    if op == "update":
+        originals = session.info.get(_ORIGINALS_KEY, {}).get(id(obj))
+        before, after = changed_columns(obj, originals)
+        if not after:
+            return
+    elif op == "create":
+        before, after = None, serialize_instance(obj)
+    else:
+        before, after = serialize_instance(obj), None
+    event = {
+        "table_name": obj.__table__.name,  # type: ignore[attr-defined]
+        "row_pk": _row_pk(obj),
+        "operation": op,
+        "before_data": before,
+        "after_data": after,
+        "created_at": datetime.now(timezone.utc),
+        **context,
+    }
+    session.info.setdefault(_PENDING_KEY, []).append(event)
+
+
+def take_pending(session: SASession) -> list[dict]:
+    session.info.pop(_ORIGINALS_KEY, None)
+    return session.info.pop(_PENDING_KEY, None) or []
+
+
+class AuditWriter:
+    """Bounded queue plus one background thread inserting audit rows in batches."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_rows: int = BATCH_ROWS,
+        flush_seconds: float = FLUSH_SECONDS,
+        queue_max: int = QUEUE_MAX,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> None:
+        self.engine = engine
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.max_attempts = max_attempts
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=queue_max)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats: dict[str, Any] = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "dead_lettered": 0,
+            "max_depth": 0,
+            "retrying_rows": 0,
+            "last_flush_at": None,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="admin-audit-writer", daemon=True
+            )
+            self._running = True
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting queued events and write everything still buffered."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error(
+                    "Audit writer did not drain in time",
+                    extra={"queue_depth": self._queue.qsize()},
+                )
+                return
+        # Anything that raced in after the thread's last check
+        leftover = self._drain(self._queue.qsize())
+        if leftover:
+            self._write_with_retry(leftover)
+
+    def submit(self, events: list[dict]) -> None:
+        if not events:
+            return
+        with self._lock:
+            running = self._running
+            self._stats["enqueued"] += len(events)
+        if not running:
+            self._write_with_retry(events)
+            return
+        for event in events:
+            # Blocks when full: back-pressure instead of dropping audit rows
+            self._queue.put(event)
+        with self._lock:
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+            running = self._running
+        if not running:
+            # stop() ran while we were blocked; its final drain may have missed these
+            leftover = self._drain(self._queue.qsize())
+            if leftover:
+                self._write_with_retry(leftover)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": self._running,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "batch_rows": self.batch_rows,
+            "flush_seconds": self.flush_seconds,
+            **self._stats,
+        }
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch: list[dict] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            batch = [first, *self._drain(self.batch_rows - 1)]
+            self._write_with_retry(batch)
+
+    def _write(self, rows: list[dict]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(insert(AdminAudit.__table__), rows)  # type: ignore[attr-defined]
+
+    def _write_with_retry(self, rows: list[dict]) -> None:
+        if self._retry(rows):
+            return
+        if len(rows) > 1:
+            logger.warning(
+                "Audit batch keeps failing, writing it row by row", extra={"rows": len(rows)}
+            )
+        for row in rows:
+            if len(rows) > 1 and self._retry([row], attempts=1):
+                continue
+            self._stats["dead_lettered"] += 1
+            logger.error("Unwritten admin audit event: %s", json.dumps(row, default=str))
+        self._stats["retrying_rows"] = 0
+
+    def _retry(self, rows: list[dict], attempts: Optional[int] = None) -> bool:
+        """Insert `rows` with backoff; False once the attempts are used up."""
+        if attempts is None:
+            # Shutting down (or writing inline): don't hold the caller for long
+            attempts = self.max_attempts if self._running else min(3, self.max_attempts)
+        delay = 0.5
+        for attempt in range(1, attempts + 1):
+            try:
+                self._write(rows)
+            except Exception as exc:  # noqa: BLE001
+                self._stats["failed_batches"] += 1
+                self._stats["retrying_rows"] = len(rows)
+                self._stats["last_error"] = str(exc)[:500]
+                logger.exception("Audit batch insert failed", extra={"rows": len(rows)})
+                if attempt < attempts:
+                    time.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+                continue
+            self._stats["written"] += len(rows)
+            self._stats["batches"] += 1
+            self._stats["retrying_rows"] = 0
+            self._stats["last_flush_at"] = datetime.now(timezone.utc).isoformat()
+            return True
+        return False
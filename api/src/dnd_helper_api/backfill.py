@@ -0,0 +1,206 @@
+"""Recompute the derived columns of monsters and spells over whole tables.
+
+Usage (inside the API container):
+
+    python -m dnd_helper_api.backfill --tables monster,spell --batch-rows 1000
+
+Each table is walked by primary key (`WHERE id > :last ORDER BY id LIMIT n`).
+Every chunk is derived with the batch API (`derive_monster_columns` /
+`derive_spell_columns`) and only the rows whose derived values differ are
+updated, in one short transaction per chunk: no table lock is taken and
+concurrent writes keep going. A row whose `updated_at` moved since the chunk was
+read is left alone, because its writer already derived it.
+
+The last committed id of every table is saved to the state file after each
+chunk, so an interrupted run resumes where it stopped; `--restart` ignores it.
+The state file is removed once all tables are done. The catalog version is
+bumped once at the end when anything changed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Mapping, Sequence
+
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from dnd_helper_api.catalog import bump_catalog_version
+from dnd_helper_api.db import engine as default_engine
+from dnd_helper_api.routers.monsters.derived import (
+    MONSTER_DERIVED_FIELDS,
+    MONSTER_DERIVED_INPUTS,
+    derive_monster_columns,
+)
+from dnd_helper_api.routers.spells.derived import (
+    SPELL_DERIVED_FIELDS,
+    SPELL_DERIVED_INPUTS,
+    derive_spell_columns,
+)
+from shared_models import Monster, Spell
+
+BATCH_ROWS = max(1, int(os.getenv("BACKFILL_BATCH_ROWS", "1000")))
+STATE_PATH = os.getenv("BACKFILL_STATE_PATH", "/tmp/backfill_derived.json")
+
+Derive = Callable[[Mapping[str, Sequence[Any]]], dict[str, list[Any]]]
+
+# table -> (model, input columns, derived columns, batch derivation)
+_SPECS: dict[str, tuple[Any, tuple[str, ...], tuple[str, ...], Derive]] = {
+    Monster.__tablename__: (  # type: ignore[attr-defined]
+        Monster,
+        MONSTER_DERIVED_INPUTS,
+        MONSTER_DERIVED_FIELDS,
+        derive_monster_columns,
+    ),
+    Spell.__tablename__: (  # type: ignore[attr-defined]
+        Spell,
+        SPELL_DERIVED_INPUTS,
+        SPELL_DERIVED_FIELDS,
+        derive_spell_columns,
+    ),
+}
+
+
+def _load_state(path: str) -> dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_state(path: str, state: dict[str, Any]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+
+def backfill_table(
+    engine: Engine,
+    name: str,
+    progress: dict[str, Any],
+    batch_rows: int = BATCH_ROWS,
+    sleep: float = 0.0,
+    on_chunk: Callable[[dict[str, Any]], None] = lambda _: None,
+) -> dict[str, Any]:
+    """Derive one table chunk by chunk, resuming after `progress["last_id"]`."""
+    model, inputs, fields, derive = _SPECS[name]
+    table = model.__table__
+    progress.setdefault("last_id", 0)
+    progress.setdefault("scanned", 0)
+    progress.setdefault("updated", 0)
+    progress.setdefault("skipped", 0)
+    with engine.connect() as conn:
+        progress["total"] = progress["scanned"] + int(
+            conn.execute(
+                select(func.count()).select_from(table).where(table.c.id > progress["last_id"])
+            ).scalar_one()
+        )
+
+    stmt = (
+        update(table)
+        .where(
+            and_(
+                table.c.id == bindparam("row_id"),
+                table.c.updated_at.is_not_distinct_from(bindparam("read_at")),
+            )
+        )
+        .values({f: bindparam(f"new_{f}") for f in fields} | {"updated_at": func.now()})
+    )
+    query = select(table.c.id, table.c.updated_at, *(table.c[c] for c in inputs))
+    while not progress.get("done"):
+        with engine.begin() as conn:
+            rows = conn.execute(
+                query.where(table.c.id > progress["last_id"]).order_by(table.c.id).limit(batch_rows)
+            ).all()
+            if not rows:
+                progress["done"] = True
+                break
+            columns = {c: [row[i + 2] for row in rows] for i, c in enumerate(inputs)}
+            derived = derive(columns)
+            params = [
+                {
+                    "row_id": row[0],
+                    "read_at": row[1],
+                    **{f"new_{f}": derived[f][i] for f in fields},
+                }
+                for i, row in enumerate(rows)
+                if any(derived[f][i] != columns[f][i] for f in fields)
+            ]
+            if params:
+                updated = conn.execute(stmt, params).rowcount
+                progress["updated"] += updated
+                progress["skipped"] += len(params) - updated
+        progress["last_id"] = rows[-1][0]
+        progress["scanned"] += len(rows)
+        on_chunk(progress)
+        if sleep:
+            time.sleep(sleep)
+    return progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute derived monster/spell columns")
+    parser.add_argument(
+        "--tables",
+        default=",".join(_SPECS),
+        help=f"Comma-separated tables (default {','.join(_SPECS)})",
+    )
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help="Rows per chunk")
+    parser.add_argument("--sleep", type=float, default=0.0, help="Pause between chunks, seconds")
+    parser.add_argument("--state", default=STATE_PATH, help="Resume state file")
+    parser.add_argument("--restart", action="store_true", help="Ignore saved progress")
+    args = parser.parse_args()
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    unknown = [t for t in tables if t not in _SPECS]
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(unknown)}")
+
+    state = {} if args.restart else _load_state(args.state)
+    started = time.perf_counter()
+    last_report = 0.0
+
+    def report(name: str, progress: dict[str, Any], force: bool = False) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if not force and now - last_report < 1.0:
+            return
+        last_report = now
+        total = progress.get("total") or 0
+        pct = 100 * progress["scanned"] / total if total else 100
+        elapsed = now - started
+        print(
+            f"{name}: {progress['scanned']}/{total} rows ({pct:.0f}%) "
+            f"updated={progress['updated']} skipped={progress['skipped']} "
+            f"last_id={progress['last_id']} elapsed={elapsed:.1f}s",
+            file=sys.stderr,
+        )
+
+    for name in tables:
+        progress = state.setdefault(name, {})
+        if progress.get("done"):
+            print(f"{name}: already done, skipping", file=sys.stderr)
+            continue
+
+        def on_chunk(p: dict[str, Any], name: str = name) -> None:
+            _save_state(args.state, state)
+            report(name, p)
+
+        backfill_table(default_engine, name, progress, args.batch_rows, args.sleep, on_chunk)
+        _save_state(args.state, state)
+        report(name, progress, force=True)
+
+    if any(state[name].get("updated") for name in tables):
+        with Session(default_engine) as session:
+            print(f"catalog version: {bump_catalog_version(session)}", file=sys.stderr)
+            session.commit()
+    if all(p.get("done") for p in state.values()):
+        os.remove(args.state)
+
+
+if __name__ == "__main__":
+    main()
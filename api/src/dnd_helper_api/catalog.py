@@ -0,0 +1,282 @@
+"""Catalog version and pre-built response bodies for the list/search endpoints.
+
+`catalog_state.version` is bumped in the same transaction as any change to
+monsters, spells or their translations/enum labels: ORM flushes and ORM-level
+DML on those tables mark the session, and the bump runs right before commit.
+The ingest worker defers the bump (`DEFER_BUMP_KEY`) and does it once in its
+post-ingest stage, together with rebuilding the payloads.
+
+The version is a single row, so the bump takes its row lock until the commit:
+concurrent catalog writers serialize on it for the rest of their transaction.
+That is acceptable because catalog writes are admin edits and ingest jobs (one
+bump per job), not request traffic; keep bumping transactions short.
+
+`catalog_payloads` stores the JSON body of each registered read endpoint per
+language. A row is served only while its version is current; on a miss the
+endpoint builds the body and stores it, so every version is built at most once
+per language; a miss is stored in its own short transaction, apart from the
+request's session. List responses carry an ETag derived from the version and answer
+a matching `If-None-Match` with 304. Search and `/list/page` endpoints select
+their matching ids in SQL and map them onto the parsed wrapped list items
+(`items_for_ids`) instead of rebuilding each item. An id the stored payload does
+not have yet (a row committed after the version was read) is built from the
+entity tables by the kind's item builder rather than dropped.
+"""
+
+import itertools
+import json
+import logging
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from shared_models.enums import Language
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as SASession
+
+from shared_models import (
+    CatalogPayload,
+    CatalogState,
+    EnumTranslation,
+    Monster,
+    MonsterTranslation,
+    Spell,
+    SpellTranslation,
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOG_MODELS = (Monster, Spell, MonsterTranslation, SpellTranslation, EnumTranslation)
+CATALOG_TABLES = frozenset(m.__tablename__ for m in CATALOG_MODELS)  # type: ignore[attr-defined]
+
+DEFER_BUMP_KEY = "catalog_bump_deferred"
+_DIRTY_KEY = "catalog_dirty"
+
+# kind -> builder(session, lang) returning the JSON-able response content
+_BUILDERS: dict[str, Callable[[SASession, Language], Any]] = {}
+# kind -> builder(session, lang, ids) returning the wrapped items of those ids
+_ITEM_BUILDERS: dict[str, Callable[[SASession, Language, list[int]], list[Any]]] = {}
+# (kind, lang) -> (version, items by entity id); parsed wrapped lists for search
+_ITEMS: dict[tuple[str, str], tuple[int, dict[int, Any]]] = {}
+
+_state = CatalogState.__table__  # type: ignore[attr-defined]
+_payloads = CatalogPayload.__table__  # type: ignore[attr-defined]
+
+
+def register_payload(
+    kind: str,
+    builder: Callable[[SASession, Language], Any],
+    item_builder: Optional[Callable[[SASession, Language, list[int]], list[Any]]] = None,
+) -> None:
+    _BUILDERS[kind] = builder
+    if item_builder is not None:
+        _ITEM_BUILDERS[kind] = item_builder
+
+
+def payload_kinds() -> list[str]:
+    # Builders are registered when the routers are imported
+    import dnd_helper_api.routers.monsters  # noqa: F401
+    import dnd_helper_api.routers.spells  # noqa: F401
+
+    return sorted(_BUILDERS)
+
+
+@event.listens_for(SASession, "after_flush")
+def _mark_flushed(session: SASession, flush_context) -> None:  # type: ignore[override]
+    changed = itertools.chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, CATALOG_MODELS) for obj in changed):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(SASession, "do_orm_execute")
+def _mark_dml(state) -> None:  # type: ignore[no-untyped-def]
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if getattr(table, "name", None) in CATALOG_TABLES:
+            state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(SASession, "before_commit")
+def _bump_before_commit(session: SASession) -> None:
+    if session.info.get(DEFER_BUMP_KEY):
+        return
+    # Flush first: changes flushed by commit() itself would otherwise be missed
+    session.flush()
+    if session.info.pop(_DIRTY_KEY, False):
+        bump_catalog_version(session)
+
+
+@event.listens_for(SASession, "after_rollback")
+def _clear_after_rollback(session: SASession) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def catalog_version(session: SASession) -> int:
+    return int(session.execute(select(_state.c.version).where(_state.c.id == 1)).scalar() or 0)
+
+
+def bump_catalog_version(session: SASession) -> int:
+    """Increment the version inside the caller's transaction; returns the new value."""
+    stmt = insert(_state).values(id=1, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"version": _state.c.version + 1, "updated_at": func.now()},
+    ).returning(_state.c.version)
+    session.info.pop(_DIRTY_KEY, None)
+    return int(session.execute(stmt).scalar_one())
+
+
+def _render(content: Any) -> str:
+    return JSONResponse(content=jsonable_encoder(content)).body.decode("utf-8")
+
+
+def _lookup(session: SASession, kind: str, lang: Language) -> tuple[int, Optional[str]]:
+    row = session.execute(
+        select(_state.c.version, _payloads.c.body)
+        .select_from(_state)
+        .outerjoin(
+            _payloads,
+            and_(
+                _payloads.c.kind == kind,
+                _payloads.c.lang == lang.value,
+                _payloads.c.version == _state.c.version,
+            ),
+        )
+        .where(_state.c.id == 1)
+    ).first()
+    if row is None:
+        return 0, None
+    return int(row[0]), row[1]
+
+
+def store_payload(conn: Any, kind: str, lang: Language, version: int, body: str) -> None:
+    """Upsert a body; an older version never overwrites a newer one.
+
+    `conn` may be an ORM session or a Core connection; the caller commits.
+    """
+    stmt = insert(_payloads).values(kind=kind, lang=lang.value, version=version, body=body)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["kind", "lang"],
+        set_={
+            "version": stmt.excluded.version,
+            "body": stmt.excluded.body,
+            "updated_at": func.now(),
+        },
+        where=_payloads.c.version < stmt.excluded.version,
+    )
+    conn.execute(stmt)
+
+
+def _cached_body(session: SASession, kind: str, lang: Language) -> tuple[int, str]:
+    version, body = _lookup(session, kind, lang)
+    if body is not None:
+        return version, body
+    body = _render(_BUILDERS[kind](session, lang))
+    try:
+        # Not in the request's transaction: commit only the payload, right away
+        with session.get_bind().begin() as conn:
+            store_payload(conn, kind, lang, version, body)
+    except Exception:
+        logger.warning("Failed to store catalog payload", extra={"kind": kind, "lang": lang.value})
+    return version, body
+
+
+def _etag(kind: str, lang: Language, version: int) -> str:
+    return f'W/"{kind}:{lang.value}:{version}"'
+
+
+def cached_response(
+    session: SASession, kind: str, lang: Language, if_none_match: Optional[str] = None
+) -> Response:
+    """JSON response for `kind` in `lang`, served from the payload table when current.
+
+    The ETag is derived from the catalog version, so a matching `If-None-Match`
+    gets a 304 after a single version lookup, without loading the body.
+    """
+    if if_none_match:
+        version = catalog_version(session)
+        etag = _etag(kind, lang, version)
+        if etag in {tag.strip() for tag in if_none_match.split(",")}:
+            return Response(
+                status_code=304,
+                headers={"ETag": etag, "X-Catalog-Version": str(version)},
+            )
+    version, body = _cached_body(session, kind, lang)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "Content-Language": lang.value,
+            "X-Catalog-Version": str(version),
+            "ETag": _etag(kind, lang, version),
+        },
+    )
+
+
+def cached_items(session: SASession, kind: str, lang: Language) -> dict[int, Any]:
+    """Items of a wrapped list payload keyed by entity id (parsed once per version)."""
+    key = (kind, lang.value)
+    hit = _ITEMS.get(key)
+    if hit is not None and hit[0] == catalog_version(session):
+        return hit[1]
+    version, body = _cached_body(session, kind, lang)
+    items = {item["entity"]["id"]: item for item in json.loads(body)}
+    _ITEMS[key] = (version, items)
+    return items
+
+
+def items_for_ids(session: SASession, kind: str, lang: Language, ids: Iterable[int]) -> list[Any]:
+    """Wrapped items of `ids` in order; ids the payload lacks are built from the tables."""
+    ids = list(ids)
+    items = cached_items(session, kind, lang)
+    missing = [i for i in ids if i not in items]
+    if missing:
+        logger.info(
+            "Catalog payload lacks items, building them",
+            extra={"kind": kind, "lang": lang.value, "count": len(missing)},
+        )
+        built = json.loads(_render(_ITEM_BUILDERS[kind](session, lang, missing)))
+        items = {**items, **{item["entity"]["id"]: item for item in built}}
+    return [items[i] for i in ids if i in items]
+
+
+class PageOrder(str, Enum):
+    ID = "id"
+    RANDOM = "random"
+
+
+def cached_page(
+    session: SASession,
+    kind: str,
+    lang: Language,
+    model: Any,
+    conditions: list[Any],
+    *,
+    order: PageOrder,
+    limit: int,
+    offset: int,
+) -> dict[str, Any]:
+    """One page of rows matching `conditions`, items taken from the wrapped list payload."""
+    total = session.execute(select(func.count()).select_from(model).where(*conditions)).scalar()
+    order_by = func.random() if order == PageOrder.RANDOM else model.id
+    ids = session.execute(
+        select(model.id).where(*conditions).order_by(order_by).offset(offset).limit(limit)
+    ).scalars()
+    return {
+        "items": items_for_ids(session, kind, lang, ids),
+        "total": int(total or 0),
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+def warm_catalog(session: SASession, version: int) -> int:
+    """Build and store every registered payload for every language; no commit."""
+    built = 0
+    for kind in payload_kinds():
+        for lang in Language:
+            store_payload(session, kind, lang, version, _render(_BUILDERS[kind](session, lang)))
+            built += 1
+    return built
@@ -14,7 +14,14 @@ def _build_database_url() -> str:
 
 
 DATABASE_URL = _build_database_url()
-engine = create_engine(DATABASE_URL, echo=False)
+# Per process: with API_WORKERS > 1 every worker process gets its own pool
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=max(1, int(os.getenv("API_DB_POOL_SIZE", "5"))),
+    max_overflow=max(0, int(os.getenv("API_DB_MAX_OVERFLOW", "10"))),
+    pool_pre_ping=True,
+)
 
 
 def get_session() -> Session:
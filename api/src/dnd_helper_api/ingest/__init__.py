@@ -0,0 +1 @@
+"""Bundle ingest building blocks shared by the admin worker and tooling."""
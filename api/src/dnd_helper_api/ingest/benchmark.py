@@ -0,0 +1,158 @@
+"""Compare bundle ingest throughput of the per-row and bulk (COPY) paths.
+
+Usage (inside the API container):
+
+    python -m dnd_helper_api.ingest.benchmark --rows 5000
+
+Generates a synthetic bundle (monsters, spells and their translations), runs it
+through `_process_job` once per mode on a fresh slug prefix (all inserts) and a
+second time on the same prefix (all unchanged), prints rows/sec and removes the
+generated rows and jobs afterwards.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+import zipfile
+from datetime import timedelta
+from typing import Any
+
+from shared_models.admin_job import AdminJob
+from sqlalchemy import func
+from sqlmodel import Session, delete, select
+
+from dnd_helper_api.db import engine
+from dnd_helper_api.worker import _process_job
+from shared_models import Monster, MonsterTranslation, Spell, SpellTranslation
+
+BENCH_WORKER_ID = "benchmark"
+
+
+def _write_bundle(path: str, prefix: str, rows: int) -> int:
+    monsters = [
+        {
+            "uid": f"m{i}",
+            "slug": f"{prefix}-monster-{i}",
+            "cr": "1/2",
+            "hp": 10 + i % 50,
+            "ac": 12,
+            "type": "beast",
+            "size": "medium",
+            "speeds": {"walk": 30, "fly": 60} if i % 3 == 0 else {"walk": 30},
+            "ability_scores": {"str": 12, "dex": 14, "con": 12, "int": 3, "wis": 12, "cha": 6},
+        }
+        for i in range(rows)
+    ]
+    spells = [
+        {
+            "uid": f"s{i}",
+            "slug": f"{prefix}-spell-{i}",
+            "level": i % 10,
+            "school": "evocation",
+            "classes": ["wizard", "sorcerer"],
+            "range": "60 feet",
+        }
+        for i in range(rows)
+    ]
+    files: list[tuple[str, str, str, list[dict[str, Any]]]] = [
+        ("monsters.jsonl", "monsters", "", monsters),
+        (
+            "monster_translations.en.jsonl",
+            "monster_translations",
+            "en",
+            [{"uid": f"m{i}", "name": f"Monster {i}", "description": "bench"} for i in range(rows)],
+        ),
+        ("spells.jsonl", "spells", "", spells),
+        (
+            "spell_translations.en.jsonl",
+            "spell_translations",
+            "en",
+            [{"uid": f"s{i}", "name": f"Spell {i}", "description": "bench"} for i in range(rows)],
+        ),
+    ]
+    manifest: dict[str, Any] = {"version": 1, "mode": "upsert", "files": []}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for member, ftype, lang, records in files:
+            zf.writestr(member, "\n".join(json.dumps(r) for r in records) + "\n")
+            entry: dict[str, Any] = {"path": member, "type": ftype, "rows": len(records)}
+            if lang:
+                entry["lang"] = lang
+            manifest["files"].append(entry)
+        zf.writestr("manifest.json", json.dumps(manifest))
+    return sum(len(f[3]) for f in files)
+
+
+def _run(bundle_path: str, bulk: bool) -> tuple[float, dict[str, Any]]:
+    with Session(engine) as session:
+        # Pre-claimed with a long lease so that a running worker does not pick it up
+        job = AdminJob(
+            job_type="bundle_ingest",
+            status="running",
+            file_path=bundle_path,
+            args={"bulk": bulk},
+            worker_id=BENCH_WORKER_ID,
+            lease_expires_at=func.now() + timedelta(days=1),
+        )
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        started = time.perf_counter()
+        _process_job(session, job)
+        elapsed = time.perf_counter() - started
+        session.refresh(job)
+        if job.status != "succeeded":
+            raise SystemExit(f"benchmark job failed ({'bulk' if bulk else 'per-row'}): {job.error}")
+        return elapsed, (job.counters or {}).get("summary") or {}
+
+
+def _cleanup(prefixes: list[str]) -> None:
+    with Session(engine) as session:
+        for prefix in prefixes:
+            pattern = f"{prefix}-%"
+            monster_ids = select(Monster.id).where(Monster.slug.like(pattern))  # type: ignore[attr-defined]
+            spell_ids = select(Spell.id).where(Spell.slug.like(pattern))  # type: ignore[attr-defined]
+            for stmt in (
+                delete(MonsterTranslation).where(MonsterTranslation.monster_id.in_(monster_ids)),  # type: ignore[attr-defined]
+                delete(SpellTranslation).where(SpellTranslation.spell_id.in_(spell_ids)),  # type: ignore[attr-defined]
+                delete(Monster).where(Monster.slug.like(pattern)),  # type: ignore[attr-defined]
+                delete(Spell).where(Spell.slug.like(pattern)),  # type: ignore[attr-defined]
+            ):
+                session.exec(stmt)  # type: ignore[call-overload]
+        session.exec(delete(AdminJob).where(AdminJob.worker_id == BENCH_WORKER_ID))  # type: ignore[call-overload, arg-type]
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs bulk bundle ingest")
+    parser.add_argument("--rows", type=int, default=2000, help="Entities per type (default 2000)")
+    parser.add_argument(
+        "--modes",
+        default="row,bulk",
+        help="Comma-separated modes to run: row, bulk (default both)",
+    )
+    args = parser.parse_args()
+    modes = [m.strip() for m in args.modes.split(",") if m.strip() in {"row", "bulk"}]
+    run_id = uuid.uuid4().hex[:8]
+    prefixes: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for mode in modes:
+                prefix = f"bench-{run_id}-{mode}"
+                prefixes.append(prefix)
+                bundle_path = os.path.join(tmp, f"{prefix}.zip")
+                total = _write_bundle(bundle_path, prefix, args.rows)
+                for label in ("insert", "rerun"):
+                    elapsed, summary = _run(bundle_path, bulk=(mode == "bulk"))
+                    print(
+                        f"{mode:>4} {label:<6} rows={total} time={elapsed:.2f}s "
+                        f"rows/sec={total / elapsed if elapsed else 0:.0f} summary={summary}"
+                    )
+        finally:
+            _cleanup(prefixes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,770 @@
+"""Bulk bundle ingest: COPY into temp staging tables, then set-based merges.
+
+Used for `bundle_ingest` jobs enqueued with `bulk=true` and for bundles whose
+manifest `mode` is `tombstone` or `authoritative_snapshot`. Records are checked
+while streaming, written with psycopg `COPY` into session-local temp tables, and
+merged with a few `UPDATE ... FROM` / `INSERT ... ON CONFLICT` statements per
+file. Deletes are anti-join/semi-join `DELETE`s against the staged slugs. Temp
+tables are not WAL-logged and disappear at commit.
+
+The whole bundle runs in the caller's transaction: it is merged completely or
+not at all. Bulk runs therefore do not checkpoint; a reclaimed job starts over.
+
+Semantics follow the per-row path: entity records go through the same
+acceptance rules (`ingest.records`), entities match by `slug` (last record wins
+inside a file), and on update only the columns a record sent are written (each
+staged row carries its own `sent` column list). Derived columns are computed
+once per batch with `derive_monster_columns` / `derive_spell_columns`, from the
+record merged over the stored row. Stage tables carry the target's CHECK
+constraints; a batch the database refuses in `COPY` is retried row by row under
+savepoints, and rows that would break a NOT NULL column are dropped before the
+merge, so a bad value fails its record only. Translations
+resolve `uid`s against entities from this bundle.
+"""
+
+import logging
+import os
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+from psycopg import sql
+from psycopg.types.json import Jsonb
+from shared_models.enums import Language
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session as SASession
+
+from dnd_helper_api.ingest.records import (
+    monster_slug,
+    prepare_monster,
+    prepare_spell,
+    spell_slug,
+)
+from dnd_helper_api.job_progress import JobProgress
+from dnd_helper_api.routers.monsters.derived import (
+    MONSTER_DERIVED_FIELDS,
+    MONSTER_DERIVED_INPUTS,
+    derive_monster_columns,
+)
+from dnd_helper_api.routers.spells.derived import (
+    SPELL_DERIVED_FIELDS,
+    SPELL_DERIVED_INPUTS,
+    derive_spell_columns,
+)
+from shared_models import Monster, Spell
+
+logger = logging.getLogger(__name__)
+
+# Records validated/derived and written to COPY per batch
+BATCH_ROWS = max(1, int(os.getenv("ADMIN_INGEST_BULK_BATCH_ROWS", "2000")))
+
+_AUDIT_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+def _entity_columns(model: Any) -> list[str]:
+    return [c.name for c in model.__table__.columns if c.name not in _AUDIT_COLUMNS]
+
+
+def _required_columns(model: Any) -> list[str]:
+    """NOT NULL columns without a default: a new row must send them."""
+    return [
+        c.name
+        for c in model.__table__.columns
+        if not c.nullable and c.server_default is None and c.name not in _AUDIT_COLUMNS
+    ]
+
+
+def _jsonb_columns(model: Any) -> set[str]:
+    return {c.name for c in model.__table__.columns if isinstance(c.type, JSONB)}
+
+
+def _copy_value(value: Any, is_jsonb: bool) -> Any:
+    if value is None:
+        return None
+    if is_jsonb:
+        return Jsonb(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [v.value if isinstance(v, Enum) else v for v in value]
+    return value
+
+
+_ENTITY_SPECS: dict[str, dict[str, Any]] = {
+    "monsters": {
+        "model": Monster,
+        "table": "monster",
+        "slug": monster_slug,
+        "prepare": prepare_monster,
+        "derived": (MONSTER_DERIVED_INPUTS, MONSTER_DERIVED_FIELDS, derive_monster_columns),
+        "translations": ("monster_translations", "monster_id"),
+    },
+    "spells": {
+        "model": Spell,
+        "table": "spell",
+        "slug": spell_slug,
+        "prepare": prepare_spell,
+        "derived": (SPELL_DERIVED_INPUTS, SPELL_DERIVED_FIELDS, derive_spell_columns),
+        "translations": ("spell_translations", "spell_id"),
+    },
+}
+
+# Translation files: staged columns and how ON CONFLICT updates each one.
+# "keep_blank" columns keep the stored value when the record's value is empty/null,
+# mirroring the per-row path (`if raw.get("name"): mt.name = ...`).
+_TRANSLATION_SPECS: dict[str, dict[str, Any]] = {
+    "monster_translations": {
+        "table": "monster_translations",
+        "entity": "monster",
+        "fk": "monster_id",
+        "columns": [
+            "name", "description", "traits", "actions", "reactions",
+            "legendary_actions", "spellcasting", "languages_text",
+        ],
+        "jsonb": {"traits", "actions", "reactions", "legendary_actions", "spellcasting"},
+        "keep_blank": {"name", "description"},
+        "keep_null": {"languages_text"},
+    },
+    "spell_translations": {
+        "table": "spell_translations",
+        "entity": "spell",
+        "fk": "spell_id",
+        "columns": ["name", "description"],
+        "jsonb": set(),
+        "keep_blank": {"name", "description"},
+        "keep_null": set(),
+    },
+}
+
+
+def _ident_list(names: Iterable[str], prefix: Optional[str] = None) -> sql.Composed:
+    if prefix:
+        return sql.SQL(", ").join(sql.Identifier(prefix, n) for n in names)
+    return sql.SQL(", ").join(sql.Identifier(n) for n in names)
+
+
+def _compared(expr: sql.Composable, is_jsonb: bool) -> sql.Composable:
+    """`expr` for change detection: a JSON null reads back as None like SQL NULL does."""
+    if is_jsonb:
+        return sql.SQL("NULLIF({}, 'null'::jsonb)").format(expr)
+    return expr
+
+
+def _create_stage(cur: Any, stage: str, table: str, columns: list[str], extra: str) -> None:
+    # Same column types and CHECK constraints as the target table, so a bad value
+    # fails its own row in COPY; no NOT NULL, keys or defaults
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+            sql.Identifier(stage), _ident_list(columns), sql.Identifier(table)
+        )
+    )
+    checks = cur.execute(
+        "SELECT pg_get_constraintdef(c.oid), array_agg(a.attname::text)"
+        " FROM pg_constraint c"
+        " JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)"
+        " WHERE c.conrelid = %s::regclass AND c.contype = 'c' GROUP BY c.oid",
+        (table,),
+    ).fetchall()
+    for definition, check_columns in checks:
+        if set(check_columns) <= set(columns):
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD ").format(sql.Identifier(stage)) + sql.SQL(definition)
+            )
+    cur.execute(sql.SQL("ALTER TABLE {} " + extra).format(sql.Identifier(stage)))
+
+
+def _copy_rows(cur: Any, stage: str, columns: list[str], rows: Iterable[tuple]) -> None:
+    with cur.copy(
+        sql.SQL("COPY {} ({}) FROM STDIN").format(sql.Identifier(stage), _ident_list(columns))
+    ) as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def _copy_batch(
+    cur: Any, stage: str, columns: list[str], rows: list[tuple], path: str
+) -> list[tuple]:
+    """COPY one batch (rows start with their line number); returns the rejected rows.
+
+    When the database refuses the batch (a value its column type cannot take),
+    it is retried one row per savepoint so that only the offending records fail.
+    """
+    cur.execute("SAVEPOINT bulk_batch")
+    try:
+        _copy_rows(cur, stage, columns, rows)
+    except Exception:  # noqa: BLE001
+        cur.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+    else:
+        cur.execute("RELEASE SAVEPOINT bulk_batch")
+        return []
+    rejected: list[tuple] = []
+    for row in rows:
+        cur.execute("SAVEPOINT bulk_row")
+        try:
+            _copy_rows(cur, stage, columns, [row])
+        except Exception as exc:  # noqa: BLE001
+            cur.execute("ROLLBACK TO SAVEPOINT bulk_row")
+            rejected.append(row)
+            logger.warning("Bulk ingest: invalid record %s:%s: %s", path, row[0], exc)
+        else:
+            cur.execute("RELEASE SAVEPOINT bulk_row")
+    cur.execute("RELEASE SAVEPOINT bulk_batch")
+    return rejected
+
+
+def _stage_batches(
+    records: Iterable[Any],
+    build_row: Callable[[dict], Optional[Any]],
+    stats: dict[str, Any],
+    progress: JobProgress,
+    path: str,
+) -> Iterable[list[Any]]:
+    """Check records into rows, yielding them in batches of `BATCH_ROWS`."""
+    batch: list[Any] = []
+    for line_no, rec in enumerate(records, start=1):
+        stats["processed"] += 1
+        try:
+            if not isinstance(rec, dict):
+                raise ValueError("record must be a JSON object")
+            row = build_row(dict(rec, __line_no=line_no))
+            if row is None:
+                stats["failed"] += 1
+            else:
+                batch.append(row)
+        except Exception as exc:  # noqa: BLE001
+            stats["failed"] += 1
+            logger.warning("Bulk ingest: invalid record %s:%s: %s", path, line_no, exc)
+        finally:
+            progress.row_done()
+        if len(batch) >= BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _ensure_uid_map(cur: Any) -> None:
+    cur.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS ingest_uid_map ("
+        " entity text NOT NULL, uid text NOT NULL, id integer NOT NULL,"
+        " PRIMARY KEY (entity, uid)) ON COMMIT DROP"
+    )
+
+
+def _derive_batch(
+    cur: Any, spec: dict[str, Any], batch: list[dict[str, Any]], path: str
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Fill the derived columns of a batch of prepared records; returns (derived, failed).
+
+    As in the per-row path, inputs a record does not send keep their stored
+    value, so the batch's current rows are read first and the derivation runs
+    once over the merged columns.
+    """
+    inputs, fields, derive = spec["derived"]
+    cur.execute(
+        sql.SQL("SELECT slug, {} FROM {} WHERE slug = ANY(%s)").format(
+            _ident_list(inputs), sql.Identifier(spec["table"])
+        ),
+        ([rec["data"]["slug"] for rec in batch],),
+    )
+    stored = {row[0]: dict(zip(inputs, row[1:], strict=True)) for row in cur.fetchall()}
+
+    def merged(recs: list[dict[str, Any]]) -> dict[str, list[Any]]:
+        rows = [stored.get(rec["data"]["slug"], {}) | rec["data"] for rec in recs]
+        return {c: [row.get(c) for row in rows] for c in inputs}
+
+    try:
+        derived = derive(merged(batch))
+    except Exception:  # noqa: BLE001
+        # A value the derivation cannot handle: find the records that carry one
+        ok: list[dict[str, Any]] = []
+        failed: list[dict[str, Any]] = []
+        for rec in batch:
+            try:
+                one = derive(merged([rec]))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Bulk ingest: invalid record %s:%s: %s", path, rec["line_no"], exc)
+                failed.append(rec)
+                continue
+            rec["data"].update({c: values[0] for c, values in one.items()})
+            ok.append(rec)
+        return ok, failed
+    for i, rec in enumerate(batch):
+        rec["data"].update({c: derived[c][i] for c in fields})
+    return batch, []
+
+
+def _load_entities(
+    cur: Any,
+    ftype: str,
+    file_index: int,
+    records: Iterable[Any],
+    stats: dict[str, Any],
+    progress: JobProgress,
+    path: str,
+) -> tuple[str, str, int]:
+    """Stage and merge one entity file.
+
+    Returns the names of its deduplicated stage and of the table of slugs whose
+    records failed, plus the number of failed records that name no entity.
+    """
+    spec = _ENTITY_SPECS[ftype]
+    model, table = spec["model"], spec["table"]
+    columns = _entity_columns(model)
+    jsonb_cols = _jsonb_columns(model)
+    stage = f"stage_{table}_{file_index}"
+    failed_before = int(stats["failed"])
+    # Columns sent by at least one record; the others are left out of the UPDATE
+    present: set[str] = set()
+    # One entry per failed record that names its entity
+    failed_slugs: list[str] = []
+
+    def build_row(raw: dict) -> Optional[dict[str, Any]]:
+        line_no = raw.pop("__line_no")
+        uid = str(raw.get("uid") or "").strip() or None
+        slug = spec["slug"](raw)
+        if not slug:
+            return None
+        try:
+            data = spec["prepare"](raw)
+        except Exception:
+            failed_slugs.append(slug)
+            raise
+        return {"line_no": line_no, "uid": uid, "data": data}
+
+    _create_stage(
+        cur, stage, table, columns,
+        "ADD COLUMN line_no bigint, ADD COLUMN uid text, ADD COLUMN sent text[]",
+    )
+    for batch in _stage_batches(records, build_row, stats, progress, path):
+        derived, underived = _derive_batch(cur, spec, batch, path)
+        stats["failed"] += len(underived)
+        failed_slugs.extend(rec["data"]["slug"] for rec in underived)
+        rows = []
+        for rec in derived:
+            data = rec["data"]
+            sent = [c for c in columns if c in data]
+            present.update(sent)
+            rows.append(
+                (rec["line_no"], rec["uid"], sent)
+                + tuple(_copy_value(data.get(c), c in jsonb_cols) for c in columns)
+            )
+        rejected = _copy_batch(cur, stage, ["line_no", "uid", "sent"] + columns, rows, path)
+        stats["failed"] += len(rejected)
+        slug_at = 3 + columns.index("slug")
+        failed_slugs.extend(row[slug_at] for row in rejected)
+
+    dedup = f"{stage}_d"
+    cur.execute(
+        sql.SQL(
+            "CREATE TEMP TABLE {} ON COMMIT DROP AS"
+            " SELECT DISTINCT ON (slug) * FROM {} ORDER BY slug, line_no DESC"
+        ).format(sql.Identifier(dedup), sql.Identifier(stage))
+    )
+    required = _required_columns(model)
+    if required:
+        # The per-row path fails these on the NOT NULL constraint: a new row
+        # without the column, or any row that explicitly sends it as null
+        cur.execute(
+            sql.SQL("DELETE FROM {d} AS s WHERE {cond} RETURNING s.slug").format(
+                d=sql.Identifier(dedup),
+                cond=sql.SQL(" OR ").join(
+                    sql.SQL(
+                        "(s.{c} IS NULL AND ({name} = ANY(s.sent)"
+                        " OR NOT EXISTS (SELECT 1 FROM {t} AS t WHERE t.slug = s.slug)))"
+                    ).format(
+                        c=sql.Identifier(c), name=sql.Literal(c), t=sql.Identifier(table)
+                    )
+                    for c in required
+                ),
+            )
+        )
+        failed_slugs.extend(row[0] for row in cur.fetchall())
+        stats["failed"] += cur.rowcount
+    distinct = cur.execute(
+        sql.SQL("SELECT count(*) FROM {}").format(sql.Identifier(dedup))
+    ).fetchone()[0]
+
+    update_cols = [c for c in columns if c in present and c != "slug"]
+    updated = 0
+    if update_cols:
+        # Columns the record did not send keep the stored value
+        new_values = {
+            c: sql.SQL("CASE WHEN {name} = ANY(s.sent) THEN s.{c} ELSE t.{c} END").format(
+                name=sql.Literal(c), c=sql.Identifier(c)
+            )
+            for c in update_cols
+        }
+        cur.execute(
+            sql.SQL(
+                "UPDATE {t} AS t SET ({cols}, updated_at) = ROW({new}, now())"
+                " FROM {d} AS s"
+                " WHERE t.slug = s.slug AND ROW({dst}) IS DISTINCT FROM ROW({cmp})"
+            ).format(
+                t=sql.Identifier(table),
+                cols=_ident_list(update_cols),
+                new=sql.SQL(", ").join(new_values.values()),
+                dst=sql.SQL(", ").join(
+                    _compared(sql.Identifier("t", c), c in jsonb_cols) for c in update_cols
+                ),
+                cmp=sql.SQL(", ").join(
+                    _compared(new_values[c], c in jsonb_cols) for c in update_cols
+                ),
+                d=sql.Identifier(dedup),
+            )
+        )
+        updated = cur.rowcount
+    cur.execute(
+        sql.SQL(
+            "INSERT INTO {t} ({cols}) SELECT {src} FROM {d} AS s"
+            " WHERE NOT EXISTS (SELECT 1 FROM {t} AS t WHERE t.slug = s.slug)"
+        ).format(
+            t=sql.Identifier(table),
+            cols=_ident_list(columns),
+            src=_ident_list(columns, "s"),
+            d=sql.Identifier(dedup),
+        )
+    )
+    created = cur.rowcount
+    stats["created"] += created
+    stats["updated"] += updated
+    stats["unchanged"] += max(0, distinct - created - updated)
+
+    _ensure_uid_map(cur)
+    cur.execute(
+        sql.SQL(
+            "INSERT INTO ingest_uid_map (entity, uid, id)"
+            " SELECT DISTINCT ON (s.uid) %s, s.uid, t.id"
+            " FROM {d} AS s JOIN {t} AS t ON t.slug = s.slug"
+            " WHERE s.uid IS NOT NULL ORDER BY s.uid, t.id"
+            " ON CONFLICT (entity, uid) DO UPDATE SET id = EXCLUDED.id"
+        ).format(t=sql.Identifier(table), d=sql.Identifier(dedup)),
+        (table,),
+    )
+
+    failed = f"{stage}_failed"
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {} (slug text) ON COMMIT DROP").format(sql.Identifier(failed))
+    )
+    _copy_rows(cur, failed, ["slug"], ((slug,) for slug in failed_slugs))
+    unresolved = int(stats["failed"]) - failed_before - len(failed_slugs)
+    return dedup, failed, unresolved
+
+
+def _delete_ids(cur: Any, spec: dict[str, Any], doomed: str) -> int:
+    """Delete the entities listed in temp table `doomed` (column `id`) and their translations."""
+    tr_table, fk = spec["translations"]
+    cur.execute(
+        sql.SQL("DELETE FROM {} WHERE {} IN (SELECT id FROM {})").format(
+            sql.Identifier(tr_table), sql.Identifier(fk), sql.Identifier(doomed)
+        )
+    )
+    cur.execute(
+        sql.SQL("DELETE FROM {} WHERE id IN (SELECT id FROM {})").format(
+            sql.Identifier(spec["table"]), sql.Identifier(doomed)
+        )
+    )
+    return cur.rowcount
+
+
+def _delete_missing(cur: Any, ftype: str, staged: list[str]) -> int:
+    """authoritative_snapshot: anti-join delete of every entity no `staged` slug table lists."""
+    spec = _ENTITY_SPECS[ftype]
+    doomed = f"doomed_{spec['table']}"
+    not_staged = sql.SQL(" AND ").join(
+        sql.SQL("NOT EXISTS (SELECT 1 FROM {} AS s WHERE s.slug = t.slug)").format(
+            sql.Identifier(d)
+        )
+        for d in staged
+    )
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT t.id FROM {} AS t WHERE {}").format(
+            sql.Identifier(doomed), sql.Identifier(spec["table"]), not_staged
+        )
+    )
+    return _delete_ids(cur, spec, doomed)
+
+
+def _load_tombstones(
+    cur: Any,
+    file_index: int,
+    records: Iterable[Any],
+    stats: dict[str, Any],
+    progress: JobProgress,
+    path: str,
+) -> None:
+    """tombstone mode: delete the listed `{"entity": "monster"|"spell", "slug": ...}` rows."""
+    tables = {spec["table"] for spec in _ENTITY_SPECS.values()}
+    stage = f"stage_tombstones_{file_index}"
+
+    def build_row(raw: dict) -> Optional[tuple]:
+        line_no = raw.pop("__line_no")
+        entity = str(raw.get("entity") or "").strip().lower()
+        slug = str(raw.get("slug") or "").strip()
+        if entity not in tables or not slug:
+            return None
+        return (line_no, entity, slug)
+
+    cur.execute(
+        sql.SQL(
+            "CREATE TEMP TABLE {} (line_no bigint, entity text, slug text) ON COMMIT DROP"
+        ).format(sql.Identifier(stage))
+    )
+    for batch in _stage_batches(records, build_row, stats, progress, path):
+        rejected = _copy_batch(cur, stage, ["line_no", "entity", "slug"], batch, path)
+        stats["failed"] += len(rejected)
+
+    deleted = 0
+    for spec in _ENTITY_SPECS.values():
+        doomed = f"{stage}_{spec['table']}"
+        cur.execute(
+            sql.SQL(
+                "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT t.id FROM {} AS t"
+                " WHERE EXISTS (SELECT 1 FROM {} AS s WHERE s.entity = %s AND s.slug = t.slug)"
+            ).format(sql.Identifier(doomed), sql.Identifier(spec["table"]), sql.Identifier(stage)),
+            (spec["table"],),
+        )
+        deleted += _delete_ids(cur, spec, doomed)
+    distinct = cur.execute(
+        sql.SQL("SELECT count(DISTINCT (entity, slug)) FROM {}").format(sql.Identifier(stage))
+    ).fetchone()[0]
+    stats["deleted"] += deleted
+    # Tombstones for rows that are already gone
+    stats["unchanged"] += max(0, distinct - deleted)
+
+
+def _load_translations(
+    cur: Any,
+    ftype: str,
+    file_index: int,
+    lang: Optional[str],
+    records: Iterable[Any],
+    stats: dict[str, Any],
+    progress: JobProgress,
+    path: str,
+) -> None:
+    if not lang:
+        raise ValueError(f"{ftype} requires lang in manifest entry")
+    lang = Language(lang).value
+    spec = _TRANSLATION_SPECS[ftype]
+    table, fk, columns = spec["table"], spec["fk"], spec["columns"]
+    stage = f"stage_{table}_{file_index}"
+
+    def build_row(raw: dict) -> Optional[tuple]:
+        line_no = raw.pop("__line_no")
+        uid = str(raw.get("uid") or "").strip()
+        if not uid:
+            return None
+        return (line_no, uid) + tuple(
+            _copy_value(raw.get(c), c in spec["jsonb"]) for c in columns
+        )
+
+    _create_stage(cur, stage, table, columns, "ADD COLUMN line_no bigint, ADD COLUMN uid text")
+    for batch in _stage_batches(records, build_row, stats, progress, path):
+        rejected = _copy_batch(cur, stage, ["line_no", "uid"] + columns, batch, path)
+        stats["failed"] += len(rejected)
+
+    _ensure_uid_map(cur)
+    # Records whose uid is not an entity of this bundle fail, as in the per-row path
+    unmatched = cur.execute(
+        sql.SQL(
+            "SELECT count(*) FROM {s} AS s WHERE NOT EXISTS"
+            " (SELECT 1 FROM ingest_uid_map m WHERE m.entity = %s AND m.uid = s.uid)"
+        ).format(s=sql.Identifier(stage)),
+        (spec["entity"],),
+    ).fetchone()[0]
+    stats["failed"] += unmatched
+
+    def new_value(c: str) -> sql.Composable:
+        excluded = sql.Identifier("excluded", c)
+        current = sql.Identifier(table, c)
+        if c in spec["keep_blank"]:
+            return sql.SQL("COALESCE(NULLIF({}, ''), {})").format(excluded, current)
+        if c in spec["keep_null"]:
+            return sql.SQL("COALESCE({}, {})").format(excluded, current)
+        return excluded
+
+    insert_values = sql.SQL(", ").join(
+        sql.SQL("COALESCE({}, '')").format(sql.Identifier("src", c))
+        if c in spec["keep_blank"]
+        else sql.Identifier("src", c)
+        for c in columns
+    )
+    row = cur.execute(
+        sql.SQL(
+            "WITH src AS ("
+            "  SELECT DISTINCT ON (m.id) m.id AS entity_id, s.*"
+            "  FROM {s} AS s JOIN ingest_uid_map m ON m.entity = %s AND m.uid = s.uid"
+            "  ORDER BY m.id, s.line_no DESC"
+            "), up AS ("
+            "  INSERT INTO {t} ({fk}, lang, {cols})"
+            "  SELECT src.entity_id, %s, {ins} FROM src"
+            "  ON CONFLICT ({fk}, lang) DO UPDATE SET ({cols}, updated_at) = ROW({new}, now())"
+            "  WHERE ROW({cur}) IS DISTINCT FROM ROW({cmp})"
+            "  RETURNING (xmax = 0) AS inserted"
+            ")"
+            " SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted),"
+            " (SELECT count(*) FROM src) FROM up"
+        ).format(
+            s=sql.Identifier(stage),
+            t=sql.Identifier(table),
+            fk=sql.Identifier(fk),
+            cols=_ident_list(columns),
+            ins=insert_values,
+            new=sql.SQL(", ").join(new_value(c) for c in columns),
+            cmp=sql.SQL(", ").join(_compared(new_value(c), c in spec["jsonb"]) for c in columns),
+            cur=sql.SQL(", ").join(
+                _compared(sql.Identifier(table, c), c in spec["jsonb"]) for c in columns
+            ),
+        ),
+        (spec["entity"], lang),
+    ).fetchone()
+    created, updated, matched = int(row[0]), int(row[1]), int(row[2])
+    stats["created"] += created
+    stats["updated"] += updated
+    stats["unchanged"] += max(0, matched - created - updated)
+
+
+def _load_keyed(
+    cur: Any,
+    ftype: str,
+    file_index: int,
+    records: Iterable[Any],
+    stats: dict[str, Any],
+    progress: JobProgress,
+    path: str,
+) -> None:
+    """enum_translations / ui_translations: upsert by their unique constraint."""
+    if ftype == "enum_translations":
+        table = "enum_translations"
+        keys = ["enum_type", "enum_value", "lang"]
+        values = ["label", "description", "synonyms"]
+        jsonb: set[str] = {"synonyms"}
+
+        def build_row(raw: dict) -> Optional[tuple]:
+            line_no = raw.pop("__line_no")
+            enum_type = str(raw.get("entity") or raw.get("enum_type") or "").strip()
+            enum_value = str(raw.get("code") or raw.get("enum_value") or "").strip()
+            lang_raw = str(raw.get("lang") or "").strip().lower()
+            label = raw.get("label") if raw.get("label") is not None else raw.get("text")
+            if not (enum_type and enum_value and lang_raw in {"ru", "en"}):
+                return None
+            if not isinstance(label, str):
+                return None
+            return (
+                line_no, enum_type, enum_value, lang_raw, label,
+                raw.get("description"), _copy_value(raw.get("synonyms"), True),
+            )
+    else:
+        table = "ui_translations"
+        keys = ["namespace", "key", "lang"]
+        values = ["text"]
+        jsonb = set()
+
+        def build_row(raw: dict) -> Optional[tuple]:
+            line_no = raw.pop("__line_no")
+            ns = str(raw.get("namespace") or "bot").strip() or "bot"
+            key = str(raw.get("key") or "").strip()
+            lang_raw = str(raw.get("lang") or "").strip().lower()
+            text = raw.get("text")
+            if not (key and lang_raw in {"ru", "en"} and isinstance(text, str)):
+                return None
+            return (line_no, ns, key, lang_raw, text)
+
+    columns = keys + values
+    stage = f"stage_{table}_{file_index}"
+    _create_stage(cur, stage, table, columns, "ADD COLUMN line_no bigint")
+    for batch in _stage_batches(records, build_row, stats, progress, path):
+        rejected = _copy_batch(cur, stage, ["line_no"] + columns, batch, path)
+        stats["failed"] += len(rejected)
+
+    row = cur.execute(
+        sql.SQL(
+            "WITH src AS ("
+            "  SELECT DISTINCT ON ({keys}) * FROM {s} ORDER BY {keys}, line_no DESC"
+            "), up AS ("
+            "  INSERT INTO {t} ({cols}) SELECT {cols} FROM src"
+            "  ON CONFLICT ({keys}) DO UPDATE SET ({vals}, updated_at) = ROW({excl}, now())"
+            "  WHERE ROW({cur}) IS DISTINCT FROM ROW({cmp})"
+            "  RETURNING (xmax = 0) AS inserted"
+            ")"
+            " SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted),"
+            " (SELECT count(*) FROM src) FROM up"
+        ).format(
+            s=sql.Identifier(stage),
+            t=sql.Identifier(table),
+            keys=_ident_list(keys),
+            cols=_ident_list(columns),
+            vals=_ident_list(values),
+            excl=_ident_list(values, "excluded"),
+            cmp=sql.SQL(", ").join(
+                _compared(sql.Identifier("excluded", c), c in jsonb) for c in values
+            ),
+            cur=sql.SQL(", ").join(_compared(sql.Identifier(table, c), c in jsonb) for c in values),
+        )
+    ).fetchone()
+    created, updated, distinct = int(row[0]), int(row[1]), int(row[2])
+    stats["created"] += created
+    stats["updated"] += updated
+    stats["unchanged"] += max(0, distinct - created - updated)
+
+
+def run_bulk_ingest(
+    session: SASession,
+    files: list[dict],
+    read_records: Callable[[dict], Iterable[Any]],
+    progress: JobProgress,
+    mode: str = "upsert",
+) -> None:
+    """Stage and merge every manifest file on the session's connection (no commit).
+
+    `read_records(fdesc)` yields the decoded NDJSON records of one file. `mode`
+    is the manifest mode: `tombstone` bundles may only contain `tombstones`
+    files; `authoritative_snapshot` finally deletes every monster/spell whose
+    slug is absent from the bundle's files of that type. Entities whose records
+    failed are kept as they are; a failed record that names no entity (no slug
+    or name) aborts the snapshot, since it is unknown what it would keep.
+    """
+    cur = session.connection().connection.driver_connection.cursor()
+    # authoritative_snapshot: entity file type -> [(slug tables, unresolved failures, stats)]
+    covered: dict[str, list[tuple[list[str], int, dict[str, Any]]]] = {}
+    try:
+        for file_index, fdesc in enumerate(files):
+            fpath = str((fdesc.get("path") or "")).strip()
+            ftype = str((fdesc.get("type") or "")).strip()
+            flang = str((fdesc.get("lang") or "")).strip().lower() or None
+            if not fpath or not ftype:
+                raise ValueError("Each file entry must include path and type")
+            if (ftype == "tombstones") != (mode == "tombstone"):
+                raise ValueError("mode=tombstone bundles must contain only tombstones files")
+            rows_expected = fdesc.get("rows")
+            stats = progress.start_file(
+                fpath, ftype, rows_expected if isinstance(rows_expected, int) else None
+            )
+            records = read_records(fdesc)
+            if ftype in _ENTITY_SPECS:
+                dedup, failed, unresolved = _load_entities(
+                    cur, ftype, file_index, records, stats, progress, fpath
+                )
+                covered.setdefault(ftype, []).append(([dedup, failed], unresolved, stats))
+            elif ftype in _TRANSLATION_SPECS:
+                _load_translations(cur, ftype, file_index, flang, records, stats, progress, fpath)
+            elif ftype in {"enum_translations", "ui_translations"}:
+                _load_keyed(cur, ftype, file_index, records, stats, progress, fpath)
+            elif ftype == "tombstones":
+                _load_tombstones(cur, file_index, records, stats, progress, fpath)
+            else:
+                raise ValueError(f"Unsupported file type: {ftype}")
+            progress.flush()
+        if mode == "authoritative_snapshot":
+            for ftype, staged in covered.items():
+                unresolved = sum(n for _, n, _ in staged)
+                if unresolved:
+                    raise ValueError(
+                        f"authoritative_snapshot aborted: {unresolved} {ftype} record(s)"
+                        " without a slug or name"
+                    )
+                tables = [t for slug_tables, _, _ in staged for t in slug_tables]
+                staged[-1][2]["deleted"] += _delete_missing(cur, ftype, tables)
+            progress.flush()
+    finally:
+        cur.close()
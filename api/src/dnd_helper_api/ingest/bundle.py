@@ -0,0 +1,79 @@
+"""Reading universal bundles: archive members, manifest and NDJSON records.
+
+Supported archives: .zip, .tar.gz, .tgz. Files inside may be plain .jsonl or
+.jsonl.gz per manifest `compression`.
+"""
+
+import gzip
+import io
+import json
+import tarfile
+import zipfile
+from typing import Any, Iterator, Optional
+
+BUNDLE_MODES = ("upsert", "tombstone", "authoritative_snapshot")
+
+
+def open_bundle(path: str) -> tuple[str, Any]:
+    """Open a bundle archive; returns (kind, archive) where kind is "zip" or "tar"."""
+    p = path.lower()
+    if p.endswith(".zip"):
+        return ("zip", zipfile.ZipFile(path, "r"))
+    if p.endswith(".tar.gz") or p.endswith(".tgz"):
+        return ("tar", tarfile.open(path, mode="r:gz"))
+    raise ValueError("Unsupported bundle format. Use .zip or .tar.gz")
+
+
+def read_member(kind: str, arc: Any, member_path: str) -> bytes:
+    if kind == "zip":
+        with arc.open(member_path) as f:  # type: ignore[attr-defined]
+            return f.read()
+    member = arc.getmember(member_path)  # type: ignore[attr-defined]
+    f = arc.extractfile(member)  # type: ignore[attr-defined]
+    if f is None:
+        raise FileNotFoundError(member_path)
+    try:
+        return f.read()
+    finally:
+        f.close()
+
+
+def read_manifest(kind: str, arc: Any) -> dict:
+    manifest = json.loads(read_member(kind, arc, "manifest.json").decode("utf-8"))
+    files = manifest.get("files") or []
+    if not isinstance(files, list) or not files:
+        raise ValueError("manifest.files must be a non-empty array")
+    if bundle_mode(manifest) not in BUNDLE_MODES:
+        raise ValueError(f"manifest.mode must be one of {', '.join(BUNDLE_MODES)}")
+    return manifest
+
+
+def bundle_mode(manifest: dict) -> str:
+    """Manifest `mode`; bundles without one are treated as `upsert`."""
+    return str(manifest.get("mode") or "upsert").strip().lower()
+
+
+def declared_rows(files: list[dict]) -> Optional[int]:
+    """Total of manifest `rows` if every file declares it, else None."""
+    rows = [f.get("rows") for f in files if isinstance(f, dict)]
+    return sum(rows) if all(isinstance(r, int) for r in rows) else None
+
+
+def iter_lines(data: bytes, compression: str) -> Iterator[str]:
+    """Non-empty, stripped NDJSON lines of one (optionally gzipped) member."""
+    if compression == "gzip":
+        with gzip.GzipFile(fileobj=io.BytesIO(data), mode="rb") as gf:
+            for line in gf:
+                s = line.decode("utf-8").strip()
+                if s:
+                    yield s
+    else:
+        for line in data.splitlines():
+            s = line.decode("utf-8").strip()
+            if s:
+                yield s
+
+
+def iter_ndjson(data: bytes, compression: str) -> Iterator[Any]:
+    for line in iter_lines(data, compression):
+        yield json.loads(line)
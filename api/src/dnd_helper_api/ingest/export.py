@@ -0,0 +1,346 @@
+"""Export the catalog as a bundle that `bundle_ingest` accepts (see the data contract).
+
+Usage (inside the API container; `-` writes to stdout):
+
+    python -m dnd_helper_api.ingest.export --out bundle.zip [--format tar.gz]
+
+Also served by `GET /admin-api/export/bundle`.
+
+Each file is exported by a pool thread on its own connection. All of them
+run in one REPEATABLE READ READ ONLY snapshot (`pg_export_snapshot()`, as
+pg_dump does), so the files are consistent with each other while the API keeps
+writing. Rows are read with server-side cursors in batches of `BATCH_ROWS` and
+written as gzip NDJSON to temp files; `rows` and `sha256` of the gzip bytes are
+computed while writing. The archive is then assembled in manifest order, with
+the manifest as the last member. Memory stays bounded by the batch size and the
+copy chunk; at most `WORKERS` files are exported at once.
+
+Entities get `uid = "<type>:<slug>"`, and translations reference them by the
+same uid, so a re-import matches rows by slug as usual. Entities without a slug
+cannot be matched by an import and are left out, with their translations.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import IO, Any, BinaryIO, Iterator, Optional
+
+from shared_models.enums import Language
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Connection, Engine
+
+from dnd_helper_api.ingest.bulk import _AUDIT_COLUMNS, _TRANSLATION_SPECS
+from shared_models import (
+    EnumTranslation,
+    Monster,
+    MonsterTranslation,
+    Spell,
+    SpellTranslation,
+    UiTranslation,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = max(1, int(os.getenv("ADMIN_EXPORT_BATCH_ROWS", "1000")))
+WORKERS = max(1, int(os.getenv("ADMIN_EXPORT_WORKERS", "4")))
+CHUNK_BYTES = 256 * 1024
+EXPORT_FORMATS = ("zip", "tar.gz")
+EXPORT_MODES = ("upsert", "authoritative_snapshot")
+SCHEMA_VERSION = "1.0"
+SOURCE = "dnd_helper_export"
+_COMPACT = (",", ":")
+
+_ENTITIES: dict[str, tuple[Any, str]] = {
+    "monsters": (Monster, "monster"),
+    "spells": (Spell, "spell"),
+}
+_TRANSLATION_MODELS: dict[str, Any] = {
+    "monster_translations": MonsterTranslation,
+    "spell_translations": SpellTranslation,
+}
+
+
+def _file_plan() -> list[dict[str, Any]]:
+    """Manifest file entries (without rows/sha256) in processing order."""
+    langs = [lang.value for lang in Language]
+    plan: list[dict[str, Any]] = []
+    for ftype in _ENTITIES:
+        plan.append({"path": f"{ftype}.jsonl.gz", "type": ftype})
+    for ftype, spec in _TRANSLATION_SPECS.items():
+        entity_type = next(t for t, (_, name) in _ENTITIES.items() if name == spec["entity"])
+        for lang in langs:
+            plan.append(
+                {
+                    "path": f"{ftype}.{lang}.jsonl.gz",
+                    "type": ftype,
+                    "lang": lang,
+                    "depends_on": [entity_type],
+                }
+            )
+    for lang in langs:
+        path = f"enum_translations.{lang}.jsonl.gz"
+        plan.append({"path": path, "type": "enum_translations", "lang": lang})
+    plan.append({"path": "ui_translations.jsonl.gz", "type": "ui_translations"})
+    for entry in plan:
+        entry["compression"] = "gzip"
+    return plan
+
+
+def _records(conn: Connection, fdesc: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Contract records of one file, read through a server-side cursor."""
+    ftype, lang = fdesc["type"], fdesc.get("lang")
+    if ftype in _ENTITIES:
+        model, prefix = _ENTITIES[ftype]
+        table: Table = model.__table__
+        columns = [c for c in table.columns if c.name not in _AUDIT_COLUMNS]
+        stmt = select(*columns).where(table.c.slug.is_not(None)).order_by(table.c.id)
+    elif ftype in _TRANSLATION_SPECS:
+        spec = _TRANSLATION_SPECS[ftype]
+        model, prefix = next(v for v in _ENTITIES.values() if v[1] == spec["entity"])
+        entity: Table = model.__table__
+        table = _TRANSLATION_MODELS[ftype].__table__
+        stmt = (
+            select(entity.c.slug, *(table.c[c] for c in spec["columns"]))
+            .join(entity, entity.c.id == table.c[spec["fk"]])
+            .where(table.c.lang == lang, entity.c.slug.is_not(None))
+            .order_by(table.c.id)
+        )
+    elif ftype == "enum_translations":
+        table = EnumTranslation.__table__  # type: ignore[attr-defined]
+        stmt = (
+            select(
+                table.c.enum_type.label("entity"),
+                table.c.enum_value.label("code"),
+                table.c.lang,
+                table.c.label,
+                table.c.description,
+                table.c.synonyms,
+            )
+            .where(table.c.lang == lang)
+            .order_by(table.c.id)
+        )
+    elif ftype == "ui_translations":
+        table = UiTranslation.__table__  # type: ignore[attr-defined]
+        stmt = select(table.c.namespace, table.c.key, table.c.lang, table.c.text).order_by(
+            table.c.id
+        )
+    else:
+        raise ValueError(f"Unsupported file type: {ftype}")
+
+    result = conn.execution_options(stream_results=True, yield_per=BATCH_ROWS).execute(stmt)
+    for row in result.mappings():
+        record = {"schema_version": SCHEMA_VERSION, **row}
+        if ftype in _ENTITIES:
+            record["uid"] = f"{prefix}:{row['slug']}"
+        elif ftype in _TRANSLATION_SPECS:
+            record["uid"] = f"{prefix}:{record.pop('slug')}"
+            record["lang"] = lang
+        yield record
+
+
+class _HashingWriter:
+    """Write-through wrapper counting sha256 of the bytes that reach the file."""
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self.out = out
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self.out.write(data)
+
+    def flush(self) -> None:
+        self.out.flush()
+
+
+def _export_file(engine: Engine, snapshot: str, fdesc: dict[str, Any]) -> tuple[dict, IO[bytes]]:
+    """Write one gzip NDJSON member to a temp file; returns (manifest entry, file)."""
+    started = time.perf_counter()
+    tmp = tempfile.TemporaryFile()
+    try:
+        writer = _HashingWriter(tmp)
+        rows = 0
+        with engine.connect() as conn:
+            conn = conn.execution_options(
+                isolation_level="REPEATABLE READ", postgresql_readonly=True
+            )
+            conn.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+            # mtime=0: identical data gives identical bytes (and sha256)
+            with gzip.GzipFile(fileobj=writer, mode="wb", mtime=0) as gz:  # type: ignore[arg-type]
+                for record in _records(conn, fdesc):
+                    line = json.dumps(record, ensure_ascii=False, default=str, separators=_COMPACT)
+                    gz.write(line.encode("utf-8") + b"\n")
+                    rows += 1
+            conn.rollback()
+        tmp.seek(0)
+        entry = {**fdesc, "rows": rows, "sha256": writer.digest.hexdigest()}
+        seconds = round(time.perf_counter() - started, 3)
+        logger.info(
+            "Export file written", extra={"path": fdesc["path"], "rows": rows, "seconds": seconds}
+        )
+        return entry, tmp
+    except Exception:
+        tmp.close()
+        raise
+
+
+def write_bundle(
+    engine: Engine,
+    out: BinaryIO,
+    fmt: str = "zip",
+    mode: str = "upsert",
+    workers: Optional[int] = None,
+) -> dict[str, Any]:
+    """Write the bundle archive to `out` (need not be seekable); returns the manifest."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"mode must be one of {', '.join(EXPORT_MODES)}")
+    created_at = datetime.now(timezone.utc)
+    manifest: dict[str, Any] = {
+        "schema_version": SCHEMA_VERSION,
+        "source": SOURCE,
+        "run_id": f"export-{created_at.strftime('%Y%m%dT%H%M%S%fZ')}",
+        "created_at": created_at.isoformat().replace("+00:00", "Z"),
+        "mode": mode,
+        "files": [],
+    }
+    with ExitStack() as stack:
+        # Holds the snapshot open until every file has imported it
+        anchor = stack.enter_context(engine.connect()).execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+        snapshot = anchor.exec_driver_sql("SELECT pg_export_snapshot()").scalar_one()
+        pool = stack.enter_context(ThreadPoolExecutor(max_workers=workers or WORKERS))
+        futures: list[Future] = [
+            pool.submit(_export_file, engine, snapshot, fdesc) for fdesc in _file_plan()
+        ]
+        try:
+            if fmt == "zip":
+                arc: Any = stack.enter_context(zipfile.ZipFile(out, "w", zipfile.ZIP_STORED))
+            else:
+                arc = stack.enter_context(tarfile.open(fileobj=out, mode="w|gz"))
+            for future in futures:
+                entry, tmp = future.result()
+                with tmp:
+                    _add_member(arc, entry["path"], tmp)
+                manifest["files"].append(entry)
+            data = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+            with tempfile.TemporaryFile() as tmp:
+                tmp.write(data)
+                tmp.seek(0)
+                _add_member(arc, "manifest.json", tmp)
+        finally:
+            for future in futures:
+                if future.cancel():
+                    continue
+                if future.done() and future.exception() is None:
+                    future.result()[1].close()
+    return manifest
+
+
+def _add_member(arc: Any, name: str, src: IO[bytes]) -> None:
+    size = os.fstat(src.fileno()).st_size
+    if isinstance(arc, zipfile.ZipFile):
+        info = zipfile.ZipInfo(name, date_time=time.gmtime()[:6])
+        with arc.open(info, "w", force_zip64=True) as dst:
+            while chunk := src.read(CHUNK_BYTES):
+                dst.write(chunk)
+        return
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    arc.addfile(info, src)
+
+
+class _QueueWriter:
+    """File-like sink handing written bytes to a bounded queue (back-pressure)."""
+
+    def __init__(self, chunks: "queue.Queue[Optional[bytes]]", cancelled: threading.Event) -> None:
+        self.chunks = chunks
+        self.cancelled = cancelled
+
+    def write(self, data: bytes) -> int:
+        payload = bytes(data)
+        while True:
+            if self.cancelled.is_set():
+                raise BrokenPipeError("export consumer went away")
+            try:
+                self.chunks.put(payload, timeout=1)
+                return len(payload)
+            except queue.Full:
+                continue
+
+    def flush(self) -> None:
+        return None
+
+
+def stream_bundle(engine: Engine, fmt: str = "zip", mode: str = "upsert") -> Iterator[bytes]:
+    """Yield the archive bytes while `write_bundle` produces them on a thread."""
+    chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=16)
+    cancelled = threading.Event()
+    errors: list[BaseException] = []
+
+    def produce() -> None:
+        try:
+            write_bundle(engine, _QueueWriter(chunks, cancelled), fmt=fmt, mode=mode)  # type: ignore[arg-type]
+        except BaseException as exc:  # noqa: BLE001
+            if not cancelled.is_set():
+                logger.exception("Bundle export failed")
+                errors.append(exc)
+        finally:
+            while not cancelled.is_set():
+                try:
+                    chunks.put(None, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+
+    producer = threading.Thread(target=produce, name="bundle-export", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+        if errors:
+            raise errors[0]
+    finally:
+        cancelled.set()
+        producer.join(timeout=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the catalog as an ingestible bundle")
+    parser.add_argument("--out", required=True, help="Archive path, or - for stdout")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Default: from --out")
+    parser.add_argument("--mode", choices=EXPORT_MODES, default="upsert", help="Manifest mode")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Files exported in parallel")
+    args = parser.parse_args()
+    fmt = args.format or ("tar.gz" if args.out.endswith((".tar.gz", ".tgz")) else "zip")
+
+    from dnd_helper_api.db import engine
+
+    with ExitStack() as stack:
+        out = sys.stdout.buffer if args.out == "-" else stack.enter_context(open(args.out, "wb"))
+        manifest = write_bundle(engine, out, fmt=fmt, mode=args.mode, workers=args.workers)
+    for entry in manifest["files"]:
+        print(f"{entry['path']}: {entry['rows']} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Post-ingest stage run by the worker before a job is marked succeeded.
+
+Steps, each timed into `counters.post_ingest.timings_ms`:
+
+1. `analyze`: `ANALYZE` the tables the job wrote to, so the planner sees the new
+   row counts and value distributions right away.
+2. `refresh`: `REFRESH MATERIALIZED VIEW` for every materialized view in the
+   current schema.
+3. `version`: bump the catalog version (only when catalog tables were touched).
+4. `warmup`: rebuild every registered list payload for every language at the
+   new version (`ADMIN_INGEST_WARMUP`, default on).
+
+The stage runs in the job's transaction, so with the bulk path the new rows,
+the version and the payloads become visible in the same commit.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session as SASession
+
+from dnd_helper_api.catalog import CATALOG_TABLES, bump_catalog_version, warm_catalog
+from shared_models import (
+    EnumTranslation,
+    Monster,
+    MonsterTranslation,
+    Spell,
+    SpellTranslation,
+    UiTranslation,
+)
+
+logger = logging.getLogger(__name__)
+
+WARMUP = os.getenv("ADMIN_INGEST_WARMUP", "true").lower() in {"1", "true", "yes"}
+
+_MONSTERS = (Monster.__tablename__, MonsterTranslation.__tablename__)  # type: ignore[attr-defined]
+_SPELLS = (Spell.__tablename__, SpellTranslation.__tablename__)  # type: ignore[attr-defined]
+_ENUMS = (EnumTranslation.__tablename__,)  # type: ignore[attr-defined]
+_UI = (UiTranslation.__tablename__,)  # type: ignore[attr-defined]
+
+# Bundle file type -> tables it writes
+_FILE_TABLES: dict[str, tuple[str, ...]] = {
+    "monsters": _MONSTERS[:1],
+    "spells": _SPELLS[:1],
+    "monster_translations": _MONSTERS[1:],
+    "spell_translations": _SPELLS[1:],
+    "enum_translations": _ENUMS,
+    "ui_translations": _UI,
+    "tombstones": _MONSTERS + _SPELLS,
+}
+
+# Legacy job type -> tables it writes
+_JOB_TABLES: dict[str, tuple[str, ...]] = {
+    "monsters_import": _MONSTERS,
+    "spells_import": _SPELLS,
+    "enums_import": _ENUMS,
+    "ui_translations_import": _UI,
+}
+
+
+def touched_tables(job_type: str, counters: dict[str, Any]) -> list[str]:
+    if job_type in _JOB_TABLES:
+        return list(_JOB_TABLES[job_type])
+    tables: set[str] = set()
+    for stats in counters.get("files") or []:
+        tables.update(_FILE_TABLES.get(str(stats.get("type") or ""), ()))
+    return sorted(tables)
+
+
+def touches_catalog(tables: list[str]) -> bool:
+    return bool(CATALOG_TABLES.intersection(tables))
+
+
+def run_post_ingest(session: SASession, tables: list[str]) -> dict[str, Any]:
+    """Run the stage inside the caller's transaction; returns the `post_ingest` counters."""
+    timings: dict[str, int] = {}
+
+    @contextmanager
+    def step(name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        timings[f"{name}_ms"] = int((time.perf_counter() - started) * 1000)
+
+    quote = session.get_bind().dialect.identifier_preparer.quote
+    with step("analyze"):
+        for table in tables:
+            session.execute(text(f"ANALYZE {quote(table)}"))
+    with step("refresh"):
+        views = session.execute(
+            text("SELECT matviewname FROM pg_matviews WHERE schemaname = current_schema()")
+        ).scalars().all()
+        for view in views:
+            session.execute(text(f"REFRESH MATERIALIZED VIEW {quote(view)}"))
+    result: dict[str, Any] = {
+        "tables": tables,
+        "materialized_views": len(views),
+        "timings_ms": timings,
+    }
+    if touches_catalog(tables):
+        with step("version"):
+            result["catalog_version"] = bump_catalog_version(session)
+        if WARMUP:
+            with step("warmup"):
+                result["payloads"] = warm_catalog(session, result["catalog_version"])
+    logger.info("Post-ingest stage finished", extra=result)
+    return result
@@ -0,0 +1,76 @@
+"""Acceptance rules for monster and spell records, shared by every ingest path.
+
+The legacy uploads, the per-row and the bulk bundle paths and the dry run all
+turn a raw record into column values here, so they accept the same records:
+the slug is derived from the name when missing, legacy keys are mapped, spell
+enums are checked and unknown keys are dropped. Anything else (column types,
+NOT NULL) is left to the database, as the per-row path always did.
+"""
+
+from typing import Any, Optional
+
+from shared_models.enums import CasterClass, SpellSchool
+
+from dnd_helper_api.routers.monsters.derived import _slugify as _monster_slugify
+from shared_models import Monster, Spell
+
+_MONSTER_FIELDS = set(Monster.model_fields.keys()) - {"id"}
+_SPELL_FIELDS = set(Spell.model_fields.keys()) - {"id"}
+
+
+def _name_of(raw: dict[str, Any]) -> str:
+    return str(raw.get("name") or raw.get("name_en") or "").strip()
+
+
+def monster_slug(raw: dict[str, Any]) -> str:
+    """The record's slug, derived from its name when missing; "" when it has neither."""
+    slug = str(raw.get("slug") or "").strip()
+    if not slug:
+        base_name = _name_of(raw)
+        slug = _monster_slugify(base_name) if base_name else ""
+    return slug
+
+
+def spell_slug(raw: dict[str, Any]) -> str:
+    """The record's slug, derived from its name when missing; "" when it has neither."""
+    slug = str(raw.get("slug") or "").strip()
+    if not slug:
+        base_name = _name_of(raw)
+        slug = base_name.lower().replace(" ", "-") if base_name else ""
+    return slug
+
+
+def prepare_monster(raw: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Monster columns sent by `raw`, with `slug` set; None when it has no slug or name."""
+    data = dict(raw)
+    slug = monster_slug(data)
+    if not slug:
+        return None
+    data["slug"] = slug
+    # Backward-compat: map legacy 'abilities' -> 'ability_scores'
+    if "abilities" in data and "ability_scores" not in data:
+        data["ability_scores"] = data.pop("abilities")
+    return {k: v for k, v in data.items() if k in _MONSTER_FIELDS}
+
+
+def prepare_spell(raw: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Spell columns sent by `raw`, with `slug` set; None when it has no slug or name.
+
+    Raises ValueError for an unknown `school` or `classes` value.
+    """
+    data = dict(raw)
+    slug = spell_slug(data)
+    if not slug:
+        return None
+    data["slug"] = slug
+    school = data.get("school")
+    if school is not None:
+        SpellSchool(str(school))
+    classes_val = data.get("classes")
+    if classes_val is not None:
+        if not isinstance(classes_val, list):
+            classes_val = [classes_val]
+        for cls in classes_val:
+            CasterClass(str(cls))
+        data["classes"] = classes_val
+    return {k: v for k, v in data.items() if k in _SPELL_FIELDS}
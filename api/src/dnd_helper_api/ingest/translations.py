@@ -0,0 +1,189 @@
+"""Batched translation upserts for the per-row and legacy ingest paths.
+
+Instead of a lookup and a commit per translation row, rows are buffered per
+table. Each batch is written with one query that prefetches the existing rows
+by unique key, an in-memory insert/update/unchanged decision, and a single
+multi-row `INSERT ... ON CONFLICT DO UPDATE` for what actually changed.
+"""
+
+import logging
+import os
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as SASession
+
+from shared_models import EnumTranslation, MonsterTranslation, SpellTranslation, UiTranslation
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = max(1, int(os.getenv("ADMIN_INGEST_TRANSLATION_BATCH_ROWS", "500")))
+
+# keys: unique constraint; values: written columns; defaults: value on insert when
+# the record has none. On update "keep_blank" columns keep the stored value when
+# the record's value is empty and "keep_null" columns when it is None; the rest
+# are overwritten (same rules the per-row code applied object by object).
+_SPECS: dict[str, dict[str, Any]] = {
+    "monster_translations": {
+        "model": MonsterTranslation,
+        "keys": ("monster_id", "lang"),
+        "values": (
+            "name", "description", "traits", "actions", "reactions",
+            "legendary_actions", "spellcasting", "languages_text",
+        ),
+        "defaults": {"name": "", "description": ""},
+        "keep_blank": {"name", "description"},
+        "keep_null": {"languages_text"},
+    },
+    "spell_translations": {
+        "model": SpellTranslation,
+        "keys": ("spell_id", "lang"),
+        "values": ("name", "description"),
+        "defaults": {"name": "", "description": ""},
+        "keep_blank": {"name", "description"},
+        "keep_null": set(),
+    },
+    "enum_translations": {
+        "model": EnumTranslation,
+        "keys": ("enum_type", "enum_value", "lang"),
+        "values": ("label", "description", "synonyms"),
+        "defaults": {},
+        "keep_blank": set(),
+        "keep_null": set(),
+    },
+    "ui_translations": {
+        "model": UiTranslation,
+        "keys": ("namespace", "key", "lang"),
+        "values": ("text",),
+        "defaults": {},
+        "keep_blank": set(),
+        "keep_null": set(),
+    },
+}
+
+TRANSLATION_KINDS = tuple(_SPECS)
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class TranslationUpserter:
+    """Buffer for one translation table; `flush` writes and commits a batch.
+
+    `add` takes the key and value columns of one record plus the counters dict
+    (`created`/`updated`/`unchanged`/`failed`) the outcome is counted into.
+    """
+
+    def __init__(self, session: SASession, kind: str, batch_rows: int = BATCH_ROWS) -> None:
+        self.session = session
+        self.spec = _SPECS[kind]
+        self.table = self.spec["model"].__table__
+        self.batch_rows = batch_rows
+        self._pending: list[tuple[tuple, dict[str, Any], dict[str, Any]]] = []
+
+    def add(self, row: dict[str, Any], stats: dict[str, Any]) -> None:
+        key = tuple(_plain(row[k]) for k in self.spec["keys"])
+        values = {c: row[c] for c in self.spec["values"] if c in row}
+        self._pending.append((key, values, stats))
+        if len(self._pending) >= self.batch_rows:
+            self.flush()
+
+    def _merge(self, current: Optional[dict[str, Any]], values: dict[str, Any]) -> dict[str, Any]:
+        if current is None:
+            merged = {c: values.get(c) for c in self.spec["values"]}
+            for c, default in self.spec["defaults"].items():
+                if not merged.get(c):
+                    merged[c] = default
+            return merged
+        merged = dict(current)
+        for c in self.spec["values"]:
+            v = values.get(c)
+            if c in self.spec["keep_blank"] and not v:
+                continue
+            if c in self.spec["keep_null"] and v is None:
+                continue
+            merged[c] = v
+        return merged
+
+    def _write(self, batch: dict[tuple, list[dict[str, Any]]]) -> dict[tuple, str]:
+        """Upsert the merged records of each key; returns the outcome label per key."""
+        keys, values = self.spec["keys"], self.spec["values"]
+        key_cols = tuple_(*(self.table.c[k] for k in keys))
+        existing = {
+            tuple(r[:len(keys)]): dict(zip(values, r[len(keys):], strict=True))
+            for r in self.session.execute(
+                select(*(self.table.c[k] for k in keys), *(self.table.c[v] for v in values))
+                .where(key_cols.in_(set(batch)))
+            )
+        }
+        rows = []
+        labels: dict[tuple, str] = {}
+        for key, records in batch.items():
+            before = existing.get(key)
+            merged = before
+            # Apply records in order so repeated keys behave like sequential upserts
+            for row_values in records:
+                merged = self._merge(merged, row_values)
+            if before is None:
+                labels[key] = "created"
+            elif merged == before:
+                labels[key] = "unchanged"
+                continue
+            else:
+                labels[key] = "updated"
+            rows.append({**dict(zip(keys, key, strict=True)), **merged})
+        if rows:
+            stmt = insert(self.table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={**{c: stmt.excluded[c] for c in values}, "updated_at": func.now()},
+            )
+            self.session.execute(stmt)
+        return labels
+
+    def flush(self) -> None:
+        """Write the buffered records and commit.
+
+        A key repeated in the batch is written and counted once, into the counters
+        of its last record. When the set-based write fails, the batch is retried
+        one key per savepoint so that only the offending records count as failed.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        batch: dict[tuple, list[dict[str, Any]]] = {}
+        counted: dict[tuple, dict[str, Any]] = {}
+        for key, row_values, stats in pending:
+            batch.setdefault(key, []).append(row_values)
+            counted[key] = stats
+        try:
+            try:
+                with self.session.begin_nested():
+                    labels = self._write(batch)
+            except Exception:  # noqa: BLE001
+                logger.warning(
+                    "Translation batch failed, retrying row by row",
+                    extra={"table": self.table.name, "rows": len(batch)},
+                )
+                labels = {}
+                for key, records in batch.items():
+                    try:
+                        with self.session.begin_nested():
+                            labels.update(self._write({key: records}))
+                    except Exception:  # noqa: BLE001
+                        logger.exception(
+                            "Translation row failed", extra={"table": self.table.name, "key": key}
+                        )
+                        labels[key] = "failed"
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            logger.exception(
+                "Translation batch failed", extra={"table": self.table.name, "rows": len(batch)}
+            )
+            labels = dict.fromkeys(batch, "failed")
+        for key, label in labels.items():
+            counted[key][label] += 1
@@ -0,0 +1,298 @@
+"""Dry-run validation: check every record of an upload without writing to the DB.
+
+Used for admin jobs enqueued with `dry_run=true`. Records are parsed and
+checked in batches on a process pool: entities with the acceptance rules of the
+real ingest (`ingest.records`, including derived fields), translations, enum
+and UI translations against the shared models. The parent checks `uid`
+references of translation files against entity files that precede them in the
+manifest, exactly as a real run resolves them. Checks that need the database
+(column types, CHECK and NOT NULL constraints) are left to the real run.
+
+Legacy JSON uploads are checked the same way: the main section, then its
+translation section, whose rows reference entities of the upload by slug.
+
+Each file reports the usual counters (`processed`, `failed`) plus `errors`, a
+sample of at most `ERROR_SAMPLES` `{line, error}` entries. Lines are numbered
+from 1 over non-empty NDJSON lines.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from shared_models.enums import Language
+
+from dnd_helper_api.ingest.bulk import _ENTITY_SPECS, _TRANSLATION_SPECS
+from dnd_helper_api.ingest.bundle import (
+    bundle_mode,
+    iter_lines,
+    open_bundle,
+    read_manifest,
+    read_member,
+)
+from dnd_helper_api.job_progress import JobProgress
+from shared_models import MonsterTranslation, SpellTranslation
+
+logger = logging.getLogger(__name__)
+
+PROCESSES = max(1, int(os.getenv("ADMIN_DRY_RUN_PROCESSES", str(min(4, os.cpu_count() or 1)))))
+BATCH_ROWS = max(1, int(os.getenv("ADMIN_DRY_RUN_BATCH_ROWS", "2000")))
+ERROR_SAMPLES = max(0, int(os.getenv("ADMIN_DRY_RUN_ERROR_SAMPLES", "20")))
+
+_TRANSLATION_MODELS = {
+    "monster_translations": MonsterTranslation,
+    "spell_translations": SpellTranslation,
+}
+
+# Legacy JSON uploads: job type -> (payload key, record type)
+_LEGACY_SECTIONS = {
+    "monsters_import": ("monsters", "monsters"),
+    "spells_import": ("spells", "spells"),
+    "enums_import": ("enum_translations", "enum_translations"),
+    "ui_translations_import": ("ui_translations", "ui_translations"),
+}
+
+# Translation sections of legacy entity uploads: record type -> (payload key, slug key)
+_LEGACY_TRANSLATIONS = {
+    "monsters": ("monster_translations", "monster_slug"),
+    "spells": ("spell_translations", "spell_slug"),
+}
+
+
+def _check_record(ftype: str, lang: Optional[str], raw: Any) -> tuple[Optional[str], Optional[str]]:
+    """Validate one record; returns (defined uid, referenced uid) or raises."""
+    if not isinstance(raw, dict):
+        raise ValueError("record must be a JSON object")
+    uid = str(raw.get("uid") or "").strip() or None
+    if ftype in _ENTITY_SPECS:
+        spec = _ENTITY_SPECS[ftype]
+        data = spec["prepare"](raw)
+        if data is None:
+            raise ValueError("record has no slug or name")
+        inputs, _fields, derive = spec["derived"]
+        derive({c: [data.get(c)] for c in inputs})
+        return uid, None
+    if ftype in _TRANSLATION_SPECS:
+        if uid is None:
+            raise ValueError("missing uid")
+        # Legacy translation sections carry the language on every row
+        lang = lang or str(raw.get("lang") or "").strip().lower()
+        spec = _TRANSLATION_SPECS[ftype]
+        data = {c: raw.get(c) for c in spec["columns"]}
+        data.update(name=raw.get("name") or "", description=raw.get("description") or "")
+        _TRANSLATION_MODELS[ftype].model_validate({spec["fk"]: 0, "lang": lang, **data})
+        return None, uid
+    if ftype == "enum_translations":
+        enum_type = str(raw.get("entity") or raw.get("enum_type") or "").strip()
+        enum_value = str(raw.get("code") or raw.get("enum_value") or "").strip()
+        label = raw.get("label") if raw.get("label") is not None else raw.get("text")
+        if not (enum_type and enum_value):
+            raise ValueError("enum_type/enum_value are required")
+        Language(str(raw.get("lang") or "").strip().lower())
+        if not isinstance(label, str):
+            raise ValueError("label must be a string")
+        return None, None
+    if ftype == "ui_translations":
+        if not str(raw.get("key") or "").strip():
+            raise ValueError("key is required")
+        Language(str(raw.get("lang") or "").strip().lower())
+        if not isinstance(raw.get("text"), str):
+            raise ValueError("text must be a string")
+        return None, None
+    if ftype == "tombstones":
+        entity = str(raw.get("entity") or "").strip().lower()
+        if entity not in {spec["table"] for spec in _ENTITY_SPECS.values()}:
+            raise ValueError(f"unknown tombstone entity: {entity!r}")
+        if not str(raw.get("slug") or "").strip():
+            raise ValueError("slug is required")
+        return None, None
+    raise ValueError(f"Unsupported file type: {ftype}")
+
+
+def _error_text(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+        )[:500]
+    return str(exc)[:500]
+
+
+def _validate_batch(
+    ftype: str, lang: Optional[str], first_line: int, items: list[Any]
+) -> dict[str, Any]:
+    """Pool task: validate raw NDJSON lines (or already decoded records)."""
+    failed = 0
+    errors: list[dict[str, Any]] = []
+    uids: list[str] = []
+    refs: list[tuple[int, str]] = []
+    for line_no, item in enumerate(items, start=first_line):
+        try:
+            raw = json.loads(item) if isinstance(item, str) else item
+            uid, ref = _check_record(ftype, lang, raw)
+            if uid is not None:
+                uids.append(uid)
+            if ref is not None:
+                refs.append((line_no, ref))
+        except Exception as exc:  # noqa: BLE001
+            failed += 1
+            if len(errors) < ERROR_SAMPLES:
+                errors.append({"line": line_no, "error": _error_text(exc)})
+    return {"processed": len(items), "failed": failed, "errors": errors, "uids": uids, "refs": refs}
+
+
+def _batches(items: Iterable[Any]) -> Iterator[tuple[int, list[Any]]]:
+    batch: list[Any] = []
+    first_line = 1
+    for item in items:
+        batch.append(item)
+        if len(batch) >= BATCH_ROWS:
+            yield first_line, batch
+            first_line += len(batch)
+            batch = []
+    if batch:
+        yield first_line, batch
+
+
+def _file_problem(fdesc: dict, mode: str) -> Optional[str]:
+    ftype = str((fdesc.get("type") or "")).strip()
+    if not str((fdesc.get("path") or "")).strip() or not ftype:
+        return "Each file entry must include path and type"
+    if (ftype == "tombstones") != (mode == "tombstone"):
+        return "mode=tombstone bundles must contain only tombstones files"
+    if ftype in _TRANSLATION_SPECS and not fdesc.get("lang_per_record"):
+        lang = str((fdesc.get("lang") or "")).strip().lower()
+        if lang not in {item.value for item in Language}:
+            return f"{ftype} requires a valid lang in manifest entry"
+    return None
+
+
+def validate_sources(
+    sources: Iterable[tuple[dict, Optional[Iterable[Any]]]],
+    progress: JobProgress,
+    mode: str = "upsert",
+    processes: Optional[int] = None,
+) -> None:
+    """Validate `(file entry, lines or records)` pairs in order, filling `progress`.
+
+    `None` instead of lines marks a file that is missing from the archive.
+
+    Batches of all files are pipelined through the pool; results are consumed in
+    submission order so uid references only see entities of earlier files.
+    """
+    processes = processes or PROCESSES
+    known_uids: dict[str, set[str]] = {spec["table"]: set() for spec in _ENTITY_SPECS.values()}
+    pool: Optional[ProcessPoolExecutor] = None
+    if processes > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+    pending: deque[tuple[dict[str, Any], str, Any]] = deque()
+
+    def consume(stats: dict[str, Any], ftype: str, result: Any) -> None:
+        res = result.result() if isinstance(result, Future) else result
+        stats["processed"] += res["processed"]
+        stats["failed"] += res["failed"]
+        samples = stats["errors"]
+        samples.extend(res["errors"][: max(0, ERROR_SAMPLES - len(samples))])
+        if ftype in _ENTITY_SPECS:
+            known_uids[_ENTITY_SPECS[ftype]["table"]].update(res["uids"])
+        elif ftype in _TRANSLATION_SPECS:
+            entity_uids = known_uids[_TRANSLATION_SPECS[ftype]["entity"]]
+            for line_no, ref in res["refs"]:
+                if ref not in entity_uids:
+                    stats["failed"] += 1
+                    if len(samples) < ERROR_SAMPLES:
+                        samples.append({"line": line_no, "error": f"unknown uid: {ref}"})
+        progress.row_done(res["processed"])
+
+    try:
+        for fdesc, items in sources:
+            fpath = str((fdesc.get("path") or "")).strip()
+            ftype = str((fdesc.get("type") or "")).strip()
+            lang = str((fdesc.get("lang") or "")).strip().lower() or None
+            rows_expected = fdesc.get("rows")
+            stats = progress.start_file(
+                fpath, ftype, rows_expected if isinstance(rows_expected, int) else None
+            )
+            stats["errors"] = []
+            problem = _file_problem(fdesc, mode)
+            if problem is None and items is None:
+                problem = f"{fpath} not found in archive"
+            if problem is not None:
+                stats["errors"].append({"line": None, "error": problem})
+                stats["failed"] += 1
+                continue
+            for first_line, batch in _batches(items or []):
+                if pool is None:
+                    consume(stats, ftype, _validate_batch(ftype, lang, first_line, batch))
+                    continue
+                pending.append(
+                    (stats, ftype, pool.submit(_validate_batch, ftype, lang, first_line, batch))
+                )
+                # Bound memory: keep at most two batches per process in flight
+                while len(pending) >= processes * 2:
+                    consume(*pending.popleft())
+        while pending:
+            consume(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def validate_bundle(path: str, progress: JobProgress) -> None:
+    """Dry-run a bundle archive; manifest-level errors raise like a real run."""
+    kind, arc = open_bundle(path)
+    try:
+        manifest = read_manifest(kind, arc)
+
+        def sources() -> Iterator[tuple[dict, Optional[Iterable[Any]]]]:
+            for fdesc in manifest["files"]:
+                fpath = str((fdesc.get("path") or "")).strip()
+                compression = str((fdesc.get("compression") or "none")).strip().lower()
+                try:
+                    data = read_member(kind, arc, fpath) if fpath else b""
+                except KeyError:
+                    # Reported per file rather than aborting the whole dry run
+                    yield fdesc, None
+                    continue
+                yield fdesc, iter_lines(data, compression)
+
+        validate_sources(sources(), progress, mode=bundle_mode(manifest))
+    finally:
+        arc.close()
+
+
+def validate_legacy_upload(job_type: str, path: str, progress: JobProgress) -> None:
+    """Dry-run a legacy JSON upload: its main section, then its translation section if any."""
+    if job_type not in _LEGACY_SECTIONS:
+        raise ValueError(f"Unsupported job_type: {job_type}")
+    key, ftype = _LEGACY_SECTIONS[job_type]
+    with open(path, "rb") as f:
+        payload = json.load(f)
+    rows = (payload or {}).get(key) or []
+    if not isinstance(rows, list):
+        raise ValueError(f"{key} must be an array")
+    name = os.path.basename(path)
+    sources: list[tuple[dict, Optional[Iterable[Any]]]] = []
+    if ftype not in _LEGACY_TRANSLATIONS:
+        sources.append(({"path": f"{name}#{key}", "type": ftype}, rows))
+    else:
+        # Legacy rows have no uid: entities are referenced by the slug the import derives
+        slug_of = _ENTITY_SPECS[ftype]["slug"]
+        rows = [dict(r, uid=slug_of(r)) if isinstance(r, dict) else r for r in rows]
+        sources.append(({"path": f"{name}#{key}", "type": ftype}, rows))
+        tr_key, slug_key = _LEGACY_TRANSLATIONS[ftype]
+        tr_rows = (payload or {}).get(tr_key) or []
+        if not isinstance(tr_rows, list):
+            raise ValueError(f"{tr_key} must be an array")
+        if tr_rows:
+            tr_rows = [dict(t, uid=t.get(slug_key)) if isinstance(t, dict) else t for t in tr_rows]
+            sources.append(
+                ({"path": f"{name}#{tr_key}", "type": tr_key, "lang_per_record": True}, tr_rows)
+            )
+    validate_sources(sources, progress)
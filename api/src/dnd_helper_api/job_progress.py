@@ -0,0 +1,170 @@
+"""Periodic progress reporting for long-running admin jobs.
+
+The worker updates in-memory per-file counters row by row; `JobProgress` writes a
+snapshot (with throughput and ETA) to `admin_jobs.counters` every N rows or T
+seconds, on its own connection, and sends `NOTIFY admin_job_progress` so the
+`/admin-api/ingest/jobs/{id}/events` stream can push it to subscribers.
+
+When a `checkpoint` callback is given, the same UPDATE also stores the worker's
+resume point in `admin_jobs.checkpoint`; a reclaimed job restores its counters
+from there via `restore()`.
+
+With a `lease`, every row checks it and the UPDATE only matches while the
+worker still owns the job; either way a lost lease raises `LeaseLost`, so a
+worker whose job was reclaimed stops writing data and checkpoints.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from shared_models.admin_job import AdminJob
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+
+from dnd_helper_api.job_queue import LeaseHeartbeat, notify_job_progress
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEYS = ("processed", "created", "updated", "unchanged", "deleted", "failed")
+
+FLUSH_EVERY_ROWS = max(1, int(os.getenv("ADMIN_JOB_PROGRESS_ROWS", "500")))
+FLUSH_EVERY_SECONDS = max(0.5, float(os.getenv("ADMIN_JOB_PROGRESS_SECONDS", "2")))
+
+
+def _rate_and_eta(
+    done: int, done_before: int, expected: Optional[int], elapsed: float
+) -> tuple[float, Optional[float]]:
+    # Rows restored from a checkpoint were not processed in this run; keep them out of the rate
+    rate = (done - done_before) / elapsed if elapsed > 0 else 0.0
+    eta: Optional[float] = None
+    if expected is not None and rate > 0:
+        eta = max(0, expected - done) / rate
+    return round(rate, 1), (round(eta, 1) if eta is not None else None)
+
+
+class JobProgress:
+    """Per-file counters for one job plus throttled persistence of their snapshot."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        job_id: UUID,
+        rows_expected_total: Optional[int] = None,
+        files_total: Optional[int] = None,
+        checkpoint: Optional[Callable[[], dict[str, Any]]] = None,
+        before_flush: Optional[Callable[[], None]] = None,
+        lease: Optional[LeaseHeartbeat] = None,
+    ) -> None:
+        self.engine = engine
+        self.job_id = job_id
+        self.rows_expected_total = rows_expected_total
+        self.files_total = files_total
+        self.checkpoint = checkpoint
+        # Commits buffered writes so the persisted checkpoint never runs ahead of the data
+        self.before_flush = before_flush
+        self.lease = lease
+        self.files: list[dict[str, Any]] = []
+        self._restored: list[dict[str, Any]] = []
+        self._started = time.monotonic()
+        self._file_started = self._started
+        self._last_flush = self._started
+        self._rows_since_flush = 0
+
+    def restore(self, files: list[dict[str, Any]]) -> None:
+        """Seed per-file counters saved in a checkpoint; picked up by `start_file`."""
+        self._restored = [dict(f) for f in files if isinstance(f, dict)]
+
+    def start_file(
+        self, path: str, ftype: str, rows_expected: Optional[int] = None
+    ) -> dict[str, Any]:
+        """Register the next file and return its mutable counters dict."""
+        self._finish_current()
+        index = len(self.files)
+        stats: dict[str, Any] = {"path": path, "type": ftype, "rows_expected": rows_expected}
+        stats.update({k: 0 for k in COUNTER_KEYS})
+        if index < len(self._restored) and self._restored[index].get("path") == path:
+            saved = self._restored[index]
+            stats.update({k: int(saved.get(k, 0)) for k in COUNTER_KEYS})
+            stats["resumed_from"] = stats["processed"]
+        self.files.append(stats)
+        self._file_started = time.monotonic()
+        return stats
+
+    def row_done(self, count: int = 1) -> None:
+        """Count `count` more processed rows and flush if a threshold is reached."""
+        if self.lease is not None:
+            self.lease.check()
+        self._rows_since_flush += count
+        if (
+            self._rows_since_flush >= FLUSH_EVERY_ROWS
+            or time.monotonic() - self._last_flush >= FLUSH_EVERY_SECONDS
+        ):
+            self.flush()
+
+    def _finish_current(self) -> None:
+        if self.files:
+            self._update_rates(self.files[-1], self._file_started)
+
+    def _update_rates(self, stats: dict[str, Any], started: float) -> None:
+        elapsed = time.monotonic() - started
+        rate, eta = _rate_and_eta(
+            int(stats["processed"]),
+            int(stats.get("resumed_from", 0)),
+            stats.get("rows_expected"),
+            elapsed,
+        )
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_sec"] = rate
+        stats["eta_seconds"] = eta
+
+    def snapshot(self, final: bool = False) -> dict[str, Any]:
+        """Counters document in the shape stored on `AdminJob.counters`."""
+        if final:
+            self._finish_current()
+        elif self.files:
+            self._update_rates(self.files[-1], self._file_started)
+        summary = {k: sum(int(f.get(k, 0)) for f in self.files) for k in COUNTER_KEYS}
+        elapsed = time.monotonic() - self._started
+        resumed = sum(int(f.get("resumed_from", 0)) for f in self.files)
+        rate, eta = _rate_and_eta(summary["processed"], resumed, self.rows_expected_total, elapsed)
+        progress: dict[str, Any] = {
+            "files_done": len(self.files) if final else max(0, len(self.files) - 1),
+            "files_total": self.files_total,
+            "current_file": None if final or not self.files else self.files[-1]["path"],
+            "rows_expected": self.rows_expected_total,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_sec": rate,
+            "eta_seconds": 0 if final else eta,
+        }
+        return {"files": [dict(f) for f in self.files], "summary": summary, "progress": progress}
+
+    def flush(self) -> None:
+        """Persist the current snapshot; failures are logged and never abort the job.
+
+        Only a lost lease aborts it, with `LeaseLost`.
+        """
+        self._rows_since_flush = 0
+        self._last_flush = time.monotonic()
+        if self.before_flush is not None:
+            self.before_flush()
+        values: dict[str, Any] = {"counters": self.snapshot()}
+        if self.checkpoint is not None:
+            values["checkpoint"] = self.checkpoint()
+        stmt = update(AdminJob).where(AdminJob.id == self.job_id)
+        if self.lease is not None:
+            stmt = stmt.where(
+                AdminJob.worker_id == self.lease.worker_id, AdminJob.status == "running"
+            )
+        try:
+            with self.engine.begin() as conn:
+                if conn.execute(stmt.values(**values)).rowcount == 0 and self.lease is not None:
+                    self.lease.lost = True
+                else:
+                    notify_job_progress(conn, self.job_id)
+        except Exception:
+            logger.exception("Failed to flush job progress", extra={"job_id": str(self.job_id)})
+        if self.lease is not None:
+            self.lease.check()
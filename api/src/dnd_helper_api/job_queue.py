@@ -0,0 +1,301 @@
+"""Postgres-backed queue primitives for `AdminJob` processing.
+
+Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED` so that any number of
+workers (threads or processes, on any number of API replicas) can share the table
+without picking the same row twice. A claimed job carries a lease that the owning
+worker extends with heartbeats; if the worker dies the lease expires and the job
+becomes claimable again. A worker that merely stalled past its lease stops at its
+next progress check (`LeaseLost`) and records no result. Enqueueing sends
+`NOTIFY admin_jobs` so idle workers wake up immediately instead of waiting for
+the next poll.
+
+`hold_leadership` elects one process out of many (e.g. uvicorn workers) with a
+session-level advisory lock held on a dedicated connection. Postgres releases the
+lock as soon as that connection closes, so a dead leader is replaced within one
+retry interval.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from types import TracebackType
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+import psycopg
+from shared_models.admin_job import AdminJob
+from sqlalchemy import and_, func, or_, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as SASession
+
+logger = logging.getLogger(__name__)
+
+JOBS_CHANNEL = "admin_jobs"
+PROGRESS_CHANNEL = "admin_job_progress"
+
+LEASE_SECONDS = max(10, int(os.getenv("ADMIN_WORKER_LEASE_SECONDS", "60")))
+HEARTBEAT_SECONDS = max(1, LEASE_SECONDS // 3)
+MAX_ATTEMPTS = max(1, int(os.getenv("ADMIN_WORKER_MAX_ATTEMPTS", "3")))
+
+# pg_advisory_lock key of the in-process admin worker leader (any constant bigint)
+WORKER_LEADER_LOCK = 0x646E645F776B6C64
+LEADER_RETRY_SECONDS = max(0.5, float(os.getenv("ADMIN_WORKER_LEADER_RETRY_SECONDS", "2")))
+
+
+class LeaseLost(RuntimeError):
+    """The worker no longer owns its job: the lease expired and the job was reclaimed."""
+
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def notify_job_enqueued(session: SASession, job_id: UUID) -> None:
+    """Queue a NOTIFY for `job_id`; Postgres delivers it when the session commits."""
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": JOBS_CHANNEL, "payload": str(job_id)},
+    )
+
+
+def notify_job_progress(conn: Any, job_id: UUID) -> None:
+    """Tell `/events` subscribers that `job_id` changed (delivered on commit).
+
+    `conn` may be an ORM session or a Core connection.
+    """
+    conn.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": PROGRESS_CHANNEL, "payload": str(job_id)},
+    )
+
+
+def listen_dsn(engine: Engine) -> str:
+    """Plain libpq DSN for dedicated psycopg LISTEN connections outside the pool."""
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _claimable_filter():
+    stale_lease = and_(
+        AdminJob.status == "running",
+        or_(AdminJob.lease_expires_at.is_(None), AdminJob.lease_expires_at < func.now()),  # type: ignore[union-attr]
+    )
+    return or_(AdminJob.status == "queued", stale_lease)
+
+
+def claim_next_job(session: SASession, worker_id: str) -> Optional[AdminJob]:
+    """Claim the oldest queued job (or one with an expired lease) for `worker_id`.
+
+    Returns the claimed job with status `running` and a fresh lease, or None.
+    Jobs whose lease already expired `MAX_ATTEMPTS` times are marked failed.
+    """
+    while True:
+        job = (
+            session.query(AdminJob)  # type: ignore[attr-defined]
+            .filter(_claimable_filter())
+            .order_by(AdminJob.created_at)  # type: ignore[attr-defined]
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            session.rollback()
+            return None
+        if job.status == "running":
+            logger.warning(
+                "Admin worker: reclaiming job with expired lease",
+                extra={
+                    "job_id": str(job.id),
+                    "previous_worker": job.worker_id,
+                    "attempts": job.attempts,
+                },
+            )
+            if (job.attempts or 0) >= MAX_ATTEMPTS:
+                job.status = "failed"
+                job.error = (
+                    f"Lease expired after {job.attempts} attempts (last worker: {job.worker_id})"
+                )
+                job.lease_expires_at = None
+                job.finished_at = func.now()
+                notify_job_progress(session, job.id)
+                session.commit()
+                continue
+        job.status = "running"
+        job.worker_id = worker_id
+        job.attempts = (job.attempts or 0) + 1
+        job.lease_expires_at = func.now() + timedelta(seconds=LEASE_SECONDS)
+        job.heartbeat_at = func.now()
+        job.finished_at = None
+        if job.started_at is None:
+            job.started_at = func.now()
+        session.commit()
+        return job
+
+
+def extend_lease(engine: Engine, job_id: UUID, worker_id: str) -> bool:
+    """Push the lease of a running job forward; False if `worker_id` no longer owns it."""
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(AdminJob)
+            .where(
+                AdminJob.id == job_id,
+                AdminJob.worker_id == worker_id,
+                AdminJob.status == "running",
+            )
+            .values(
+                lease_expires_at=func.now() + timedelta(seconds=LEASE_SECONDS),
+                heartbeat_at=func.now(),
+            )
+        )
+        return result.rowcount == 1
+
+
+def finish_job(session: SASession, job_id: UUID, worker_id: str, **values: Any) -> bool:
+    """Record the final state of a job that `worker_id` still owns.
+
+    The UPDATE runs in the session's transaction and the caller commits it.
+    Returns False, writing nothing, when the job is no longer running under
+    `worker_id`; the caller must then roll back its own writes.
+    """
+    result = session.execute(
+        update(AdminJob)
+        .where(
+            AdminJob.id == job_id,
+            AdminJob.worker_id == worker_id,
+            AdminJob.status == "running",
+        )
+        .values(lease_expires_at=None, finished_at=func.now(), **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+class LeaseHeartbeat:
+    """Context manager that keeps a claimed job's lease alive from a side thread.
+
+    `lost` turns True once an extension finds the job owned by someone else;
+    the job code polls `check()` and stops there.
+    """
+
+    def __init__(self, engine: Engine, job_id: UUID, worker_id: str) -> None:
+        self.engine = engine
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread = threading.Thread(
+            target=self._run, name=f"admin-heartbeat-{self.job_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def check(self) -> None:
+        """Raise `LeaseLost` if the lease was lost."""
+        if self.lost:
+            raise LeaseLost(f"Lease on job {self.job_id} lost by {self.worker_id}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                if not extend_lease(self.engine, self.job_id, self.worker_id):
+                    self.lost = True
+                    logger.warning(
+                        "Admin worker: lease lost",
+                        extra={"job_id": str(self.job_id), "worker_id": self.worker_id},
+                    )
+                    return
+            except Exception:
+                logger.exception(
+                    "Admin worker: heartbeat failed", extra={"job_id": str(self.job_id)}
+                )
+
+
+def listen_for_jobs(engine: Engine, wakeup: threading.Event, stop: threading.Event) -> None:
+    """LISTEN on the jobs channel and set `wakeup` for every notification until `stop`.
+
+    Runs on a dedicated psycopg connection (outside the SQLAlchemy pool) and
+    reconnects on failure. Each (re)connect also sets `wakeup` so that jobs
+    enqueued while the listener was down are not left waiting for the poll.
+    """
+    dsn = listen_dsn(engine)
+    while not stop.is_set():
+        try:
+            with psycopg.connect(dsn, autocommit=True) as conn:
+                conn.execute(f"LISTEN {JOBS_CHANNEL}")
+                logger.info(
+                    "Admin worker: listening for job notifications",
+                    extra={"channel": JOBS_CHANNEL},
+                )
+                wakeup.set()
+                while not stop.is_set():
+                    for _notify in conn.notifies(timeout=1.0):
+                        wakeup.set()
+        except Exception:
+            logger.exception("Admin worker: job listener error; reconnecting")
+            stop.wait(5)
+
+
+def hold_leadership(
+    engine: Engine,
+    lock_key: int,
+    stop: threading.Event,
+    on_elected: Callable[[], None],
+    on_lost: Callable[[], None],
+    retry_seconds: float = LEADER_RETRY_SECONDS,
+) -> None:
+    """Compete for advisory lock `lock_key` until `stop`; call the hooks as it is won and lost.
+
+    While not leader the lock is retried every `retry_seconds`; while leader the
+    connection is pinged at the same interval so a dropped connection (which
+    also drops the lock) demotes this process. `on_lost` runs before the
+    connection closes, so the next leader starts after this one has stopped.
+    """
+    dsn = listen_dsn(engine)
+    while not stop.is_set():
+        leader = False
+        try:
+            # Keepalives bound how long a half-open connection can keep the lock
+            with psycopg.connect(
+                dsn,
+                autocommit=True,
+                keepalives=1,
+                keepalives_idle=10,
+                keepalives_interval=5,
+                keepalives_count=3,
+            ) as conn:
+                try:
+                    while not stop.is_set():
+                        if leader:
+                            conn.execute("SELECT 1")
+                        else:
+                            row = conn.execute(
+                                "SELECT pg_try_advisory_lock(%s)", (lock_key,)
+                            ).fetchone()
+                            if row is not None and row[0]:
+                                leader = True
+                                logger.info(
+                                    "Leadership acquired (lock %s, pid %s)", lock_key, os.getpid()
+                                )
+                                on_elected()
+                        stop.wait(retry_seconds)
+                finally:
+                    if leader:
+                        logger.info("Leadership released (lock %s, pid %s)", lock_key, os.getpid())
+                        on_lost()
+        except Exception:
+            logger.exception("Leader election connection error; retrying")
+            stop.wait(retry_seconds)
@@ -1,8 +1,10 @@
+import hashlib
+import json
 import logging
 from typing import Dict, Optional
 
 from dnd_helper_api.db import get_session
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Request, Response
 from sqlmodel import Session, select
 
 from shared_models.enums import Language
@@ -23,13 +25,23 @@ def _select_language(lang: Optional[str]) -> Language:
     return Language.RU
 
 
+def _etag(result: Dict[str, str]) -> str:
+    body = json.dumps(result, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
 @router.get("/ui", response_model=Dict[str, str])
 def get_ui_translations(
     ns: str,
+    request: Request,
     lang: Optional[str] = None,
     session: Session = Depends(get_session),  # noqa: B008
     response: Response = None,
 ) -> Dict[str, str]:
+    """UI texts of `ns` in `lang`, with an ETag derived from the content.
+
+    Clients revalidate with `If-None-Match` and get a 304 while nothing changed.
+    """
     requested = _select_language(lang)
     if response is not None:
         response.headers["Content-Language"] = requested.value
@@ -55,6 +67,15 @@ def get_ui_translations(
             if r.key not in result:
                 result[r.key] = r.text
 
+    etag = _etag(result)
+    if response is not None:
+        response.headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(
+            status_code=304, headers={"ETag": etag, "Content-Language": requested.value}
+        )
+
     logger.info("UI translations fetched", extra={"namespace": ns, "lang": requested.value, "count": len(result)})
     return result
 
@@ -1,19 +1,27 @@
-from typing import Any, Optional
+from typing import Any, Mapping, Sequence
 
 from shared_models import Monster
 
+# Columns read by `derive_monster_columns` and the ones it returns. Derived
+# columns are inputs too: a derived value is kept when its source is unknown.
+MONSTER_DERIVED_FIELDS = ("is_flying",)
+MONSTER_DERIVED_INPUTS = ("speed_fly",) + MONSTER_DERIVED_FIELDS
 
-def _compute_monster_derived_fields(monster: Monster) -> None:
-    senses: dict[str, Any] = monster.senses or {}
 
-    def _as_int(value: Any) -> Optional[int]:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return None
+def derive_monster_columns(columns: Mapping[str, Sequence[Any]]) -> dict[str, list[Any]]:
+    """Derived fields for a columnar batch: {input column: values} -> {derived column: values}."""
+    return {
+        "is_flying": [
+            fly > 0 if fly is not None else current
+            for fly, current in zip(columns["speed_fly"], columns["is_flying"], strict=True)
+        ],
+    }
+
 
-    if monster.speed_fly is not None:
-        monster.is_flying = monster.speed_fly > 0
+def _compute_monster_derived_fields(monster: Monster) -> None:
+    derived = derive_monster_columns({c: [getattr(monster, c)] for c in MONSTER_DERIVED_INPUTS})
+    for column, values in derived.items():
+        setattr(monster, column, values[0])
 
 
 
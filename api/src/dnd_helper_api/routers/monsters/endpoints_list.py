@@ -1,9 +1,10 @@
 from typing import Any, Dict, List, Optional
 
+from dnd_helper_api.catalog import PageOrder, cached_page, cached_response, register_payload
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.monsters import logger, router
 from dnd_helper_api.utils.enum_labels import resolve_enum_labels
-from fastapi import Depends, Response
+from fastapi import Depends, Query, Request, Response
 from sqlmodel import Session, select
 
 from shared_models import Monster
@@ -41,42 +42,43 @@ def _with_labels(monster: Monster, labels: Dict[tuple[str, str], str]) -> Dict[s
 
 
 
-@router.get("/list/raw", response_model=List[Monster])
-def list_monsters_alias_raw(
-    lang: Optional[str] = None,
-    session: Session = Depends(get_session),  # noqa: B008
-    response: Response = None,
-) -> List[Monster]:
-    requested_lang = _select_language(lang)
+def _list_raw(session: Session, lang: Language) -> List[Monster]:
     monsters = session.exec(select(Monster)).all()
-    if response is not None:
-        response.headers["Content-Language"] = requested_lang.value
     logger.info("Monsters listed", extra={"count": len(monsters)})
     return monsters
 
 
-@router.get("/list/wrapped", response_model=List[Dict[str, Any]])
-def list_monsters_alias_wrapped(
+@router.get("/list/raw", response_model=List[Monster])
+def list_monsters_alias_raw(
+    request: Request,
     lang: Optional[str] = None,
     session: Session = Depends(get_session),  # noqa: B008
-    response: Response = None,
+) -> Response:
+    return cached_response(
+        session,
+        "monsters:list_raw",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+def _wrapped_items(
+    session: Session, lang: Language, ids: Optional[List[int]] = None
 ) -> List[Dict[str, Any]]:
-    monsters = session.exec(select(Monster)).all()
-    requested_lang: Language = _select_language(lang)
-    if response is not None:
-        response.headers["Content-Language"] = requested_lang.value
+    stmt = select(Monster) if ids is None else select(Monster).where(Monster.id.in_(ids))
+    monsters = session.exec(stmt).all()
     codes = {
         "monster_type": {str(m.type).lower() for m in monsters if m.type},
         "monster_size": {str(m.size).lower() for m in monsters if m.size},
         "danger_level": {str(m.cr) for m in monsters if m.cr},
     }
-    labels = resolve_enum_labels(session, requested_lang, codes)
+    labels = resolve_enum_labels(session, lang, codes)
     result: List[Dict[str, Any]] = []
     for m in monsters:
         result.append(
             {
                 "entity": m.model_dump(),
-                "translation": _effective_monster_translation_dict(session, int(m.id), lang) if m.id is not None else None,
+                "translation": _effective_monster_translation_dict(session, int(m.id), lang.value) if m.id is not None else None,
                 "labels": {
                     **({"type": {"code": str(m.type).lower(), "label": labels.get(("monster_type", str(m.type).lower()), str(m.type))} if m.type else {}}),
                     **({"size": {"code": str(m.size).lower(), "label": labels.get(("monster_size", str(m.size).lower()), str(m.size))} if m.size else {}}),
@@ -88,3 +90,89 @@ def list_monsters_alias_wrapped(
     return result
 
 
+def _list_wrapped(session: Session, lang: Language) -> List[Dict[str, Any]]:
+    return _wrapped_items(session, lang)
+
+
+@router.get("/list/wrapped", response_model=List[Dict[str, Any]])
+def list_monsters_alias_wrapped(
+    request: Request,
+    lang: Optional[str] = None,
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Response:
+    return cached_response(
+        session,
+        "monsters:list_wrapped",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+def _list_options(session: Session, lang: Language) -> Dict[str, Any]:
+    types = {str(t).lower() for t in session.exec(select(Monster.type).distinct()) if t}
+    labels = resolve_enum_labels(session, lang, {"monster_type": types})
+    options = [{"code": c, "label": labels.get(("monster_type", c), c)} for c in types]
+    return {"types": sorted(options, key=lambda o: o["label"])}
+
+
+@router.get("/list/options", response_model=Dict[str, Any])
+def list_monsters_options(
+    request: Request,
+    lang: Optional[str] = None,
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Response:
+    """Filter values present in the catalog, with labels."""
+    return cached_response(
+        session,
+        "monsters:list_options",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+@router.get("/list/page", response_model=Dict[str, Any])
+def list_monsters_page(
+    lang: Optional[str] = None,
+    ids: Optional[List[int]] = Query(None),  # noqa: B008
+    cr: Optional[List[str]] = Query(None),  # noqa: B008
+    types: Optional[List[str]] = Query(None),  # noqa: B008
+    sizes: Optional[List[str]] = Query(None),  # noqa: B008
+    is_flying: Optional[bool] = None,
+    is_legendary: Optional[bool] = None,
+    order: PageOrder = Query(PageOrder.ID),  # noqa: B008
+    limit: int = Query(20, ge=0, le=100),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Dict[str, Any]:
+    """Filtered page of wrapped items plus the total match count.
+
+    `ids` restricts the page to those entities (e.g. the bot's search results).
+    List filters match any of the given codes; `false` flags also match unset values.
+    """
+    conditions: List[Any] = []
+    if ids:
+        conditions.append(Monster.id.in_(ids))
+    if cr:
+        conditions.append(Monster.cr.in_(cr))
+    if types:
+        conditions.append(Monster.type.in_([t.lower() for t in types]))
+    if sizes:
+        conditions.append(Monster.size.in_([s.lower() for s in sizes]))
+    for column, wanted in ((Monster.is_flying, is_flying), (Monster.is_legendary, is_legendary)):
+        if wanted is not None:
+            conditions.append(column.is_(True) if wanted else column.is_not(True))
+    return cached_page(
+        session,
+        "monsters:list_wrapped",
+        _select_language(lang),
+        Monster,
+        conditions,
+        order=order,
+        limit=limit,
+        offset=offset,
+    )
+
+
+register_payload("monsters:list_raw", _list_raw)
+register_payload("monsters:list_wrapped", _list_wrapped, item_builder=_wrapped_items)
+register_payload("monsters:list_options", _list_options)
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Any, List, Optional
 
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.monsters import logger, router
-from fastapi import Depends, HTTPException, Request, status
+from dnd_helper_api.utils.bulk_upsert import MAX_ITEMS, BulkSpec, bulk_upsert
+from fastapi import Body, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import delete
 from sqlmodel import Session, select
@@ -10,7 +12,12 @@ from sqlmodel import Session, select
 from shared_models import Monster
 from shared_models.monster_translation import MonsterTranslation
 
-from .derived import _compute_monster_derived_fields
+from .derived import (
+    MONSTER_DERIVED_FIELDS,
+    MONSTER_DERIVED_INPUTS,
+    _compute_monster_derived_fields,
+    derive_monster_columns,
+)
 from .translations import _select_language
 
 
@@ -144,10 +151,7 @@ async def update_monster(
     session.commit()
     session.refresh(monster)
 
-    try:
-        body = await request.json() if request is not None else {}
-    except Exception:
-        body = {}
+    # `body` already loaded above
     translations = body.get("translations") if isinstance(body, dict) else None
 
     if isinstance(translations, dict):
@@ -180,6 +184,41 @@ async def update_monster(
     return monster
 
 
+_BULK_SPEC = BulkSpec(
+    model=Monster,
+    translation_model=MonsterTranslation,
+    fk="monster_id",
+    derived_inputs=MONSTER_DERIVED_INPUTS,
+    derived_fields=MONSTER_DERIVED_FIELDS,
+    derive=derive_monster_columns,
+)
+
+
+@router.post("/bulk")
+def bulk_upsert_monsters(
+    items: List[Any] = Body(...),  # noqa: B008
+    session: Session = Depends(get_session),  # noqa: B008
+) -> JSONResponse:
+    if len(items) > MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_ITEMS} items per request",
+        )
+    written, results = bulk_upsert(session, _BULK_SPEC, items)
+    counts = {s: sum(1 for r in results if r["status"] == s) for s in ("created", "updated")}
+    if not written:
+        invalid = sum(1 for r in results if r["status"] == "invalid")
+        logger.warning("Monsters bulk upsert rejected: %d of %d items invalid", invalid, len(items))
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"items": results, "invalid": invalid},
+        )
+    logger.info(
+        "Monsters bulk upserted: %d created, %d updated", counts["created"], counts["updated"]
+    )
+    return JSONResponse(content={"items": results, **counts})
+
+
 @router.delete("/{monster_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_monster(
     monster_id: int,
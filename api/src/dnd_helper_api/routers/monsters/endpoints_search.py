@@ -1,9 +1,9 @@
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from dnd_helper_api.catalog import items_for_ids
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.monsters import logger, router
-from dnd_helper_api.utils.enum_labels import resolve_enum_labels
 from fastapi import Depends, Query, Response
 from sqlalchemy import or_
 from sqlmodel import Session, select
@@ -13,7 +13,6 @@ from shared_models.monster_translation import MonsterTranslation
 
 from .translations import (
     _apply_monster_translations_bulk,
-    _effective_monster_translation_dict,
     _select_language,
 )
 
@@ -159,7 +158,7 @@ def search_monsters_wrapped(
         )
     )
     stmt = (
-        select(Monster)
+        select(Monster.id)
         .join(MonsterTranslation, MonsterTranslation.monster_id == Monster.id)
         .where(
             MonsterTranslation.lang == requested_lang,
@@ -168,28 +167,11 @@ def search_monsters_wrapped(
         )
         .distinct()
     )
-    monsters = session.exec(stmt).all()
-
-    codes = {
-        "monster_type": {str(m.type).lower() for m in monsters if m.type},
-        "monster_size": {str(m.size).lower() for m in monsters if m.size},
-        "danger_level": {str(m.cr) for m in monsters if m.cr},
-    }
-    labels = resolve_enum_labels(session, requested_lang, codes)
-
-    result: List[Dict[str, Any]] = []
-    for m in monsters:
-        result.append(
-            {
-                "entity": m.model_dump(),
-                "translation": _effective_monster_translation_dict(session, int(m.id), lang) if m.id is not None else None,
-                "labels": {
-                    **({"type": {"code": str(m.type).lower(), "label": labels.get(("monster_type", str(m.type).lower()), str(m.type))} if m.type else {}}),
-                    **({"size": {"code": str(m.size).lower(), "label": labels.get(("monster_size", str(m.size).lower()), str(m.size))} if m.size else {}}),
-                    **({"cr": {"code": str(m.cr), "label": labels.get(("danger_level", str(m.cr)), str(m.cr))} if m.cr else {}}),
-                },
-            }
-        )
+    ids = session.exec(stmt).all()
+    # Items come from the pre-built wrapped list of the current catalog version
+    result: List[Dict[str, Any]] = items_for_ids(
+        session, "monsters:list_wrapped", requested_lang, ids
+    )
     if response is not None:
         response.headers["Content-Language"] = requested_lang.value
     logger.info("Monsters search-wrapped completed", extra={"query": q, "count": len(result)})
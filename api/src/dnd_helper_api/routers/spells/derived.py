@@ -1,8 +1,22 @@
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
 
 from shared_models import Spell
 
+# Columns read by `derive_spell_columns` and the ones it returns. Derived columns
+# are inputs too: most of them are only filled in when their source is present.
+SPELL_DERIVED_FIELDS = (
+    "is_concentration",
+    "damage_type",
+    "save_ability",
+    "attack_roll",
+    "targeting",
+    "casting_time",
+)
+SPELL_DERIVED_INPUTS = ("duration", "damage", "saving_throw", "area") + SPELL_DERIVED_FIELDS
 
+
+@lru_cache(maxsize=1024)
 def _normalize_casting_time(value: str) -> str:
     v = value.strip().lower()
     if "bonus action" in v:
@@ -22,29 +36,47 @@ def _normalize_casting_time(value: str) -> str:
     return v
 
 
-def _compute_spell_derived_fields(spell: Spell) -> None:
-    if spell.duration is not None:
-        dur = str(spell.duration).lower()
-        spell.is_concentration = ("concentration" in dur)
-
-    damage: Dict[str, Any] = spell.damage or {}
-    if isinstance(damage, dict) and damage.get("type") is not None:
-        spell.damage_type = str(damage.get("type"))
-
-    saving_throw: Dict[str, Any] = spell.saving_throw or {}
-    if isinstance(saving_throw, dict) and saving_throw.get("ability") is not None:
-        spell.save_ability = str(saving_throw.get("ability"))
-
-    if spell.attack_roll is None:
-        if damage and not saving_throw.get("ability"):
-            spell.attack_roll = True
+def _key(value: Any, key: str) -> Any:
+    return value.get(key) if isinstance(value, dict) else None
 
-    if spell.targeting is None:
-        area = spell.area or {}
-        if area:
-            spell.targeting = "POINT"
 
-    if spell.casting_time is not None:
-        spell.casting_time = _normalize_casting_time(str(spell.casting_time))
+def derive_spell_columns(columns: Mapping[str, Sequence[Any]]) -> dict[str, list[Any]]:
+    """Derived fields for a columnar batch: {input column: values} -> {derived column: values}."""
+    damage_types = [_key(d, "type") for d in columns["damage"]]
+    save_abilities = [_key(s, "ability") for s in columns["saving_throw"]]
+    return {
+        "is_concentration": [
+            "concentration" in str(duration).lower() if duration is not None else current
+            for duration, current in zip(
+                columns["duration"], columns["is_concentration"], strict=True
+            )
+        ],
+        "damage_type": [
+            str(found) if found is not None else current
+            for found, current in zip(damage_types, columns["damage_type"], strict=True)
+        ],
+        "save_ability": [
+            str(found) if found is not None else current
+            for found, current in zip(save_abilities, columns["save_ability"], strict=True)
+        ],
+        "attack_roll": [
+            True if current is None and damage and not ability else current
+            for damage, ability, current in zip(
+                columns["damage"], save_abilities, columns["attack_roll"], strict=True
+            )
+        ],
+        "targeting": [
+            "POINT" if current is None and area else current
+            for area, current in zip(columns["area"], columns["targeting"], strict=True)
+        ],
+        "casting_time": [
+            _normalize_casting_time(str(value)) if value is not None else None
+            for value in columns["casting_time"]
+        ],
+    }
 
 
+def _compute_spell_derived_fields(spell: Spell) -> None:
+    derived = derive_spell_columns({c: [getattr(spell, c)] for c in SPELL_DERIVED_INPUTS})
+    for column, values in derived.items():
+        setattr(spell, column, values[0])
@@ -1,9 +1,11 @@
 from typing import Any, Dict, List, Optional
 
+from dnd_helper_api.catalog import PageOrder, cached_page, cached_response, register_payload
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.spells import logger, router
 from dnd_helper_api.utils.enum_labels import resolve_enum_labels
-from fastapi import Depends, Response
+from fastapi import Depends, Query, Request, Response
+from shared_models.enums import Language
 from sqlmodel import Session, select
 
 from shared_models import Spell
@@ -42,41 +44,42 @@ def _with_labels(spell: Spell, labels: Dict[tuple[str, str], str]) -> Dict[str,
 
 
 
-@router.get("/list/raw", response_model=List[Spell])
-def list_spells_raw(
-    lang: Optional[str] = None,
-    session: Session = Depends(get_session),  # noqa: B008
-    response: Response = None,
-) -> List[Spell]:
-    requested_lang = _select_language(lang)
+def _list_raw(session: Session, lang: Language) -> List[Spell]:
     spells = session.exec(select(Spell)).all()
-    if response is not None:
-        response.headers["Content-Language"] = requested_lang.value
     logger.info("Spells listed", extra={"count": len(spells)})
     return spells
 
 
-@router.get("/list/wrapped", response_model=List[Dict[str, Any]])
-def list_spells_wrapped_list(
+@router.get("/list/raw", response_model=List[Spell])
+def list_spells_raw(
+    request: Request,
     lang: Optional[str] = None,
     session: Session = Depends(get_session),  # noqa: B008
-    response: Response = None,
+) -> Response:
+    return cached_response(
+        session,
+        "spells:list_raw",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+def _wrapped_items(
+    session: Session, lang: Language, ids: Optional[List[int]] = None
 ) -> List[Dict[str, Any]]:
-    spells = session.exec(select(Spell)).all()
-    requested_lang = _select_language(lang)
-    if response is not None:
-        response.headers["Content-Language"] = requested_lang.value
+    stmt = select(Spell) if ids is None else select(Spell).where(Spell.id.in_(ids))
+    spells = session.exec(stmt).all()
     codes = {
         "spell_school": {str(s.school) for s in spells if s.school},
         "caster_class": {c for s in spells for c in (s.classes or [])},
     }
-    labels = resolve_enum_labels(session, requested_lang, codes)
+    labels = resolve_enum_labels(session, lang, codes)
     result: List[Dict[str, Any]] = []
     for s in spells:
         result.append(
             {
                 "entity": s.model_dump(),
-                "translation": _effective_spell_translation_dict(session, int(s.id), lang) if s.id is not None else None,
+                "translation": _effective_spell_translation_dict(session, int(s.id), lang.value) if s.id is not None else None,
                 "labels": {
                     **({"school": {"code": str(s.school), "label": labels.get(("spell_school", str(s.school)), str(s.school))} if s.school else {}}),
                     **({"classes": [
@@ -89,3 +92,103 @@ def list_spells_wrapped_list(
     logger.info("Spells wrapped listed", extra={"count": len(result)})
     return result
 
+
+def _list_wrapped(session: Session, lang: Language) -> List[Dict[str, Any]]:
+    return _wrapped_items(session, lang)
+
+
+@router.get("/list/wrapped", response_model=List[Dict[str, Any]])
+def list_spells_wrapped_list(
+    request: Request,
+    lang: Optional[str] = None,
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Response:
+    return cached_response(
+        session,
+        "spells:list_wrapped",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+def _list_options(session: Session, lang: Language) -> Dict[str, Any]:
+    schools = {str(s) for s in session.exec(select(Spell.school).distinct()) if s}
+    classes = {c for row in session.exec(select(Spell.classes)) for c in (row or [])}
+    labels = resolve_enum_labels(session, lang, {"spell_school": schools, "caster_class": classes})
+
+    def options(enum_type: str, codes: set) -> List[Dict[str, str]]:
+        items = [{"code": c, "label": labels.get((enum_type, c), c)} for c in codes]
+        return sorted(items, key=lambda o: o["label"].lower())
+
+    return {
+        "schools": options("spell_school", schools),
+        "classes": options("caster_class", classes),
+    }
+
+
+@router.get("/list/options", response_model=Dict[str, Any])
+def list_spells_options(
+    request: Request,
+    lang: Optional[str] = None,
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Response:
+    """Filter values present in the catalog, with labels."""
+    return cached_response(
+        session,
+        "spells:list_options",
+        _select_language(lang),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+@router.get("/list/page", response_model=Dict[str, Any])
+def list_spells_page(
+    lang: Optional[str] = None,
+    ids: Optional[List[int]] = Query(None),  # noqa: B008
+    levels: Optional[List[int]] = Query(None),  # noqa: B008
+    schools: Optional[List[str]] = Query(None),  # noqa: B008
+    classes: Optional[List[str]] = Query(None),  # noqa: B008
+    casting_times: Optional[List[str]] = Query(None),  # noqa: B008
+    ritual: Optional[bool] = None,
+    is_concentration: Optional[bool] = None,
+    order: PageOrder = Query(PageOrder.ID),  # noqa: B008
+    limit: int = Query(20, ge=0, le=100),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),  # noqa: B008
+) -> Dict[str, Any]:
+    """Filtered page of wrapped items plus the total match count.
+
+    `ids` restricts the page to those entities (e.g. the bot's search results).
+    List filters match any of the given values (`classes`: any shared class);
+    `false` flags also match unset values.
+    """
+    conditions: List[Any] = []
+    if ids:
+        conditions.append(Spell.id.in_(ids))
+    if levels:
+        conditions.append(Spell.level.in_(levels))
+    if schools:
+        conditions.append(Spell.school.in_(schools))
+    if classes:
+        conditions.append(Spell.classes.overlap(classes))
+    if casting_times:
+        # Stored values are normalized codes (see derived.py)
+        conditions.append(Spell.casting_time.in_(casting_times))
+    for column, wanted in ((Spell.ritual, ritual), (Spell.is_concentration, is_concentration)):
+        if wanted is not None:
+            conditions.append(column.is_(True) if wanted else column.is_not(True))
+    return cached_page(
+        session,
+        "spells:list_wrapped",
+        _select_language(lang),
+        Spell,
+        conditions,
+        order=order,
+        limit=limit,
+        offset=offset,
+    )
+
+
+register_payload("spells:list_raw", _list_raw)
+register_payload("spells:list_wrapped", _list_wrapped, item_builder=_wrapped_items)
+register_payload("spells:list_options", _list_options)
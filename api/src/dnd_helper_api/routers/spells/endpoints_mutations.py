@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Any, List, Optional
 
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.spells import logger, router
-from fastapi import Depends, HTTPException, Request, status
+from dnd_helper_api.utils.bulk_upsert import MAX_ITEMS, BulkSpec, bulk_upsert
+from fastapi import Body, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import delete
 from sqlmodel import Session, select
@@ -11,7 +13,12 @@ from shared_models import Spell
 from shared_models.enums import CasterClass, SpellSchool
 from shared_models.spell_translation import SpellTranslation
 
-from .derived import _compute_spell_derived_fields
+from .derived import (
+    SPELL_DERIVED_FIELDS,
+    SPELL_DERIVED_INPUTS,
+    _compute_spell_derived_fields,
+    derive_spell_columns,
+)
 from .translations import _select_language
 
 
@@ -155,10 +162,7 @@ async def update_spell(
     session.commit()
     session.refresh(spell)
 
-    try:
-        body = await request.json() if request is not None else {}
-    except Exception:
-        body = {}
+    # `body` already loaded above
     translations = body.get("translations") if isinstance(body, dict) else None
 
     if isinstance(translations, dict):
@@ -191,6 +195,41 @@ async def update_spell(
     return spell
 
 
+_BULK_SPEC = BulkSpec(
+    model=Spell,
+    translation_model=SpellTranslation,
+    fk="spell_id",
+    derived_inputs=SPELL_DERIVED_INPUTS,
+    derived_fields=SPELL_DERIVED_FIELDS,
+    derive=derive_spell_columns,
+)
+
+
+@router.post("/bulk")
+def bulk_upsert_spells(
+    items: List[Any] = Body(...),  # noqa: B008
+    session: Session = Depends(get_session),  # noqa: B008
+) -> JSONResponse:
+    if len(items) > MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_ITEMS} items per request",
+        )
+    written, results = bulk_upsert(session, _BULK_SPEC, items)
+    counts = {s: sum(1 for r in results if r["status"] == s) for s in ("created", "updated")}
+    if not written:
+        invalid = sum(1 for r in results if r["status"] == "invalid")
+        logger.warning("Spells bulk upsert rejected: %d of %d items invalid", invalid, len(items))
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"items": results, "invalid": invalid},
+        )
+    logger.info(
+        "Spells bulk upserted: %d created, %d updated", counts["created"], counts["updated"]
+    )
+    return JSONResponse(content={"items": results, **counts})
+
+
 @router.delete("/{spell_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_spell(
     spell_id: int,
@@ -1,9 +1,9 @@
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from dnd_helper_api.catalog import items_for_ids
 from dnd_helper_api.db import get_session
 from dnd_helper_api.routers.spells import logger, router
-from dnd_helper_api.utils.enum_labels import resolve_enum_labels
 from fastapi import Depends, Query, Response
 from sqlalchemy import or_
 from sqlmodel import Session, select
@@ -13,7 +13,6 @@ from shared_models.spell_translation import SpellTranslation
 
 from .translations import (
     _apply_spell_translations_bulk,
-    _effective_spell_translation_dict,
     _select_language,
 )
 
@@ -168,7 +167,7 @@ def search_spells_wrapped(
         )
     )
     stmt = (
-        select(Spell)
+        select(Spell.id)
         .join(SpellTranslation, SpellTranslation.spell_id == Spell.id)
         .where(
             SpellTranslation.lang == requested_lang,
@@ -177,29 +176,11 @@ def search_spells_wrapped(
         )
         .distinct()
     )
-    spells = session.exec(stmt).all()
-
-    codes = {
-        "spell_school": {str(s.school) for s in spells if s.school},
-        "caster_class": {c for s in spells for c in (s.classes or [])},
-    }
-    labels = resolve_enum_labels(session, requested_lang, codes)
-
-    result: List[Dict[str, Any]] = []
-    for s in spells:
-        result.append(
-            {
-                "entity": s.model_dump(),
-                "translation": _effective_spell_translation_dict(session, int(s.id), lang) if s.id is not None else None,
-                "labels": {
-                    **({"school": {"code": str(s.school), "label": labels.get(("spell_school", str(s.school)), str(s.school))} if s.school else {}}),
-                    **({"classes": [
-                        {"code": c, "label": labels.get(("caster_class", str(c)), str(c))}
-                        for c in (s.classes or [])
-                    ]} if s.classes else {}),
-                },
-            }
-        )
+    ids = session.exec(stmt).all()
+    # Items come from the pre-built wrapped list of the current catalog version
+    result: List[Dict[str, Any]] = items_for_ids(
+        session, "spells:list_wrapped", requested_lang, ids
+    )
     if response is not None:
         response.headers["Content-Language"] = requested_lang.value
     logger.info("Spells search-wrapped completed", extra={"query": q, "count": len(result)})
@@ -0,0 +1,152 @@
+"""Content-addressed storage for admin uploads under `ADMIN_UPLOAD_DIR`.
+
+Uploads are hashed while they stream to a temp file and then moved to
+`blobs/<aa>/<sha256><suffix>`. The suffix is kept because the worker picks the
+reader by extension (`.zip`, `.tar.gz`, `.json`). Uploading identical content
+again reuses the existing blob. Blobs that no live job references are removed
+by `collect_garbage`.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from fastapi import UploadFile
+from shared_models.admin_job import AdminJob
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session as SASession
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 1024 * 1024
+# Blobs referenced only by jobs that finished longer ago than this are collectable
+RETENTION_DAYS = max(0.0, float(os.getenv("ADMIN_UPLOAD_RETENTION_DAYS", "7")))
+# Files touched more recently than this are never collected (uploads in flight)
+GRACE_SECONDS = max(60, int(os.getenv("ADMIN_UPLOAD_GC_GRACE_SECONDS", "3600")))
+
+_SUFFIXES = (".tar.gz", ".tgz", ".zip", ".json", ".jsonl", ".gz")
+
+
+def upload_dir() -> Path:
+    return Path(os.getenv("ADMIN_UPLOAD_DIR", "/data/admin_uploads"))
+
+
+def _suffix(filename: str) -> str:
+    name = filename.lower()
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix):
+            return suffix
+    return ""
+
+
+def blob_path(sha256: str, filename: str) -> Path:
+    return upload_dir() / "blobs" / sha256[:2] / f"{sha256}{_suffix(filename)}"
+
+
+def _store_stream(src: BinaryIO, filename: str) -> tuple[str, str, bool]:
+    tmp_dir = upload_dir() / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        sha256 = digest.hexdigest()
+        dest = blob_path(sha256, filename)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            # Refresh mtime so a concurrent GC pass treats the blob as in use
+            os.utime(dest)
+            return str(dest), sha256, True
+        os.replace(tmp_name, dest)
+        return str(dest), sha256, False
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+async def store_upload(file: UploadFile) -> tuple[str, str, bool]:
+    """Stream `file` to the blob store; returns (path, sha256, deduplicated).
+
+    Hashing, writing and the rename run in the threadpool, off the event loop.
+    """
+    await file.seek(0)
+    return await run_in_threadpool(_store_stream, file.file, file.filename or "")
+
+
+def find_reusable_job(
+    session: SASession, sha256: str, job_type: str, args: dict[str, Any]
+) -> Optional[AdminJob]:
+    """Latest succeeded job of the same type and args over identical content."""
+    candidates = (
+        session.query(AdminJob)  # type: ignore[attr-defined]
+        .filter(
+            AdminJob.file_sha256 == sha256,
+            AdminJob.job_type == job_type,
+            AdminJob.status == "succeeded",
+        )
+        .order_by(AdminJob.finished_at.desc())  # type: ignore[union-attr]
+        .limit(20)
+        .all()
+    )
+    for job in candidates:
+        if (job.args or {}) == args:
+            return job
+    return None
+
+
+def collect_garbage(session: SASession, now: Optional[datetime] = None) -> dict[str, int]:
+    """Delete blobs (and stray temp/legacy files) that no live job references.
+
+    A job is live while queued or running, or until `RETENTION_DAYS` after it
+    finished. Files modified within `GRACE_SECONDS` are always kept.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=RETENTION_DAYS)
+    live = session.execute(
+        select(AdminJob.file_path).where(
+            AdminJob.file_path.is_not(None),  # type: ignore[union-attr]
+            or_(
+                AdminJob.status.in_(("queued", "running")),  # type: ignore[attr-defined]
+                AdminJob.finished_at.is_(None),  # type: ignore[union-attr]
+                AdminJob.finished_at >= cutoff,  # type: ignore[operator]
+            ),
+        )
+    ).scalars()
+    referenced = {os.path.realpath(p) for p in live}
+    session.rollback()
+
+    root = upload_dir()
+    stats = {"removed": 0, "kept": 0, "bytes_freed": 0}
+    if not root.exists():
+        return stats
+    fresh_after = time.time() - GRACE_SECONDS
+    # Blobs, interrupted temp files and pre-blob `{uuid}_{name}` uploads at the top level
+    candidates = [p for p in root.iterdir() if p.is_file()]
+    for sub in ("blobs", "tmp"):
+        if (root / sub).exists():
+            candidates.extend(p for p in (root / sub).rglob("*") if p.is_file())
+    for path in candidates:
+        try:
+            st = path.stat()
+            if os.path.realpath(path) in referenced or st.st_mtime >= fresh_after:
+                stats["kept"] += 1
+                continue
+            path.unlink()
+            stats["removed"] += 1
+            stats["bytes_freed"] += st.st_size
+        except FileNotFoundError:
+            continue
+    logger.info("Upload GC finished", extra=stats)
+    return stats
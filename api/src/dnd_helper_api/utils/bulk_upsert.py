@@ -0,0 +1,234 @@
+"""Shared implementation of `POST /monsters/bulk` and `POST /spells/bulk`.
+
+Every item is an entity body (the model's fields) with optional inline
+`translations` (`{"ru": {...}, "en": {...}}`). An item with `id` updates that
+row; otherwise an item whose `slug` matches an existing row updates it (lowest
+id wins) and the rest are created. Updates only change the fields the item
+carries.
+
+All items are validated before anything is written: unknown keys, unknown
+languages, model validation of the merged row, missing `name`/`description` on
+new translations, and several items targeting the same row. If any item fails,
+nothing is written and every item reports its status. Otherwise derived fields
+are computed for the whole batch with the columnar API. The batch is then written
+in one transaction: one multi-row INSERT for new entities, an executemany
+UPDATE by primary key for existing ones, and `INSERT ... ON CONFLICT` for
+translations.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from pydantic import ValidationError
+from shared_models.enums import Language
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session
+
+MAX_ITEMS = max(1, int(os.getenv("API_BULK_MAX_ITEMS", "1000")))
+
+_AUDIT_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+@dataclass(frozen=True)
+class BulkSpec:
+    model: Any
+    translation_model: Any
+    fk: str
+    derived_inputs: tuple[str, ...]
+    derived_fields: tuple[str, ...]
+    derive: Callable[[Mapping[str, Sequence[Any]]], dict[str, list[Any]]]
+
+    @property
+    def columns(self) -> list[str]:
+        return [c.name for c in self.model.__table__.columns if c.name not in _AUDIT_COLUMNS]
+
+    @property
+    def translation_columns(self) -> set[str]:
+        table = self.translation_model.__table__
+        return {c.name for c in table.columns} - _AUDIT_COLUMNS - {self.fk, "lang"}
+
+
+def _errors(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(p) for p in err['loc']) or 'body'}: {err['msg']}" for err in exc.errors()
+    ]
+
+
+def _check_shape(spec: BulkSpec, item: Any) -> list[str]:
+    if not isinstance(item, dict):
+        return ["item must be an object"]
+    errors: list[str] = []
+    extra = set(item) - set(spec.model.model_fields) - {"translations"}
+    if extra:
+        errors.append(f"Unexpected fields: {sorted(extra)}")
+    if item.get("id") is not None and not isinstance(item["id"], int):
+        errors.append("id: must be an integer")
+    translations = item.get("translations")
+    if translations is None:
+        return errors
+    if not isinstance(translations, dict):
+        return errors + ["translations: must be an object keyed by language"]
+    allowed = spec.translation_columns
+    for lang, data in translations.items():
+        if lang not in {language.value for language in Language}:
+            errors.append(f"translations.{lang}: unsupported language")
+        elif not isinstance(data, dict):
+            errors.append(f"translations.{lang}: must be an object")
+        elif set(data) - allowed:
+            errors.append(f"translations.{lang}: unexpected fields {sorted(set(data) - allowed)}")
+    return errors
+
+
+def bulk_upsert(session: Session, spec: BulkSpec, items: list[Any]) -> tuple[bool, list[dict]]:
+    """Validate and write `items`; returns (written, per-item results)."""
+    model, table = spec.model, spec.model.__table__
+    results: list[dict[str, Any]] = [{"index": i, "status": "valid"} for i in range(len(items))]
+    errors: list[list[str]] = [_check_shape(spec, item) for item in items]
+
+    # Resolve targets: explicit ids, then slugs of items without an id
+    ids = {
+        item["id"]
+        for item, errs in zip(items, errors, strict=True)
+        if not errs and item.get("id") is not None
+    }
+    slugs = {
+        item["slug"]
+        for item, errs in zip(items, errors, strict=True)
+        if not errs and item.get("id") is None and item.get("slug")
+    }
+    existing: dict[int, dict[str, Any]] = {}
+    by_slug: dict[str, int] = {}
+    if ids or slugs:
+        cond = table.c.id.in_(ids) | table.c.slug.in_(slugs)
+        for row in session.execute(select(table).where(cond).order_by(table.c.id)).mappings():
+            existing[row["id"]] = dict(row)
+            if row["slug"] in slugs:
+                by_slug.setdefault(row["slug"], row["id"])
+
+    targets: list[Optional[int]] = []
+    seen: dict[int, int] = {}
+    for i, item in enumerate(items):
+        target: Optional[int] = None
+        if not errors[i]:
+            if item.get("id") is not None:
+                target = item["id"]
+                if target not in existing:
+                    errors[i].append(f"id: {model.__name__} {target} not found")
+            elif item.get("slug"):
+                target = by_slug.get(item["slug"])
+            if target is not None and target in seen:
+                errors[i].append(f"targets the same row as item {seen[target]}")
+            elif target is not None:
+                seen[target] = i
+        targets.append(target)
+
+    translated = [t for t in targets if t is not None]
+    known_translations: set[tuple[Optional[int], str]] = set()
+    if translated:
+        tr = spec.translation_model.__table__
+        known_translations = {
+            (row[0], row[1])
+            for row in session.execute(
+                select(tr.c[spec.fk], tr.c.lang).where(tr.c[spec.fk].in_(translated))
+            )
+        }
+
+    objs: list[Any] = []
+    for i, item in enumerate(items):
+        if errors[i]:
+            objs.append(None)
+            continue
+        fields = {k: v for k, v in item.items() if k != "translations"}
+        base = existing.get(targets[i], {}) if targets[i] is not None else {}
+        merged = {k: v for k, v in base.items() if k not in _AUDIT_COLUMNS} | fields
+        try:
+            objs.append(model.model_validate(merged))
+        except ValidationError as exc:
+            errors[i].extend(_errors(exc))
+            objs.append(None)
+            continue
+        for lang, data in (item.get("translations") or {}).items():
+            if (targets[i], lang) in known_translations:
+                continue
+            missing = [k for k in ("name", "description") if not data.get(k)]
+            if missing:
+                errors[i].append(f"translations.{lang}: new translation needs {missing}")
+
+    if any(errors):
+        for result, errs in zip(results, errors, strict=True):
+            if errs:
+                result.update(status="invalid", errors=errs)
+        return False, results
+
+    derived = spec.derive({c: [getattr(obj, c) for obj in objs] for c in spec.derived_inputs})
+    for c in spec.derived_fields:
+        for obj, value in zip(objs, derived[c], strict=True):
+            setattr(obj, c, value)
+
+    def row(obj: Any, keys: Sequence[str]) -> dict[str, Any]:
+        dumped = obj.model_dump(mode="json")
+        return {k: dumped[k] for k in keys if k in dumped}
+
+    new = [i for i, t in enumerate(targets) if t is None]
+    if new:
+        inserted = session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [row(objs[i], spec.columns) for i in new],
+        ).scalars().all()
+        for i, new_id in zip(new, inserted, strict=True):
+            targets[i] = new_id
+            results[i].update(status="created")
+    new_set = set(new)
+    changed = [i for i in range(len(items)) if i not in new_set]
+    if changed:
+        session.execute(
+            update(model),
+            [
+                {
+                    "id": targets[i],
+                    **row(
+                        objs[i],
+                        [k for k in spec.columns if k in items[i] or k in spec.derived_fields],
+                    ),
+                }
+                for i in changed
+            ],
+        )
+        for i in changed:
+            results[i].update(status="updated")
+
+    # Translations grouped by the fields they carry. New rows go through one multi-row
+    # upsert per group; existing rows get an executemany UPDATE of just those fields
+    # (an INSERT of a partial row would trip the NOT NULL columns before ON CONFLICT).
+    tr = spec.translation_model.__table__
+    inserts: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    updates: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for i, item in enumerate(items):
+        for lang, data in (item.get("translations") or {}).items():
+            keys = tuple(sorted(data))
+            if (targets[i], lang) in known_translations:
+                if keys:
+                    where = {"b_id": targets[i], "b_lang": lang}
+                    updates.setdefault(keys, []).append({**where, **data})
+            else:
+                inserts.setdefault(keys, []).append({spec.fk: targets[i], "lang": lang, **data})
+    for keys, rows in inserts.items():
+        stmt = pg_insert(tr).values(rows)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[spec.fk, "lang"],
+                set_={k: stmt.excluded[k] for k in keys},
+            )
+        )
+    for rows in updates.values():
+        session.execute(
+            update(tr).where(tr.c[spec.fk] == bindparam("b_id"), tr.c.lang == bindparam("b_lang")),
+            rows,
+        )
+
+    session.commit()
+    for i, result in enumerate(results):
+        result.update(id=targets[i], slug=objs[i].slug)
+    return True, results
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Any
+from uuid import UUID
+
+
+def json_value(value: Any) -> Any:
+    """Convert a column value to something `json.dumps` accepts."""
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def serialize_instance(obj: Any) -> dict:
+    """Return a JSON-friendly dict of a table model's column values ({} on failure)."""
+    try:
+        return {
+            col.name: json_value(getattr(obj, col.name))
+            for col in obj.__table__.columns  # type: ignore[attr-defined]
+        }
+    except Exception:
+        return {}
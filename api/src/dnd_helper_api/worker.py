@@ -0,0 +1,836 @@
+# ruff: noqa: I001
+"""Admin job worker: processes queued `AdminJob` rows (legacy imports and bundle ingest).
+
+Runs either inside the API process (`WorkerRunner` started from the app's startup
+hook) or standalone as its own process pool:
+
+    python -m dnd_helper_api.worker
+
+The standalone process builds its own engine/pool so that imports do not compete
+with request handling for the API's GIL and connections.
+"""
+import os
+import itertools
+import json as _json
+import logging
+import multiprocessing
+import signal
+import threading
+from typing import Any, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as SASession
+from sqlmodel import Session, create_engine
+
+from dnd_helper_api.db import DATABASE_URL
+from dnd_helper_api.catalog import DEFER_BUMP_KEY, bump_catalog_version
+from dnd_helper_api.ingest.bulk import run_bulk_ingest
+from dnd_helper_api.ingest.records import prepare_monster, prepare_spell
+from dnd_helper_api.ingest.finalize import run_post_ingest, touched_tables, touches_catalog
+from dnd_helper_api.ingest.translations import TRANSLATION_KINDS, TranslationUpserter
+from dnd_helper_api.ingest.validate import validate_bundle, validate_legacy_upload
+from dnd_helper_api.ingest.bundle import (
+    bundle_mode,
+    declared_rows,
+    iter_ndjson,
+    open_bundle,
+    read_manifest,
+    read_member,
+)
+from dnd_helper_api.job_progress import JobProgress
+from dnd_helper_api.job_queue import (
+    WORKER_LEADER_LOCK,
+    LeaseHeartbeat,
+    LeaseLost,
+    claim_next_job,
+    finish_job,
+    hold_leadership,
+    listen_for_jobs,
+    make_worker_id,
+    notify_job_progress,
+)
+from dnd_helper_api.logging_config import configure_logging
+from dnd_helper_api.routers.monsters.derived import _compute_monster_derived_fields
+from dnd_helper_api.routers.spells.derived import _compute_spell_derived_fields
+from dnd_helper_api.upload_store import collect_garbage
+from dnd_helper_api.utils.serialization import serialize_instance
+from shared_models import Monster, Spell
+from shared_models.admin_job import AdminJob
+from shared_models.enums import Language
+
+logger = logging.getLogger(__name__)
+
+_MONSTER_TRANSLATION_FIELDS = (
+    "name",
+    "description",
+    "traits",
+    "actions",
+    "reactions",
+    "legendary_actions",
+    "spellcasting",
+    "languages_text",
+)
+
+
+def _uses_staging(job: AdminJob) -> bool:
+    """Bulk jobs and tombstone/snapshot bundles run through the COPY/merge path.
+
+    Deletes need the whole bundle staged in one transaction, so non-upsert
+    bundles take that path even without `bulk=true`.
+    """
+    if (job.args or {}).get("bulk"):
+        return True
+    kind, arc = open_bundle(job.file_path or "")
+    try:
+        return bundle_mode(read_manifest(kind, arc)) != "upsert"
+    finally:
+        arc.close()
+
+
+def _process_bulk_bundle(
+    session: SASession, job: AdminJob, lease: Optional[LeaseHeartbeat]
+) -> dict[str, Any]:
+    """COPY/merge path for `bundle_ingest`; commits together with the job status."""
+    kind, arc = open_bundle(job.file_path or "")
+    try:
+        manifest = read_manifest(kind, arc)
+        files = manifest["files"]
+        progress = JobProgress(
+            session.get_bind(),
+            job.id,
+            rows_expected_total=declared_rows(files),
+            files_total=len(files),
+            lease=lease,
+        )
+
+        def _records(fdesc: dict) -> Any:
+            compression = str((fdesc.get("compression") or "none")).strip().lower()
+            data = read_member(kind, arc, str((fdesc.get("path") or "")).strip())
+            return iter_ndjson(data, compression)
+
+        run_bulk_ingest(session, files, _records, progress, mode=bundle_mode(manifest))
+        return progress.snapshot(final=True)
+    finally:
+        arc.close()
+
+
+def _process_dry_run(
+    session: SASession, job: AdminJob, lease: Optional[LeaseHeartbeat]
+) -> dict[str, Any]:
+    """Validate the upload of a `dry_run` job; nothing but the job row is written."""
+    progress = JobProgress(session.get_bind(), job.id, lease=lease)
+    if job.job_type == "bundle_ingest":
+        validate_bundle(job.file_path or "", progress)
+    else:
+        validate_legacy_upload(job.job_type, job.file_path or "", progress)
+    return {**progress.snapshot(final=True), "dry_run": True}
+
+
+def _post_ingest(session: SASession, job: AdminJob, counters: dict[str, Any]) -> dict[str, Any]:
+    """Run the post-ingest stage; a failure there is recorded but does not fail the job."""
+    tables = touched_tables(job.job_type, counters)
+    try:
+        with session.begin_nested():
+            return run_post_ingest(session, tables)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Post-ingest stage failed", extra={"job_id": str(job.id)})
+        # Stale payloads must not outlive the data change even without a warmup
+        if touches_catalog(tables):
+            bump_catalog_version(session)
+        return {"tables": tables, "error": str(exc)}
+
+
+def _process_job(
+    session: SASession, job: AdminJob, lease: Optional[LeaseHeartbeat] = None
+) -> None:
+    """Run a claimed job and record its result, unless its lease is lost meanwhile.
+
+    `lease` (the job's heartbeat) is polled while rows are processed; once it is
+    lost the job stops, its uncommitted writes are rolled back and the status
+    row is left to the worker that reclaimed it.
+    """
+    # The lease names the claiming worker; `job.worker_id` reloads whoever owns the row now
+    job_id = job.id
+    owner = lease.worker_id if lease is not None else job.worker_id or ""
+    check_lease = lease.check if lease is not None else (lambda: None)
+    # Ingest bumps the catalog version once, in the post-ingest stage
+    session.info[DEFER_BUMP_KEY] = True
+    try:
+        job.status = "running"
+        session.commit()
+        counters: dict[str, Any] = {"processed": 0, "created": 0, "updated": 0, "skipped": 0}
+        counters_result: dict | None = None
+        # Legacy JSON uploads are loaded strictly inside their respective branches below
+        if (job.args or {}).get("dry_run"):
+            counters_result = _process_dry_run(session, job, lease)
+        elif job.job_type == "monsters_import":
+            with open(job.file_path or "", "rb") as f:  # type: ignore[arg-type]
+                payload = _json.load(f)
+            rows = (payload or {}).get("monsters") or []
+            tr_rows = (payload or {}).get("monster_translations") or []
+            # index translations by (slug, lang)
+            tr_index: dict[tuple[str, str], dict] = {}
+            for it in tr_rows if isinstance(tr_rows, list) else []:
+                slug = str(it.get("monster_slug") or "").strip()
+                lang = str(it.get("lang") or "").strip().lower()
+                if slug and lang in {"ru", "en"}:
+                    tr_index[(slug, lang)] = it
+            # Translations are buffered and upserted per batch
+            tr_upserter = TranslationUpserter(session, "monster_translations")
+            tr_counters = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+            for raw in rows if isinstance(rows, list) else []:
+                check_lease()
+                counters["processed"] += 1
+                try:
+                    filtered = prepare_monster(raw)
+                    if filtered is None:
+                        counters["skipped"] += 1
+                        continue
+                    slug = filtered["slug"]
+                    # create or update by slug
+                    existing = session.query(Monster).filter(Monster.slug == slug).first()
+                    if existing is None:
+                        monster = Monster(**filtered)  # type: ignore[arg-type]
+                        _compute_monster_derived_fields(monster)
+                        session.add(monster)
+                        session.commit()
+                        session.refresh(monster)
+                        counters["created"] += 1
+                    else:
+                        for k, v in filtered.items():
+                            setattr(existing, k, v)
+                        _compute_monster_derived_fields(existing)
+                        session.add(existing)
+                        session.commit()
+                        monster = existing
+                        counters["updated"] += 1
+                    # upsert translations
+                    for lang in ("ru", "en"):
+                        tr = tr_index.get((slug, lang))
+                        if not isinstance(tr, dict):
+                            continue
+                        # derive languages_text from raw row if present
+                        languages_text: Optional[str] = None
+                        try:
+                            langs_val = raw.get("languages") if isinstance(raw, dict) else None
+                            if isinstance(langs_val, list):
+                                languages_text = ", ".join([str(x) for x in langs_val if x is not None]) or None
+                            elif isinstance(langs_val, str):
+                                languages_text = langs_val or None
+                        except Exception:
+                            languages_text = None
+                        tr_upserter.add(
+                            {
+                                "monster_id": monster.id,
+                                "lang": Language(lang),
+                                **{k: tr.get(k) for k in _MONSTER_TRANSLATION_FIELDS},
+                                "languages_text": languages_text,
+                            },
+                            tr_counters,
+                        )
+                except Exception:
+                    # A row the database refused must not poison the rows after it
+                    session.rollback()
+                    counters["skipped"] += 1
+                    logging.getLogger(__name__).exception("Failed to import a monster row")
+            tr_upserter.flush()
+            counters["translations"] = tr_counters
+            counters_result = counters
+        elif job.job_type == "spells_import":
+            with open(job.file_path or "", "rb") as f:  # type: ignore[arg-type]
+                payload = _json.load(f)
+            rows = (payload or {}).get("spells") or []
+            tr_rows = (payload or {}).get("spell_translations") or []
+            tr_index: dict[tuple[str, str], dict] = {}
+            for it in tr_rows if isinstance(tr_rows, list) else []:
+                slug = str(it.get("spell_slug") or "").strip()
+                lang = str(it.get("lang") or "").strip().lower()
+                if slug and lang in {"ru", "en"}:
+                    tr_index[(slug, lang)] = it
+            # Translations are buffered and upserted per batch
+            tr_upserter = TranslationUpserter(session, "spell_translations")
+            tr_counters = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+            for raw in rows if isinstance(rows, list) else []:
+                check_lease()
+                counters["processed"] += 1
+                try:
+                    filtered = prepare_spell(raw)
+                    if filtered is None:
+                        counters["skipped"] += 1
+                        continue
+                    slug = filtered["slug"]
+                    existing = session.query(Spell).filter(Spell.slug == slug).first()
+                    if existing is None:
+                        spell = Spell(**filtered)  # type: ignore[arg-type]
+                        _compute_spell_derived_fields(spell)
+                        session.add(spell)
+                        session.commit()
+                        session.refresh(spell)
+                        counters["created"] += 1
+                    else:
+                        for k, v in filtered.items():
+                            setattr(existing, k, v)
+                        _compute_spell_derived_fields(existing)
+                        session.add(existing)
+                        session.commit()
+                        spell = existing
+                        counters["updated"] += 1
+                    for lang in ("ru", "en"):
+                        tr = tr_index.get((slug, lang))
+                        if not isinstance(tr, dict):
+                            continue
+                        tr_upserter.add(
+                            {
+                                "spell_id": spell.id,
+                                "lang": Language(lang),
+                                "name": tr.get("name"),
+                                "description": tr.get("description"),
+                            },
+                            tr_counters,
+                        )
+                except Exception:
+                    # A row the database refused must not poison the rows after it
+                    session.rollback()
+                    counters["skipped"] += 1
+                    logging.getLogger(__name__).exception("Failed to import a spell row")
+            tr_upserter.flush()
+            counters["translations"] = tr_counters
+            counters_result = counters
+        elif job.job_type == "enums_import":
+            with open(job.file_path or "", "rb") as f:  # type: ignore[arg-type]
+                payload = _json.load(f)
+            rows = (payload or {}).get("enum_translations") or []
+            # Buffered and upserted per batch; outcomes land in `counters`
+            upserter = TranslationUpserter(session, "enum_translations")
+            counters.update(unchanged=0, failed=0)
+            for r in rows if isinstance(rows, list) else []:
+                check_lease()
+                counters["processed"] += 1
+                try:
+                    enum_type = str(r.get("enum_type") or "").strip()
+                    enum_value = str(r.get("enum_value") or "").strip()
+                    lang_raw = str(r.get("lang") or "").strip().lower()
+                    label = r.get("label")
+                    if not (enum_type and enum_value and lang_raw in {"ru", "en"} and isinstance(label, str)):
+                        counters["skipped"] += 1
+                        continue
+                    upserter.add(
+                        {
+                            "enum_type": enum_type,
+                            "enum_value": enum_value,
+                            "lang": Language(lang_raw),
+                            "label": label,
+                            "description": r.get("description"),
+                            "synonyms": r.get("synonyms"),
+                        },
+                        counters,
+                    )
+                except Exception:
+                    counters["skipped"] += 1
+                    logging.getLogger(__name__).exception("Failed to upsert enum translation")
+            upserter.flush()
+            counters_result = counters
+        elif job.job_type == "ui_translations_import":
+            with open(job.file_path or "", "rb") as f:  # type: ignore[arg-type]
+                payload = _json.load(f)
+            rows = (payload or {}).get("ui_translations") or []
+            # Buffered and upserted per batch; outcomes land in `counters`
+            upserter = TranslationUpserter(session, "ui_translations")
+            counters.update(unchanged=0, failed=0)
+            for r in rows if isinstance(rows, list) else []:
+                check_lease()
+                counters["processed"] += 1
+                try:
+                    ns = str(r.get("namespace") or "bot").strip() or "bot"
+                    key = str(r.get("key") or "").strip()
+                    lang_raw = str(r.get("lang") or "").strip().lower()
+                    text = r.get("text")
+                    if not (key and lang_raw in {"ru", "en"} and isinstance(text, str)):
+                        counters["skipped"] += 1
+                        continue
+                    upserter.add(
+                        {"namespace": ns, "key": key, "lang": Language(lang_raw), "text": text},
+                        counters,
+                    )
+                except Exception:
+                    counters["skipped"] += 1
+                    logging.getLogger(__name__).exception("Failed to upsert UI translation")
+            upserter.flush()
+            counters_result = counters
+        elif job.job_type == "bundle_ingest" and _uses_staging(job):
+            counters_result = _process_bulk_bundle(session, job, lease)
+        elif job.job_type == "bundle_ingest":
+            # Process a universal bundle archive according to manifest.json
+            kind, arc = open_bundle(job.file_path or "")
+            try:
+                # Read and validate manifest.json
+                manifest = read_manifest(kind, arc)
+                files = manifest["files"]
+                # Simple topological-ish ordering: process in given order
+                # Runtime state to map UIDs to created DB ids for this run; restored from the
+                # checkpoint when a reclaimed job resumes after a crash/restart
+                checkpoint = job.checkpoint if isinstance(job.checkpoint, dict) else {}
+                uid_to_monster_id: dict[str, int] = {
+                    str(k): int(v) for k, v in (checkpoint.get("uid_to_monster_id") or {}).items()
+                }
+                uid_to_spell_id: dict[str, int] = {
+                    str(k): int(v) for k, v in (checkpoint.get("uid_to_spell_id") or {}).items()
+                }
+                resume_file_index = int(checkpoint.get("file_index") or 0)
+                resume_line_offset = int(checkpoint.get("line_offset") or 0)
+                if checkpoint:
+                    logging.getLogger(__name__).info(
+                        "Admin worker: resuming bundle ingest from checkpoint",
+                        extra={
+                            "job_id": str(job.id),
+                            "file_index": resume_file_index,
+                            "line_offset": resume_line_offset,
+                        },
+                    )
+
+                def _checkpoint() -> dict[str, Any]:
+                    # Every row counted in `processed` has already been committed
+                    return {
+                        "file_index": max(0, len(progress.files) - 1),
+                        "line_offset": progress.files[-1]["processed"] if progress.files else 0,
+                        "uid_to_monster_id": uid_to_monster_id,
+                        "uid_to_spell_id": uid_to_spell_id,
+                        "files": progress.files,
+                    }
+
+                # Translation rows are buffered and upserted per batch
+                upserters = {kind: TranslationUpserter(session, kind) for kind in TRANSLATION_KINDS}
+
+                def _flush_translations() -> None:
+                    for upserter in upserters.values():
+                        upserter.flush()
+
+                progress = JobProgress(
+                    session.get_bind(),
+                    job.id,
+                    rows_expected_total=declared_rows(files),
+                    files_total=len(files),
+                    checkpoint=_checkpoint,
+                    before_flush=_flush_translations,
+                    lease=lease,
+                )
+                progress.restore(checkpoint.get("files") or [])
+                for file_index, fdesc in enumerate(files):
+                    fpath = str((fdesc.get("path") or "")).strip()
+                    ftype = str((fdesc.get("type") or "")).strip()
+                    flang = str((fdesc.get("lang") or "")).strip().lower() or None
+                    compression = str((fdesc.get("compression") or "none")).strip().lower()
+                    if not fpath or not ftype:
+                        raise ValueError("Each file entry must include path and type")
+                    rows_expected = fdesc.get("rows")
+                    stats = progress.start_file(
+                        fpath, ftype, rows_expected if isinstance(rows_expected, int) else None
+                    )
+                    if file_index < resume_file_index:
+                        continue  # fully ingested before the checkpoint
+                    skip = resume_line_offset if file_index == resume_file_index else 0
+                    data = read_member(kind, arc, fpath)
+                    # Iterate NDJSON records
+                    for rec in itertools.islice(iter_ndjson(data, compression), skip, None):
+                        stats["processed"] += 1
+                        try:
+                            if ftype == "monsters":
+                                # Upsert by slug; derive from provided slug/name; track uid mapping
+                                raw = dict(rec)
+                                uid = str(raw.get("uid") or "").strip()
+                                filtered = prepare_monster(raw)
+                                if filtered is None:
+                                    stats["failed"] += 1
+                                    continue
+                                slug = filtered["slug"]
+                                existing = session.query(Monster).filter(Monster.slug == slug).first()
+                                if existing is None:
+                                    monster = Monster(**filtered)  # type: ignore[arg-type]
+                                    _compute_monster_derived_fields(monster)
+                                    session.add(monster)
+                                    session.commit()
+                                    session.refresh(monster)
+                                    stats["created"] += 1
+                                else:
+                                    before = serialize_instance(existing)
+                                    for k, v in filtered.items():
+                                        setattr(existing, k, v)
+                                    _compute_monster_derived_fields(existing)
+                                    session.add(existing)
+                                    session.commit()
+                                    monster = existing
+                                    stats["updated"] += 1 if serialize_instance(existing) != before else 0
+                                    stats["unchanged"] += 1 if serialize_instance(existing) == before else 0
+                                if uid:
+                                    uid_to_monster_id[uid] = monster.id  # type: ignore[assignment]
+                            elif ftype == "monster_translations":
+                                if not flang:
+                                    raise ValueError("monster_translations requires lang in manifest entry")
+                                raw = dict(rec)
+                                uid = str(raw.get("uid") or "").strip()
+                                if not uid or uid not in uid_to_monster_id:
+                                    stats["failed"] += 1
+                                    continue
+                                upserters["monster_translations"].add(
+                                    {
+                                        "monster_id": uid_to_monster_id[uid],
+                                        "lang": Language(flang),
+                                        **{k: raw.get(k) for k in _MONSTER_TRANSLATION_FIELDS},
+                                    },
+                                    stats,
+                                )
+                            elif ftype == "spells":
+                                raw = dict(rec)
+                                uid = str(raw.get("uid") or "").strip()
+                                filtered = prepare_spell(raw)
+                                if filtered is None:
+                                    stats["failed"] += 1
+                                    continue
+                                slug = filtered["slug"]
+                                existing = session.query(Spell).filter(Spell.slug == slug).first()
+                                if existing is None:
+                                    spell = Spell(**filtered)  # type: ignore[arg-type]
+                                    _compute_spell_derived_fields(spell)
+                                    session.add(spell)
+                                    session.commit()
+                                    session.refresh(spell)
+                                    stats["created"] += 1
+                                else:
+                                    before = serialize_instance(existing)
+                                    for k, v in filtered.items():
+                                        setattr(existing, k, v)
+                                    _compute_spell_derived_fields(existing)
+                                    session.add(existing)
+                                    session.commit()
+                                    spell = existing
+                                    stats["updated"] += 1 if serialize_instance(existing) != before else 0
+                                    stats["unchanged"] += 1 if serialize_instance(existing) == before else 0
+                                if uid:
+                                    uid_to_spell_id[uid] = spell.id  # type: ignore[assignment]
+                            elif ftype == "spell_translations":
+                                if not flang:
+                                    raise ValueError("spell_translations requires lang in manifest entry")
+                                raw = dict(rec)
+                                uid = str(raw.get("uid") or "").strip()
+                                if not uid or uid not in uid_to_spell_id:
+                                    stats["failed"] += 1
+                                    continue
+                                upserters["spell_translations"].add(
+                                    {
+                                        "spell_id": uid_to_spell_id[uid],
+                                        "lang": Language(flang),
+                                        "name": raw.get("name"),
+                                        "description": raw.get("description"),
+                                    },
+                                    stats,
+                                )
+                            elif ftype == "enum_translations":
+                                raw = dict(rec)
+                                enum_type = str(raw.get("entity") or raw.get("enum_type") or "").strip()
+                                enum_value = str(raw.get("code") or raw.get("enum_value") or "").strip()
+                                lang_raw = str(raw.get("lang") or "").strip().lower()
+                                label = raw.get("label") if raw.get("label") is not None else raw.get("text")
+                                if not (enum_type and enum_value and lang_raw in {"ru", "en"} and isinstance(label, str)):
+                                    stats["failed"] += 1
+                                    continue
+                                upserters["enum_translations"].add(
+                                    {
+                                        "enum_type": enum_type,
+                                        "enum_value": enum_value,
+                                        "lang": Language(lang_raw),
+                                        "label": label,
+                                        "description": raw.get("description"),
+                                        "synonyms": raw.get("synonyms"),
+                                    },
+                                    stats,
+                                )
+                            elif ftype == "ui_translations":
+                                raw = dict(rec)
+                                ns = str(raw.get("namespace") or "bot").strip() or "bot"
+                                key = str(raw.get("key") or "").strip()
+                                lang_raw = str(raw.get("lang") or "").strip().lower()
+                                text = raw.get("text")
+                                if not (key and lang_raw in {"ru", "en"} and isinstance(text, str)):
+                                    stats["failed"] += 1
+                                    continue
+                                upserters["ui_translations"].add(
+                                    {"namespace": ns, "key": key, "lang": Language(lang_raw), "text": text}, stats
+                                )
+                            else:
+                                raise ValueError(f"Unsupported file type: {ftype}")
+                        except Exception:
+                            # A row the database refused must not poison the rows after it
+                            session.rollback()
+                            stats["failed"] += 1
+                            logging.getLogger(__name__).exception("Failed to process record in %s", fpath)
+                        finally:
+                            progress.row_done()
+                    _flush_translations()
+                counters_result = progress.snapshot(final=True)
+            finally:
+                try:
+                    arc.close()
+                except Exception:
+                    pass
+        else:
+            raise ValueError(f"Unsupported job_type: {job.job_type}")
+
+        final_counters = counters_result or counters
+        if not (job.args or {}).get("dry_run"):
+            final_counters = {
+                **final_counters,
+                "post_ingest": _post_ingest(session, job, final_counters),
+            }
+        check_lease()
+        # Conditional on ownership: bulk data commits together with this row or not at all
+        if not finish_job(
+            session, job_id, owner, status="succeeded", counters=final_counters, checkpoint=None
+        ):
+            raise LeaseLost(f"Job {job_id} was reclaimed before it finished")
+        notify_job_progress(session, job_id)
+        session.commit()
+        logging.getLogger(__name__).info("Admin worker: job succeeded", extra={"job_id": str(job_id), "counters": counters})
+    except LeaseLost:
+        session.rollback()
+        logger.warning(
+            "Admin worker: lease lost; job left to its new owner",
+            extra={"job_id": str(job_id), "worker_id": owner},
+        )
+    except Exception as exc:  # noqa: BLE001
+        logging.getLogger(__name__).exception("Admin worker: job failed")
+        session.rollback()
+        dry_run = bool((job.args or {}).get("dry_run"))
+        if finish_job(session, job_id, owner, status="failed", error=str(exc)):
+            if not dry_run:
+                # Rows committed before the failure (per-row path) change the catalog
+                bump_catalog_version(session)
+            notify_job_progress(session, job_id)
+            session.commit()
+        else:
+            session.rollback()
+            logger.warning(
+                "Admin worker: lease lost; failure of a reclaimed job not recorded",
+                extra={"job_id": str(job_id), "worker_id": owner},
+            )
+    finally:
+        session.info.pop(DEFER_BUMP_KEY, None)
+
+
+def _worker_loop(engine: Engine, worker_id: str, stop: threading.Event, wakeup: threading.Event) -> None:
+    # NOTIFY wakes idle workers immediately; the poll is only a fallback for expired leases
+    poll_seconds = max(2, int(os.getenv("ADMIN_WORKER_POLL_SECONDS", "30")))
+    logger.info("Admin worker started", extra={"worker_id": worker_id, "poll_seconds": poll_seconds})
+    while not stop.is_set():
+        # Clear before claiming so a NOTIFY arriving mid-claim is not lost
+        wakeup.clear()
+        claimed = False
+        try:
+            with Session(engine) as session:
+                job = claim_next_job(session, worker_id)
+                if job is not None:
+                    claimed = True
+                    with LeaseHeartbeat(engine, job.id, worker_id) as lease:
+                        _process_job(session, job, lease)
+        except Exception:
+            logger.exception("Admin worker loop error")
+        if claimed:
+            continue
+        wakeup.wait(poll_seconds)
+    logger.info("Admin worker stopped", extra={"worker_id": worker_id})
+
+
+def _upload_gc_loop(engine: Engine, stop: threading.Event) -> None:
+    # 0 disables; GC is idempotent, so several workers running it is harmless
+    interval = int(os.getenv("ADMIN_UPLOAD_GC_SECONDS", "3600"))
+    if interval <= 0:
+        return
+    while not stop.wait(interval):
+        try:
+            with Session(engine) as session:
+                collect_garbage(session)
+        except Exception:
+            logger.exception("Upload GC failed")
+
+
+class WorkerRunner:
+    """A LISTEN thread, `concurrency` worker threads and an upload GC thread sharing one engine."""
+
+    def __init__(self, engine: Engine, concurrency: int = 1) -> None:
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.stop_event = threading.Event()
+        self.wakeup = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        listener = threading.Thread(
+            target=listen_for_jobs,
+            args=(self.engine, self.wakeup, self.stop_event),
+            name="admin-worker-listener",
+            daemon=True,
+        )
+        listener.start()
+        self._threads.append(listener)
+        gc = threading.Thread(
+            target=_upload_gc_loop,
+            args=(self.engine, self.stop_event),
+            name="admin-upload-gc",
+            daemon=True,
+        )
+        gc.start()
+        self._threads.append(gc)
+        for i in range(self.concurrency):
+            worker = threading.Thread(
+                target=_worker_loop,
+                args=(self.engine, make_worker_id(), self.stop_event, self.wakeup),
+                name=f"admin-worker-{i}",
+                daemon=True,
+            )
+            worker.start()
+            self._threads.append(worker)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming new jobs and wait up to `timeout` seconds per thread.
+
+        A job still running after the timeout keeps its lease until it expires,
+        after which another worker reclaims it.
+        """
+        self.stop_event.set()
+        self.wakeup.set()
+        for t in self._threads:
+            if t.is_alive():
+                t.join(timeout=timeout)
+        self._threads.clear()
+
+
+class LeaderWorkerRunner:
+    """Runs a `WorkerRunner` only while this process is the elected leader.
+
+    For servers with several processes (uvicorn `--workers`, replicas): every
+    process starts one of these, and the one holding the worker advisory lock
+    runs the listener, worker and GC threads. When the leader exits or loses
+    its connection, another process takes over within
+    `ADMIN_WORKER_LEADER_RETRY_SECONDS`; jobs it had in flight are reclaimed
+    through their leases.
+    """
+
+    def __init__(self, engine: Engine, concurrency: int = 1, shutdown_timeout: float = 5) -> None:
+        self.engine = engine
+        self.concurrency = concurrency
+        self.shutdown_timeout = shutdown_timeout
+        self.stop_event = threading.Event()
+        self._runner: Optional[WorkerRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._runner is not None
+
+    def _elected(self) -> None:
+        runner = WorkerRunner(self.engine, concurrency=self.concurrency)
+        runner.start()
+        # Leader only once its threads run
+        self._runner = runner
+
+    def _lost(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            runner.shutdown(timeout=self.shutdown_timeout)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=hold_leadership,
+            args=(self.engine, WORKER_LEADER_LOCK, self.stop_event, self._elected, self._lost),
+            name="admin-worker-leader",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads (if leader), then release the lock."""
+        self.stop_event.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+
+def _create_worker_engine(concurrency: int) -> Engine:
+    # Each worker thread holds one session; heartbeats briefly need a second connection
+    pool_size = max(1, int(os.getenv("ADMIN_WORKER_DB_POOL_SIZE", str(concurrency * 2))))
+    max_overflow = max(0, int(os.getenv("ADMIN_WORKER_DB_MAX_OVERFLOW", "2")))
+    return create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+    )
+
+
+def _run_process(index: int) -> None:
+    configure_logging(service_name=os.getenv("LOG_SERVICE_NAME", "worker"))
+    concurrency = max(1, int(os.getenv("ADMIN_WORKER_CONCURRENCY", "1")))
+    engine = _create_worker_engine(concurrency)
+    runner = WorkerRunner(engine, concurrency=concurrency)
+
+    def _handle_signal(signum: int, _frame: Any) -> None:
+        logger.info(
+            "Admin worker process stopping", extra={"process_index": index, "signal": signum}
+        )
+        runner.stop_event.set()
+        runner.wakeup.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+
+    logger.info(
+        "Admin worker process started",
+        extra={"process_index": index, "pid": os.getpid(), "concurrency": concurrency},
+    )
+    runner.start()
+    runner.stop_event.wait()
+    # Let in-flight jobs finish; whatever outlives the grace period is reclaimed via its lease
+    runner.shutdown(timeout=float(os.getenv("ADMIN_WORKER_SHUTDOWN_SECONDS", "30")))
+    engine.dispose()
+    logger.info("Admin worker process exited", extra={"process_index": index})
+
+
+def main() -> None:
+    processes = max(1, int(os.getenv("ADMIN_WORKER_PROCESSES", "1")))
+    if processes == 1:
+        _run_process(0)
+        return
+
+    configure_logging(service_name=os.getenv("LOG_SERVICE_NAME", "worker"))
+    ctx = multiprocessing.get_context("spawn")
+    children: list[Any] = []
+    stopping = threading.Event()
+
+    def _spawn(index: int) -> Any:
+        child = ctx.Process(target=_run_process, args=(index,), name=f"admin-worker-proc-{index}")
+        child.start()
+        return child
+
+    def _forward_signal(signum: int, _frame: Any) -> None:
+        stopping.set()
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)  # type: ignore[arg-type]
+
+    signal.signal(signal.SIGTERM, _forward_signal)
+    signal.signal(signal.SIGINT, _forward_signal)
+    children = [_spawn(i) for i in range(processes)]
+    # Supervise: replace children that die outside of a requested shutdown
+    while not stopping.wait(1):
+        for i, child in enumerate(children):
+            if not child.is_alive() and not stopping.is_set():
+                logger.error(
+                    "Admin worker process died; restarting",
+                    extra={"process_index": i, "exitcode": child.exitcode},
+                )
+                children[i] = _spawn(i)
+    for child in children:
+        child.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Catalog table contents in a comparable form, for tests that ingest whole bundles."""
+
+from typing import Any
+
+from dnd_helper_api.db import engine
+from dnd_helper_api.ingest.bulk import _AUDIT_COLUMNS
+from sqlalchemy import delete, select
+from sqlmodel import Session
+
+from shared_models import Monster, MonsterTranslation, Spell, SpellTranslation
+
+
+def table_rows(model: Any) -> list[dict[str, Any]]:
+    columns = [c for c in model.__table__.columns if c.name not in _AUDIT_COLUMNS]
+    with engine.connect() as conn:
+        rows = conn.execute(select(*columns).order_by(model.__table__.c.slug)).mappings()
+        return [dict(r) for r in rows]
+
+
+def translation_rows(model: Any, entity: Any, fk: str) -> list[dict[str, Any]]:
+    skip = _AUDIT_COLUMNS | {fk}
+    columns = [c for c in model.__table__.columns if c.name not in skip]
+    with engine.connect() as conn:
+        stmt = (
+            select(entity.__table__.c.slug, *columns)
+            .join(entity.__table__, entity.__table__.c.id == model.__table__.c[fk])
+            .order_by(entity.__table__.c.slug, model.__table__.c.lang)
+        )
+        return [dict(r) for r in conn.execute(stmt).mappings()]
+
+
+def catalog_rows() -> dict[str, list[dict[str, Any]]]:
+    return {
+        "monster": table_rows(Monster),
+        "spell": table_rows(Spell),
+        "monster_translations": translation_rows(MonsterTranslation, Monster, "monster_id"),
+        "spell_translations": translation_rows(SpellTranslation, Spell, "spell_id"),
+    }
+
+
+def wipe_catalog() -> None:
+    with Session(engine) as session:
+        for model in (SpellTranslation, MonsterTranslation, Spell, Monster):
+            session.exec(delete(model))
+        session.commit()
@@ -4,23 +4,31 @@ All tests run against a real Postgres started by the test docker compose.
 Alembic migrations are applied in the test container entrypoint before tests run.
 """
 
+import json
 import os
-from collections.abc import Iterator
+import zipfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, Optional
 
 # Enable admin endpoints for tests BEFORE importing app
 os.environ.setdefault("ADMIN_ENABLED", "true")
 os.environ.setdefault("ADMIN_TOKEN", "dev")
+# Tests run admin jobs themselves; an in-process worker would race them for the queue
+os.environ.setdefault("ADMIN_WORKER_DISABLE", "true")
 
 import pytest
 from dnd_helper_api.db import engine
 from dnd_helper_api.main import app
+from dnd_helper_api.worker import _process_job
 from fastapi.testclient import TestClient
+from shared_models.admin_job import AdminJob
+from shared_models.monster_translation import MonsterTranslation
+from shared_models.spell_translation import SpellTranslation
 from sqlalchemy import delete
 from sqlmodel import Session
 
 from shared_models import Monster, Spell, User
-from shared_models.monster_translation import MonsterTranslation
-from shared_models.spell_translation import SpellTranslation
 
 
 @pytest.fixture(scope="session")
@@ -39,8 +47,84 @@ def _clean_db() -> Iterator[None]:
         session.exec(delete(Spell))
         session.exec(delete(Monster))
         session.exec(delete(User))
+        session.exec(delete(AdminJob))
         session.commit()
     yield
     # No teardown needed; each test starts from a clean slate
 
 
+
+
+SEED_DATA_DIR = Path(
+    os.getenv("SEED_DATA_DIR") or Path(__file__).resolve().parents[2] / "seed_data"
+)
+
+# (file type, lang or None, records) in manifest order
+BundleFiles = list[tuple[str, Optional[str], list[Any]]]
+
+
+@pytest.fixture
+def write_bundle(tmp_path: Path) -> Callable[..., str]:
+    """Factory writing a .zip bundle of NDJSON files; returns its path."""
+    counter = iter(range(1_000_000))
+
+    def _write(files: BundleFiles, mode: str = "upsert") -> str:
+        path = tmp_path / f"bundle_{next(counter)}.zip"
+        entries = []
+        with zipfile.ZipFile(path, "w") as zf:
+            for index, (ftype, lang, records) in enumerate(files):
+                member = f"{index:02d}_{ftype}{'_' + lang if lang else ''}.jsonl"
+                zf.writestr(member, "\n".join(json.dumps(r) for r in records))
+                entry = {"path": member, "type": ftype, "rows": len(records)}
+                if lang:
+                    entry["lang"] = lang
+                entries.append(entry)
+            manifest = {"schema_version": "1.0", "mode": mode, "files": entries}
+            zf.writestr("manifest.json", json.dumps(manifest))
+        return str(path)
+
+    return _write
+
+
+@pytest.fixture
+def run_job() -> Callable[..., AdminJob]:
+    """Factory running one admin job inline, as a claimed job; returns the stored row."""
+
+    def _run(file_path: str, job_type: str = "bundle_ingest", **args: Any) -> AdminJob:
+        with Session(engine) as session:
+            job = AdminJob(
+                job_type=job_type,
+                status="running",
+                worker_id="test-worker",
+                file_path=file_path,
+                args=args or None,
+            )
+            session.add(job)
+            session.commit()
+            _process_job(session, job)
+            session.expire_all()
+            stored = session.get(AdminJob, job.id)
+            session.expunge(stored)
+            return stored
+
+    return _run
+
+
+@pytest.fixture(scope="session")
+def seed_bundle_files() -> BundleFiles:
+    """The seed catalog as bundle files: entities keyed `uid = slug`, translations per lang."""
+    if not SEED_DATA_DIR.is_dir():
+        pytest.skip(f"seed data not found at {SEED_DATA_DIR}")
+    files: BundleFiles = []
+    sections = (("monsters", "monster", "monster_slug"), ("spells", "spell", "spell_slug"))
+    for name, entity, slug_key in sections:
+        payload = json.loads((SEED_DATA_DIR / f"seed_data_{name}.json").read_text("utf-8"))
+        files.append((name, None, [dict(r, uid=r["slug"]) for r in payload[name]]))
+        for lang in ("ru", "en"):
+            rows = [
+                {k: v for k, v in dict(t, uid=t[slug_key]).items() if k not in {slug_key, "lang"}}
+                for t in payload[f"{entity}_translations"]
+                if t["lang"] == lang
+            ]
+            files.append((f"{entity}_translations", lang, rows))
+    return files
@@ -0,0 +1,176 @@
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+from dnd_helper_api import main
+from dnd_helper_api.audit_writer import (
+    AuditWriter,
+    capture_event,
+    changed_columns,
+    remember_originals,
+    take_pending,
+)
+from dnd_helper_api.db import engine
+from shared_models.admin_audit import AdminAudit
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from shared_models import Monster
+
+ACTOR = "test-audit"
+CONTEXT = {"actor": ACTOR, "path": "/admin/test", "client_ip": "127.0.0.1"}
+
+
+@pytest.fixture(autouse=True)
+def _clean_audit() -> Iterator[None]:
+    yield
+    with Session(engine) as session:
+        session.exec(delete(AdminAudit).where(AdminAudit.actor == ACTOR))
+        session.commit()
+
+
+def _audit_rows() -> list[AdminAudit]:
+    with Session(engine) as session:
+        return list(
+            session.exec(
+                select(AdminAudit).where(AdminAudit.actor == ACTOR).order_by(AdminAudit.id)
+            ).all()
+        )
+
+
+def _event(row_pk: Optional[str]) -> dict:
+    return {
+        "table_name": "monster",
+        "row_pk": row_pk,
+        "operation": "update",
+        "before_data": {"hp": 1},
+        "after_data": {"hp": 2},
+        "created_at": datetime.now(timezone.utc),
+        **CONTEXT,
+    }
+
+
+def test_update_events_carry_only_the_changed_columns() -> None:
+    with Session(engine) as session:
+        monster = Monster(slug="wolf", hp=11, ac=13, type="beast")
+        session.add(monster)
+        session.commit()
+        session.refresh(monster)
+
+        monster.hp = 20
+        monster.ac = 13  # same value: no change
+        monster.type = None
+        assert changed_columns(monster) == ({"hp": 11, "type": "beast"}, {"hp": 20, "type": None})
+
+        capture_event(session, "update", monster, CONTEXT)
+        (event,) = take_pending(session)
+        assert (event["table_name"], event["row_pk"], event["operation"]) == (
+            "monster",
+            str(monster.id),
+            "update",
+        )
+        assert event["after_data"] == {"hp": 20, "type": None}
+        assert event["actor"] == ACTOR
+
+        monster.hp = 11
+        monster.type = "beast"
+        capture_event(session, "update", monster, CONTEXT)
+        assert take_pending(session) == []
+
+        capture_event(session, "delete", monster, CONTEXT)
+        (event,) = take_pending(session)
+        assert event["after_data"] is None
+        assert (event["before_data"]["slug"], event["before_data"]["hp"]) == ("wolf", 11)
+
+
+def test_old_values_of_expired_attributes_are_read_from_the_row() -> None:
+    with Session(engine) as session:
+        monster = Monster(slug="wolf", hp=11, ac=13, type="beast")
+        session.add(monster)
+        session.commit()
+
+        # Expired by the commit: the history has no old values
+        monster.hp = 20
+        monster.ac = 13
+        monster.type = None
+        remember_originals(session, [monster])
+        capture_event(session, "update", monster, CONTEXT)
+        (event,) = take_pending(session)
+        assert (event["before_data"], event["after_data"]) == (
+            {"hp": 11, "type": "beast"},
+            {"hp": 20, "type": None},
+        )
+
+
+def test_admin_changes_are_written_on_commit_and_dropped_on_rollback(monkeypatch) -> None:
+    writer = AuditWriter(engine)
+    monkeypatch.setattr(main, "audit_writer", writer)
+    tokens = [
+        (var, var.set(value))
+        for var, value in (
+            (main._admin_active, True),
+            (main._admin_actor, ACTOR),
+            (main._admin_path, "/admin/test"),
+            (main._admin_client_ip, "127.0.0.1"),
+        )
+    ]
+    try:
+        with Session(engine) as session:
+            monster = Monster(slug="wolf", hp=11, ac=13)
+            session.add(monster)
+            session.commit()
+            monster.hp = 20
+            session.commit()
+
+            monster.hp = 99
+            session.flush()
+            session.rollback()
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+    rows = _audit_rows()
+    assert [(r.operation, r.path, r.client_ip) for r in rows] == [
+        ("create", "/admin/test", "127.0.0.1"),
+        ("update", "/admin/test", "127.0.0.1"),
+    ]
+    assert rows[0].after_data["slug"] == "wolf" and rows[0].before_data is None
+    assert (rows[1].before_data, rows[1].after_data) == ({"hp": 11}, {"hp": 20})
+    assert writer.metrics()["written"] == 2
+
+
+def test_writer_batches_events_and_drains_them_on_stop() -> None:
+    writer = AuditWriter(engine, batch_rows=2, flush_seconds=0.05)
+    writer.start()
+    writer.submit([_event(str(i)) for i in range(5)])
+    writer.stop()
+
+    assert [r.row_pk for r in _audit_rows()] == ["0", "1", "2", "3", "4"]
+    metrics = writer.metrics()
+    assert metrics["running"] is False
+    assert (metrics["enqueued"], metrics["written"], metrics["queue_depth"]) == (5, 5, 0)
+    assert metrics["batches"] >= 3
+    assert metrics["failed_batches"] == 0
+
+    # Not running: written inline
+    writer.submit([_event("late")])
+    assert _audit_rows()[-1].row_pk == "late"
+
+
+def test_a_bad_event_is_dead_lettered_without_stalling_the_batch() -> None:
+    writer = AuditWriter(engine, batch_rows=10, flush_seconds=0.05, max_attempts=2)
+    writer.start()
+    writer.submit([_event("0"), _event(None), _event("2")])
+    writer.stop()
+
+    assert [r.row_pk for r in _audit_rows()] == ["0", "2"]
+    metrics = writer.metrics()
+    assert (metrics["written"], metrics["dead_lettered"], metrics["retrying_rows"]) == (2, 1, 0)
+
+
+def test_audit_metrics_require_the_admin_token(client) -> None:
+    assert client.get("/admin-api/audit/metrics").status_code == 401
+    resp = client.get("/admin-api/audit/metrics", headers={"Authorization": "Bearer dev"})
+    assert resp.status_code == 200
+    assert "dead_lettered" in resp.json()
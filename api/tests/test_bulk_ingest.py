@@ -0,0 +1,149 @@
+from typing import Any
+
+import pytest
+from catalog_rows import catalog_rows, table_rows, translation_rows, wipe_catalog
+from dnd_helper_api.db import engine
+from sqlalchemy import select
+from sqlmodel import Session
+
+from shared_models import Monster, MonsterTranslation, Spell
+
+
+def _summary(job) -> dict[str, int]:
+    assert job.status == "succeeded", job.error
+    return job.counters["summary"]
+
+
+def test_bulk_and_per_row_paths_agree_on_the_seed_bundle(
+    seed_bundle_files, write_bundle, run_job
+) -> None:
+    bundle = write_bundle(seed_bundle_files)
+
+    per_row = _summary(run_job(bundle))
+    per_row_catalog = catalog_rows()
+    wipe_catalog()
+    bulk = _summary(run_job(bundle, bulk=True))
+
+    assert bulk == per_row
+    assert bulk["failed"] == 0
+    assert bulk["created"] == sum(len(records) for _, _, records in seed_bundle_files)
+    assert catalog_rows() == per_row_catalog
+
+    # A second run over the same data changes nothing on either path
+    again = _summary(run_job(bundle, bulk=True))
+    assert again["unchanged"] == again["processed"]
+    assert catalog_rows() == per_row_catalog
+
+
+def test_bulk_update_writes_only_the_columns_each_record_sent(write_bundle, run_job) -> None:
+    base = [
+        {"slug": "wolf", "hp": 11, "ac": 13, "type": "beast", "speed_fly": 0},
+        {"slug": "bat", "hp": 1, "ac": 12, "type": "beast", "cr": "0"},
+    ]
+    assert _summary(run_job(write_bundle([("monsters", None, base)]), bulk=True))["created"] == 2
+
+    patch = [{"slug": "wolf", "hp": 20}, {"slug": "bat", "type": "monstrosity", "speed_fly": 30}]
+    summary = _summary(run_job(write_bundle([("monsters", None, patch)]), bulk=True))
+    assert (summary["updated"], summary["failed"]) == (2, 0)
+
+    with Session(engine) as session:
+        wolf = session.exec(select(Monster).where(Monster.slug == "wolf")).scalar_one()
+        bat = session.exec(select(Monster).where(Monster.slug == "bat")).scalar_one()
+        assert (wolf.hp, wolf.ac, wolf.type, wolf.is_flying) == (20, 13, "beast", False)
+        assert (bat.hp, bat.type, bat.cr, bat.is_flying) == (1, "monstrosity", "0", True)
+
+
+def test_bulk_derives_from_the_stored_row_when_the_input_is_not_sent(write_bundle, run_job) -> None:
+    base = [{"slug": "fireball", "school": "evocation", "duration": "Concentration, 1 minute"}]
+    run_job(write_bundle([("spells", None, base)]), bulk=True)
+
+    patch = [{"slug": "fireball", "level": 3, "is_concentration": False}]
+    assert _summary(run_job(write_bundle([("spells", None, patch)]), bulk=True))["updated"] == 1
+
+    with Session(engine) as session:
+        spell = session.exec(select(Spell).where(Spell.slug == "fireball")).scalar_one()
+        assert (spell.level, spell.is_concentration) == (3, True)
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_bad_records_fail_alone_on_both_paths(write_bundle, run_job, bulk: bool) -> None:
+    records = [
+        {"slug": "ok", "hp": 5, "ac": 10},
+        {"slug": "bad-type", "hp": "lots", "ac": 10},
+        {"slug": "bad-check", "hp": 5, "ac": 10, "type": "swarm"},
+        {"slug": "no-hp", "ac": 10},
+        {"slug": "bad-derive", "hp": 5, "ac": 10, "speed_fly": "fast"},
+        {"hp": 5, "ac": 10},
+    ]
+    summary = _summary(run_job(write_bundle([("monsters", None, records)]), bulk=bulk))
+    assert (summary["processed"], summary["created"], summary["failed"]) == (6, 1, 5)
+    assert [m["slug"] for m in table_rows(Monster)] == ["ok"]
+
+
+def _monsters(*slugs: str) -> list[dict[str, Any]]:
+    return [{"slug": slug, "uid": slug, "hp": 10, "ac": 12} for slug in slugs]
+
+
+def test_snapshot_of_the_seed_catalog_deletes_what_it_does_not_list(
+    seed_bundle_files, write_bundle, run_job
+) -> None:
+    stale = _monsters("stale-monster")
+    stale_tr = [{"uid": "stale-monster", "name": "Stale", "description": ""}]
+    run_job(write_bundle([("monsters", None, stale), ("monster_translations", "en", stale_tr)]))
+
+    job = run_job(write_bundle(seed_bundle_files, mode="authoritative_snapshot"))
+    summary = _summary(job)
+    assert (summary["failed"], summary["deleted"]) == (0, 1)
+
+    slugs = {m["slug"] for m in table_rows(Monster)}
+    assert "stale-monster" not in slugs
+    assert len(slugs) == len(seed_bundle_files[0][2])
+    rows = translation_rows(MonsterTranslation, Monster, "monster_id")
+    assert all(r["slug"] != "stale-monster" for r in rows)
+
+
+def test_snapshot_keeps_entities_whose_records_failed(write_bundle, run_job) -> None:
+    run_job(write_bundle([("monsters", None, _monsters("kept", "broken", "gone"))]))
+
+    snapshot = _monsters("kept") + [{"slug": "broken", "hp": "lots", "ac": 12}]
+    bundle = write_bundle([("monsters", None, snapshot)], "authoritative_snapshot")
+    summary = _summary(run_job(bundle))
+    assert (summary["failed"], summary["deleted"]) == (1, 1)
+    assert [(m["slug"], m["hp"]) for m in table_rows(Monster)] == [("broken", 10), ("kept", 10)]
+
+
+def test_snapshot_with_an_unidentifiable_failed_record_deletes_nothing(
+    write_bundle, run_job
+) -> None:
+    run_job(write_bundle([("monsters", None, _monsters("kept", "other"))]))
+
+    snapshot = _monsters("kept") + [{"hp": 5, "ac": 10}]
+    job = run_job(write_bundle([("monsters", None, snapshot)], "authoritative_snapshot"))
+    assert job.status == "failed"
+    assert "without a slug or name" in job.error
+    assert [m["slug"] for m in table_rows(Monster)] == ["kept", "other"]
+
+
+def test_tombstones_delete_listed_entities_and_their_translations(write_bundle, run_job) -> None:
+    spells = [{"slug": "light", "uid": "light", "school": "evocation"}]
+    run_job(
+        write_bundle(
+            [
+                ("monsters", None, _monsters("wolf", "bat")),
+                ("monster_translations", "en", [{"uid": "wolf", "name": "Wolf"}]),
+                ("spells", None, spells),
+            ]
+        )
+    )
+
+    tombstones = [
+        {"entity": "monster", "slug": "wolf"},
+        {"entity": "spell", "slug": "light"},
+        {"entity": "monster", "slug": "never-existed"},
+        {"entity": "dragon", "slug": "bat"},
+    ]
+    summary = _summary(run_job(write_bundle([("tombstones", None, tombstones)], "tombstone")))
+    assert (summary["deleted"], summary["unchanged"], summary["failed"]) == (2, 1, 1)
+    assert [m["slug"] for m in table_rows(Monster)] == ["bat"]
+    assert table_rows(Spell) == []
+    assert translation_rows(MonsterTranslation, Monster, "monster_id") == []
@@ -0,0 +1,99 @@
+from dnd_helper_api.catalog import DEFER_BUMP_KEY, catalog_version
+from dnd_helper_api.db import engine
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from shared_models import CatalogPayload, Monster, User
+
+
+def _version() -> int:
+    with Session(engine) as session:
+        return catalog_version(session)
+
+
+def test_catalog_writes_bump_the_version_once_per_commit() -> None:
+    start = _version()
+    with Session(engine) as session:
+        session.add(Monster(slug="wolf", hp=11, ac=13))
+        session.add(Monster(slug="bat", hp=1, ac=12))
+        session.commit()
+        assert catalog_version(session) == start + 1
+
+        session.execute(update(Monster).where(Monster.slug == "wolf").values(hp=20))
+        session.commit()
+        assert catalog_version(session) == start + 2
+
+        # Not catalog content
+        session.add(User(telegram_id=1, name="Tester"))
+        session.commit()
+        assert catalog_version(session) == start + 2
+
+        session.add(Monster(slug="owl", hp=1, ac=11))
+        session.flush()
+        session.rollback()
+        assert catalog_version(session) == start + 2
+
+        # The ingest worker bumps once in its post-ingest stage instead
+        session.info[DEFER_BUMP_KEY] = True
+        session.add(Monster(slug="owl", hp=1, ac=11))
+        session.commit()
+        assert catalog_version(session) == start + 2
+
+
+def test_list_responses_are_stored_per_version_and_revalidated_by_etag(client) -> None:
+    with Session(engine) as session:
+        session.add(Monster(slug="wolf", hp=11, ac=13))
+        session.commit()
+
+    first = client.get("/monsters/list/raw", params={"lang": "en"})
+    assert first.status_code == 200
+    version = int(first.headers["X-Catalog-Version"])
+    assert version == _version()
+    assert first.headers["ETag"] == f'W/"monsters:list_raw:en:{version}"'
+    assert [m["slug"] for m in first.json()] == ["wolf"]
+
+    # Stored outside the request's transaction, and served from there
+    with Session(engine) as session:
+        stored = session.get(CatalogPayload, ("monsters:list_raw", "en"))
+        assert stored is not None and stored.version == version
+        stored.body = "[]"
+        session.add(stored)
+        session.commit()
+    assert client.get("/monsters/list/raw", params={"lang": "en"}).json() == []
+
+    etag = first.headers["ETag"]
+    not_modified = client.get(
+        "/monsters/list/raw", params={"lang": "en"}, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    with Session(engine) as session:
+        session.add(Monster(slug="bat", hp=1, ac=12))
+        session.commit()
+    changed = client.get(
+        "/monsters/list/raw", params={"lang": "en"}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert sorted(m["slug"] for m in changed.json()) == ["bat", "wolf"]
+    with Session(engine) as session:
+        stored = session.exec(
+            select(CatalogPayload).where(CatalogPayload.kind == "monsters:list_raw")
+        ).all()
+        assert ("en", version + 1) in {(p.lang, p.version) for p in stored}
+
+
+def test_page_items_missing_from_the_payload_are_built_from_the_tables(client) -> None:
+    with Session(engine) as session:
+        session.add(Monster(slug="wolf", hp=11, ac=13))
+        session.commit()
+    assert client.get("/monsters/list/page", params={"lang": "en"}).json()["total"] == 1
+
+    # A row the stored payload does not have (Core DML leaves the version alone)
+    with engine.begin() as conn:
+        conn.execute(insert(Monster.__table__).values(slug="bat", hp=1, ac=12))
+    page = client.get("/monsters/list/page", params={"lang": "en"}).json()
+    assert page["total"] == 2
+    assert [item["entity"]["slug"] for item in page["items"]] == ["wolf", "bat"]
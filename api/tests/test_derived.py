@@ -0,0 +1,155 @@
+import itertools
+import json
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+from dnd_helper_api import backfill
+from dnd_helper_api.catalog import catalog_version
+from dnd_helper_api.db import engine
+from dnd_helper_api.routers.monsters.derived import (
+    MONSTER_DERIVED_INPUTS,
+    derive_monster_columns,
+)
+from dnd_helper_api.routers.spells.derived import (
+    SPELL_DERIVED_INPUTS,
+    _normalize_casting_time,
+    derive_spell_columns,
+)
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from shared_models import Monster, Spell
+
+
+def _reference_monster(m: Any) -> None:
+    # The per-object rules the batch API replaced
+    if m.speed_fly is not None:
+        m.is_flying = m.speed_fly > 0
+
+
+def _reference_spell(spell: Any) -> None:
+    if spell.duration is not None:
+        spell.is_concentration = "concentration" in str(spell.duration).lower()
+    damage = spell.damage or {}
+    if isinstance(damage, dict) and damage.get("type") is not None:
+        spell.damage_type = str(damage.get("type"))
+    saving_throw = spell.saving_throw or {}
+    if isinstance(saving_throw, dict) and saving_throw.get("ability") is not None:
+        spell.save_ability = str(saving_throw.get("ability"))
+    if spell.attack_roll is None:
+        if damage and not saving_throw.get("ability"):
+            spell.attack_roll = True
+    if spell.targeting is None:
+        if spell.area or {}:
+            spell.targeting = "POINT"
+    if spell.casting_time is not None:
+        spell.casting_time = _normalize_casting_time(str(spell.casting_time))
+
+
+def _rows(axes: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    return [dict(zip(axes, values, strict=True)) for values in itertools.product(*axes.values())]
+
+
+def _check_equivalence(rows, inputs, derive, reference) -> None:
+    columns = {c: [row[c] for row in rows] for c in inputs}
+    derived = derive(columns)
+    for i, row in enumerate(rows):
+        obj = SimpleNamespace(**row)
+        reference(obj)
+        assert {f: values[i] for f, values in derived.items()} == {
+            f: getattr(obj, f) for f in derived
+        }, row
+
+
+def test_batch_monster_derivation_matches_the_per_object_rules() -> None:
+    rows = _rows({"speed_fly": [None, 0, 30], "is_flying": [None, False, True]})
+    _check_equivalence(rows, MONSTER_DERIVED_INPUTS, derive_monster_columns, _reference_monster)
+
+
+def test_batch_spell_derivation_matches_the_per_object_rules() -> None:
+    rows = _rows(
+        {
+            "duration": [None, "Instantaneous", "Concentration, up to 1 minute"],
+            "damage": [None, {}, {"type": "fire", "dice": "8d6"}, {"dice": "1d4"}],
+            "saving_throw": [None, {"ability": "dex"}, {"ability": ""}, {}],
+            "area": [None, {}, {"shape": "sphere"}],
+            "is_concentration": [None, True],
+            "damage_type": [None, "cold"],
+            "save_ability": [None, "wis"],
+            "attack_roll": [None, False],
+            "targeting": [None, "SELF"],
+            "casting_time": [None, "1 Bonus Action", "10 minutes", "special"],
+        }
+    )
+    _check_equivalence(rows, SPELL_DERIVED_INPUTS, derive_spell_columns, _reference_spell)
+
+
+def _insert_stale_rows() -> None:
+    # Core inserts skip the ORM derivation, like rows written before a rule changed
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Monster.__table__),
+            [
+                {"slug": f"m{i}", "hp": 1, "ac": 10, "speed_fly": fly, "is_flying": False}
+                for i, fly in enumerate([0, 30, None, 60, 10])
+            ],
+        )
+        conn.execute(
+            insert(Spell.__table__),
+            [
+                {"slug": "fireball", "school": "evocation", "damage": {"type": "fire"}},
+                {"slug": "light", "school": "evocation", "damage": None},
+            ],
+        )
+
+
+def test_backfill_updates_only_stale_rows_and_resumes_after_last_id() -> None:
+    _insert_stale_rows()
+    with Session(engine) as session:
+        ids = sorted(m.id for m in session.exec(select(Monster)).all())
+
+    # Resume after the second row: the first two are not looked at
+    progress = {"last_id": ids[1], "scanned": 2, "updated": 1, "skipped": 0}
+    chunks = []
+    backfill.backfill_table(
+        engine, "monster", progress, batch_rows=2, on_chunk=lambda p: chunks.append(p["last_id"])
+    )
+    assert chunks == [ids[3], ids[4]]
+    assert progress == {
+        "last_id": ids[4],
+        "scanned": 5,
+        "updated": 3,
+        "skipped": 0,
+        "total": 5,
+        "done": True,
+    }
+    with Session(engine) as session:
+        flying = {m.slug: m.is_flying for m in session.exec(select(Monster)).all()}
+    # m1 was before the resume point; m2 has no speed and keeps its value
+    assert flying == {"m0": False, "m1": False, "m2": False, "m3": True, "m4": True}
+
+    again = backfill.backfill_table(engine, "monster", {}, batch_rows=10)
+    assert (again["scanned"], again["updated"]) == (5, 1)
+
+
+def test_backfill_command_saves_progress_bumps_the_version_and_cleans_up(
+    tmp_path, monkeypatch
+) -> None:
+    _insert_stale_rows()
+    state = tmp_path / "state.json"
+    # A previous run finished the monsters
+    state.write_text(json.dumps({"monster": {"done": True, "last_id": 0}}))
+    with Session(engine) as session:
+        before = catalog_version(session)
+
+    monkeypatch.setattr(sys, "argv", ["backfill", "--state", str(state), "--batch-rows", "1"])
+    backfill.main()
+
+    assert not state.exists()
+    with Session(engine) as session:
+        assert catalog_version(session) == before + 1
+        assert all(m.is_flying is False for m in session.exec(select(Monster)).all())
+        spells = {s.slug: s for s in session.exec(select(Spell)).all()}
+        assert (spells["fireball"].damage_type, spells["fireball"].attack_roll) == ("fire", True)
+        assert (spells["light"].damage_type, spells["light"].attack_roll) == (None, None)
@@ -0,0 +1,103 @@
+import json
+from uuid import uuid4
+
+from dnd_helper_api.db import engine
+from dnd_helper_api.ingest.validate import validate_sources
+from dnd_helper_api.job_progress import JobProgress
+from sqlmodel import Session, select
+
+from shared_models import Monster, Spell
+
+
+def _validate(sources, mode: str = "upsert") -> list[dict]:
+    progress = JobProgress(engine, uuid4())
+    validate_sources(sources, progress, mode=mode, processes=1)
+    return progress.snapshot(final=True)["files"]
+
+
+def test_validate_sources_checks_records_and_uid_references() -> None:
+    monsters = [
+        {"uid": "m1", "slug": "bat", "hp": 1, "ac": 12, "cr": "0"},
+        {"uid": "m2", "name": "Giant Rat", "hp": 7, "ac": 12},
+        {"uid": "m3", "hp": 7, "ac": 12},
+        "not an object",
+    ]
+    translations = [{"uid": "m1", "name": "Bat"}, {"uid": "m3", "name": "?"}]
+    spells = [{"slug": "light", "school": "evocation"}, {"slug": "dark", "school": "shadow"}]
+    files = _validate(
+        [
+            ({"path": "m.jsonl", "type": "monsters"}, monsters),
+            ({"path": "mt.jsonl", "type": "monster_translations", "lang": "en"}, translations),
+            ({"path": "s.jsonl", "type": "spells"}, spells),
+            ({"path": "missing.jsonl", "type": "spells"}, None),
+            ({"path": "bad.jsonl", "type": "spell_translations", "lang": "de"}, []),
+        ]
+    )
+
+    by_path = {f["path"]: f for f in files}
+    assert (by_path["m.jsonl"]["processed"], by_path["m.jsonl"]["failed"]) == (4, 2)
+    assert [e["line"] for e in by_path["m.jsonl"]["errors"]] == [3, 4]
+    assert by_path["mt.jsonl"]["failed"] == 1
+    assert by_path["mt.jsonl"]["errors"] == [{"line": 2, "error": "unknown uid: m3"}]
+    assert (by_path["s.jsonl"]["failed"], by_path["s.jsonl"]["errors"][0]["line"]) == (1, 2)
+    assert "not found" in by_path["missing.jsonl"]["errors"][0]["error"]
+    assert "valid lang" in by_path["bad.jsonl"]["errors"][0]["error"]
+
+
+def test_tombstones_are_only_valid_in_tombstone_mode() -> None:
+    tombstones = [{"entity": "monster", "slug": "bat"}, {"entity": "dragon", "slug": "x"}]
+    files = _validate([({"path": "t.jsonl", "type": "tombstones"}, tombstones)], "tombstone")
+    assert (files[0]["processed"], files[0]["failed"]) == (2, 1)
+
+    files = _validate([({"path": "t.jsonl", "type": "tombstones"}, tombstones)])
+    assert "mode=tombstone" in files[0]["errors"][0]["error"]
+
+
+def test_dry_run_of_a_legacy_upload_checks_its_translations_and_writes_nothing(
+    tmp_path, run_job
+) -> None:
+    upload = tmp_path / "monsters.json"
+    upload.write_text(
+        json.dumps(
+            {
+                "monsters": [
+                    {"slug": "bat", "hp": 1, "ac": 12, "cr": "0"},
+                    {"name": "Giant Rat", "hp": 7, "ac": 12},
+                ],
+                "monster_translations": [
+                    {"monster_slug": "bat", "lang": "ru", "name": "Летучая мышь"},
+                    {"monster_slug": "giant-rat", "lang": "en", "name": "Giant Rat"},
+                    {"monster_slug": "bat", "lang": "de", "name": "Fledermaus"},
+                    {"monster_slug": "owl", "lang": "en", "name": "Owl"},
+                ],
+            }
+        )
+    )
+
+    job = run_job(str(upload), "monsters_import", dry_run=True)
+    assert job.status == "succeeded", job.error
+    assert job.counters["dry_run"] is True
+    main, translations = job.counters["files"]
+    assert (main["processed"], main["failed"]) == (2, 0)
+    assert (translations["processed"], translations["failed"]) == (4, 2)
+    assert [e["line"] for e in translations["errors"]] == [3, 4]
+    with Session(engine) as session:
+        assert session.exec(select(Monster)).all() == []
+
+
+def test_dry_run_of_a_bundle_matches_what_ingest_accepts(write_bundle, run_job) -> None:
+    records = [
+        {"uid": "a", "slug": "fireball", "school": "evocation", "level": 3},
+        {"uid": "b", "slug": "mystery", "school": "chronomancy"},
+    ]
+    bundle = write_bundle(
+        [("spells", None, records), ("spell_translations", "en", [{"uid": "b", "name": "?"}])]
+    )
+
+    dry = run_job(bundle, dry_run=True)
+    assert [(f["processed"], f["failed"]) for f in dry.counters["files"]] == [(2, 1), (1, 1)]
+    with Session(engine) as session:
+        assert session.exec(select(Spell)).all() == []
+
+    real = run_job(bundle)
+    assert [(f["processed"], f["failed"]) for f in real.counters["files"]] == [(2, 1), (1, 1)]
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+from catalog_rows import catalog_rows, table_rows, wipe_catalog
+from dnd_helper_api.db import engine
+from dnd_helper_api.ingest.export import write_bundle as export_bundle
+
+from shared_models import Monster
+
+ADMIN = {"Authorization": "Bearer dev"}
+
+
+def _export(client, tmp_path: Path, fmt: str, mode: str) -> str:
+    resp = client.get(
+        "/admin-api/export/bundle", params={"format": fmt, "mode": mode}, headers=ADMIN
+    )
+    assert resp.status_code == 200, resp.text
+    path = tmp_path / f"export.{fmt}"
+    path.write_bytes(resp.content)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar.gz"])
+def test_exported_bundle_reimports_into_the_same_catalog(
+    client, tmp_path, seed_bundle_files, write_bundle, run_job, fmt: str
+) -> None:
+    run_job(write_bundle(seed_bundle_files), bulk=True)
+    catalog = catalog_rows()
+    bundle = _export(client, tmp_path, fmt, "upsert")
+
+    # Into an empty catalog: everything is created as it was
+    wipe_catalog()
+    job = run_job(bundle)
+    assert job.status == "succeeded", job.error
+    summary = job.counters["summary"]
+    created = sum(len(rows) for rows in catalog.values())
+    assert (summary["failed"], summary["created"]) == (0, created)
+    assert catalog_rows() == catalog
+
+    # Over the catalog it came from: nothing changes
+    job = run_job(bundle, bulk=True)
+    assert job.status == "succeeded", job.error
+    assert job.counters["summary"]["unchanged"] == job.counters["summary"]["processed"]
+    assert catalog_rows() == catalog
+
+
+def test_snapshot_export_deletes_what_was_added_after_it(tmp_path, write_bundle, run_job) -> None:
+    monsters = [{"slug": s, "uid": s, "hp": 10, "ac": 12} for s in ("wolf", "bat")]
+    translations = [{"uid": "wolf", "name": "Wolf", "description": ""}]
+    spells = [{"slug": "light", "uid": "light", "school": "evocation"}]
+    run_job(
+        write_bundle(
+            [
+                ("monsters", None, monsters),
+                ("monster_translations", "en", translations),
+                ("spells", None, spells),
+            ]
+        )
+    )
+    catalog = catalog_rows()
+    path = tmp_path / "snapshot.zip"
+    with path.open("wb") as out:
+        manifest = export_bundle(engine, out, mode="authoritative_snapshot")
+    assert manifest["mode"] == "authoritative_snapshot"
+
+    extra = [{"slug": "owl", "uid": "owl", "hp": 1, "ac": 11}]
+    extra_tr = [{"uid": "owl", "name": "Owl", "description": ""}]
+    run_job(write_bundle([("monsters", None, extra), ("monster_translations", "en", extra_tr)]))
+    assert [m["slug"] for m in table_rows(Monster)] == ["bat", "owl", "wolf"]
+
+    job = run_job(str(path))
+    assert job.status == "succeeded", job.error
+    assert (job.counters["summary"]["failed"], job.counters["summary"]["deleted"]) == (0, 1)
+    assert catalog_rows() == catalog
+
+
+def test_export_requires_the_admin_token(client) -> None:
+    assert client.get("/admin-api/export/bundle").status_code == 401
+    bad = {"Authorization": "Bearer nope"}
+    assert client.get("/admin-api/export/bundle", headers=bad).status_code == 401
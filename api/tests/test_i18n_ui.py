@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+from dnd_helper_api.db import engine
+from shared_models.enums import Language
+from shared_models.ui_translation import UiTranslation
+from sqlalchemy import delete
+from sqlmodel import Session
+
+NS = "test_etag"
+
+
+def test_ui_translations_etag_revalidation(client) -> None:
+    with Session(engine) as session:
+        session.exec(delete(UiTranslation).where(UiTranslation.namespace == NS))
+        session.add(UiTranslation(namespace=NS, key="hello", lang=Language.EN, text="Hello"))
+        session.commit()
+    try:
+        first = client.get("/i18n/ui", params={"ns": NS, "lang": "en"})
+        assert first.status_code == HTTPStatus.OK
+        assert first.json() == {"hello": "Hello"}
+        etag = first.headers["ETag"]
+
+        same = client.get(
+            "/i18n/ui", params={"ns": NS, "lang": "en"}, headers={"If-None-Match": etag}
+        )
+        assert same.status_code == HTTPStatus.NOT_MODIFIED
+
+        with Session(engine) as session:
+            session.add(UiTranslation(namespace=NS, key="bye", lang=Language.EN, text="Bye"))
+            session.commit()
+        changed = client.get(
+            "/i18n/ui", params={"ns": NS, "lang": "en"}, headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == HTTPStatus.OK
+        assert changed.json() == {"hello": "Hello", "bye": "Bye"}
+        assert changed.headers["ETag"] != etag
+    finally:
+        with Session(engine) as session:
+            session.exec(delete(UiTranslation).where(UiTranslation.namespace == NS))
+            session.commit()
@@ -0,0 +1,109 @@
+import threading
+from http import HTTPStatus
+from uuid import uuid4
+
+import pytest
+from dnd_helper_api.db import engine
+from dnd_helper_api.job_progress import JobProgress, _rate_and_eta
+from dnd_helper_api.job_queue import LeaseHeartbeat, LeaseLost
+from shared_models.admin_job import AdminJob
+from sqlalchemy import update
+from sqlmodel import Session
+
+ADMIN = {"Authorization": "Bearer dev"}
+
+
+def _running_job(worker_id: str = "worker-a") -> AdminJob:
+    with Session(engine) as session:
+        job = AdminJob(job_type="bundle_ingest", status="running", worker_id=worker_id)
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        return job
+
+
+def test_rate_and_eta_leave_resumed_rows_out_of_the_rate() -> None:
+    assert _rate_and_eta(100, 0, 300, 10.0) == (10.0, 20.0)
+    assert _rate_and_eta(100, 50, 300, 10.0) == (5.0, 40.0)
+    assert _rate_and_eta(100, 0, None, 10.0) == (10.0, None)
+    assert _rate_and_eta(0, 0, 300, 0.0) == (0.0, None)
+
+
+def test_snapshot_sums_files_and_restores_checkpointed_counters() -> None:
+    progress = JobProgress(engine, uuid4(), rows_expected_total=12, files_total=2)
+    progress.restore([{"path": "monsters.ndjson", "processed": 3, "created": 3}])
+
+    first = progress.start_file("monsters.ndjson", "monsters", 4)
+    assert first["processed"] == 3 and first["resumed_from"] == 3
+    first["processed"] += 1
+    first["updated"] += 1
+    second = progress.start_file("spells.ndjson", "spells", 8)
+    assert second["processed"] == 0 and "resumed_from" not in second
+    second["processed"] += 2
+    second["failed"] += 2
+
+    running = progress.snapshot()
+    assert running["progress"]["files_done"] == 1
+    assert running["progress"]["current_file"] == "spells.ndjson"
+
+    final = progress.snapshot(final=True)
+    assert final["summary"] == {
+        "processed": 6, "created": 3, "updated": 1, "unchanged": 0, "deleted": 0, "failed": 2,
+    }
+    assert final["progress"]["files_done"] == 2
+    assert final["progress"]["current_file"] is None
+    assert final["progress"]["eta_seconds"] == 0
+
+
+def test_flush_persists_counters_and_checkpoint() -> None:
+    job = _running_job()
+    progress = JobProgress(engine, job.id, checkpoint=lambda: {"file_index": 0, "line_offset": 1})
+    progress.start_file("a.ndjson", "monsters")["processed"] += 1
+    progress.flush()
+
+    with Session(engine) as session:
+        stored = session.get(AdminJob, job.id)
+        assert stored.counters["summary"]["processed"] == 1
+        assert stored.checkpoint == {"file_index": 0, "line_offset": 1}
+
+
+def test_flush_of_a_reclaimed_job_raises_lease_lost() -> None:
+    job = _running_job(worker_id="worker-b")
+    lease = LeaseHeartbeat(engine, job.id, "worker-a")
+    progress = JobProgress(engine, job.id, lease=lease)
+    progress.start_file("a.ndjson", "monsters")
+
+    with pytest.raises(LeaseLost):
+        progress.flush()
+    assert lease.lost
+    with Session(engine) as session:
+        assert session.get(AdminJob, job.id).counters is None
+
+
+def test_events_of_unknown_job_are_not_found(client) -> None:
+    resp = client.get(f"/admin-api/ingest/jobs/{uuid4()}/events", headers=ADMIN)
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_event_stream_ends_when_job_finishes_without_notify(client, monkeypatch) -> None:
+    monkeypatch.setenv("ADMIN_SSE_KEEPALIVE_SECONDS", "1")
+    job = _running_job()
+
+    def _fail_silently() -> None:
+        with engine.begin() as conn:
+            conn.execute(update(AdminJob).where(AdminJob.id == job.id).values(status="failed"))
+
+    timer = threading.Timer(1.5, _fail_silently)
+    timer.start()
+    try:
+        with client.stream(
+            "GET", f"/admin-api/ingest/jobs/{job.id}/events", headers=ADMIN
+        ) as resp:
+            assert resp.status_code == HTTPStatus.OK
+            body = "".join(resp.iter_text())
+    finally:
+        timer.cancel()
+
+    assert body.startswith("event: progress")
+    assert "event: done" in body
+    assert '"status": "failed"' in body.split("event: done", 1)[1]
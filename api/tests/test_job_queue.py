@@ -0,0 +1,324 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+from uuid import UUID
+
+import psycopg
+import pytest
+from dnd_helper_api.db import engine
+from dnd_helper_api.job_queue import (
+    MAX_ATTEMPTS,
+    PROGRESS_CHANNEL,
+    WORKER_LEADER_LOCK,
+    LeaseHeartbeat,
+    claim_next_job,
+    extend_lease,
+    finish_job,
+    hold_leadership,
+    listen_dsn,
+    notify_job_enqueued,
+)
+from dnd_helper_api.worker import LeaderWorkerRunner, WorkerRunner, _process_job
+from shared_models.admin_job import AdminJob
+from shared_models.ui_translation import UiTranslation
+from sqlalchemy import delete, func, update
+from sqlmodel import Session, select
+
+from shared_models import Monster, MonsterTranslation
+
+NS = "test_queue"
+
+
+@pytest.fixture(autouse=True)
+def _clean_ui_translations() -> Iterator[None]:
+    yield
+    with Session(engine) as session:
+        session.exec(delete(UiTranslation).where(UiTranslation.namespace == NS))
+        session.commit()
+
+
+def _enqueue(session: Session, job_type: str = "ui_translations_import", **fields) -> UUID:
+    job = AdminJob(job_type=job_type, status="queued", **fields)
+    session.add(job)
+    session.commit()
+    return job.id
+
+
+def _ui_upload(tmp_path, keys: list[str]) -> str:
+    path = tmp_path / "ui.json"
+    rows = [{"namespace": NS, "key": k, "lang": "en", "text": k.upper()} for k in keys]
+    path.write_text(json.dumps({"ui_translations": rows}))
+    return str(path)
+
+
+def _expire_lease(job_id) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            update(AdminJob)
+            .where(AdminJob.id == job_id)
+            .values(lease_expires_at=func.now() - timedelta(seconds=1))
+        )
+
+
+def test_claim_next_job_takes_oldest_queued_job_once() -> None:
+    with Session(engine) as session:
+        first = _enqueue(session)
+        second = _enqueue(session)
+
+    with Session(engine) as a, Session(engine) as b, Session(engine) as c:
+        claimed_a = claim_next_job(a, "worker-a")
+        claimed_b = claim_next_job(b, "worker-b")
+        assert claimed_a is not None and claimed_a.id == first
+        assert claimed_b is not None and claimed_b.id == second
+        assert claim_next_job(c, "worker-c") is None
+
+        assert claimed_a.status == "running"
+        assert claimed_a.worker_id == "worker-a"
+        assert claimed_a.attempts == 1
+        assert claimed_a.lease_expires_at is not None
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_cannot_finish() -> None:
+    with Session(engine) as session:
+        job_id = _enqueue(session)
+        assert claim_next_job(session, "worker-a") is not None
+    _expire_lease(job_id)
+
+    with Session(engine) as session:
+        reclaimed = claim_next_job(session, "worker-b")
+        assert reclaimed is not None and reclaimed.id == job_id
+        assert reclaimed.attempts == 2
+
+        assert not extend_lease(engine, job_id, "worker-a")
+        assert not finish_job(session, job_id, "worker-a", status="succeeded")
+        assert finish_job(session, job_id, "worker-b", status="succeeded")
+        session.commit()
+        session.refresh(reclaimed)
+        assert reclaimed.status == "succeeded"
+        assert reclaimed.finished_at is not None
+
+
+def test_exhausted_attempts_fail_the_job_and_notify_subscribers() -> None:
+    with Session(engine) as session:
+        job_id = _enqueue(session)
+        assert claim_next_job(session, "worker-a") is not None
+        session.exec(
+            update(AdminJob).where(AdminJob.id == job_id).values(attempts=MAX_ATTEMPTS)
+        )
+        session.commit()
+    _expire_lease(job_id)
+
+    with psycopg.connect(listen_dsn(engine), autocommit=True) as listener:
+        listener.execute(f"LISTEN {PROGRESS_CHANNEL}")
+        with Session(engine) as session:
+            assert claim_next_job(session, "worker-b") is None
+            failed = session.get(AdminJob, job_id)
+            assert failed.status == "failed"
+            assert "Lease expired" in (failed.error or "")
+        notes = list(listener.notifies(timeout=2, stop_after=1))
+    assert [n.payload for n in notes] == [str(job_id)]
+
+
+def test_lost_lease_stops_processing_without_recording_a_result(tmp_path) -> None:
+    with Session(engine) as session:
+        _enqueue(session, file_path=_ui_upload(tmp_path, ["a", "b", "c"]))
+        job = claim_next_job(session, "worker-a")
+        assert job is not None
+        lease = LeaseHeartbeat(engine, job.id, "worker-a")
+        lease.lost = True
+
+        _process_job(session, job, lease)
+
+        session.expire_all()
+        stored = session.get(AdminJob, job.id)
+        assert stored.status == "running"
+        assert stored.counters is None
+        assert not session.exec(select(UiTranslation).where(UiTranslation.namespace == NS)).all()
+
+
+def test_reclaimed_job_result_is_not_overwritten(tmp_path) -> None:
+    with Session(engine) as session:
+        _enqueue(session, file_path=_ui_upload(tmp_path, ["a"]))
+        job = claim_next_job(session, "worker-a")
+        assert job is not None
+        job_id = job.id
+    with engine.begin() as conn:
+        # Another worker took the job over while worker-a was stalled
+        conn.execute(update(AdminJob).where(AdminJob.id == job_id).values(worker_id="worker-b"))
+
+    with Session(engine) as session:
+        job = session.get(AdminJob, job_id)
+        _process_job(session, job, LeaseHeartbeat(engine, job_id, "worker-a"))
+
+    with Session(engine) as session:
+        stored = session.get(AdminJob, job_id)
+        assert stored.status == "running"
+        assert stored.worker_id == "worker-b"
+        assert stored.finished_at is None
+
+
+def test_owned_job_succeeds(tmp_path) -> None:
+    with Session(engine) as session:
+        _enqueue(session, file_path=_ui_upload(tmp_path, ["a", "b"]))
+        job = claim_next_job(session, "worker-a")
+        assert job is not None
+        job_id = job.id
+        _process_job(session, job, LeaseHeartbeat(engine, job_id, "worker-a"))
+
+    with Session(engine) as session:
+        stored = session.get(AdminJob, job_id)
+        assert stored.status == "succeeded"
+        assert stored.counters["created"] == 2
+        assert stored.lease_expires_at is None
+
+
+def _wait_for(predicate, timeout: float = 15) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _job_statuses(job_ids: list[UUID]) -> list[str]:
+    with Session(engine) as session:
+        return [session.get(AdminJob, job_id).status for job_id in job_ids]
+
+
+def test_worker_runner_processes_jobs_announced_by_notify(tmp_path, monkeypatch) -> None:
+    # Far beyond the test's timeout: only the NOTIFY can wake the idle workers
+    monkeypatch.setenv("ADMIN_WORKER_POLL_SECONDS", "600")
+    uploads = []
+    for index in range(3):
+        (tmp_path / str(index)).mkdir()
+        uploads.append(_ui_upload(tmp_path / str(index), [f"k{index}"]))
+    runner = WorkerRunner(engine, concurrency=2)
+    runner.start()
+    threads = list(runner._threads)
+    try:
+        # Let the workers find the queue empty and go idle
+        time.sleep(1)
+        job_ids = []
+        for upload in uploads:
+            with Session(engine) as session:
+                job_ids.append(_enqueue(session, file_path=upload))
+                notify_job_enqueued(session, job_ids[-1])
+                session.commit()
+
+        assert _wait_for(lambda: _job_statuses(job_ids) == ["succeeded"] * 3)
+    finally:
+        runner.shutdown(timeout=5)
+
+    assert len(threads) == 4 and not any(t.is_alive() for t in threads)
+    with Session(engine) as session:
+        workers = {session.get(AdminJob, job_id).worker_id for job_id in job_ids}
+        keys = session.exec(select(UiTranslation.key).where(UiTranslation.namespace == NS)).all()
+    assert all(w and w != "test-worker" for w in workers)
+    assert sorted(keys) == ["k0", "k1", "k2"]
+
+
+def test_reclaimed_bundle_ingest_resumes_from_its_checkpoint(write_bundle) -> None:
+    monsters = [
+        {"uid": "w", "slug": "wolf", "hp": 11, "ac": 13},
+        {"uid": "b", "slug": "bat", "hp": 1, "ac": 12},
+    ]
+    translations = [{"uid": "w", "name": "Wolf"}, {"uid": "b", "name": "Bat"}]
+    bundle = write_bundle(
+        [("monsters", None, monsters), ("monster_translations", "en", translations)]
+    )
+    with Session(engine) as session:
+        # The first attempt committed the wolf (as it was then) before it died
+        wolf = Monster(slug="wolf", hp=5, ac=13)
+        session.add(wolf)
+        session.commit()
+        checkpoint = {
+            "file_index": 0,
+            "line_offset": 1,
+            "uid_to_monster_id": {"w": wolf.id},
+            "uid_to_spell_id": {},
+            "files": [{"path": "00_monsters.jsonl", "processed": 1, "created": 1}],
+        }
+        job_id = _enqueue(
+            session, job_type="bundle_ingest", file_path=bundle, checkpoint=checkpoint
+        )
+        job = claim_next_job(session, "worker-b")
+        assert job is not None and job.id == job_id
+        _process_job(session, job, LeaseHeartbeat(engine, job_id, "worker-b"))
+
+    with Session(engine) as session:
+        stored = session.get(AdminJob, job_id)
+        assert stored.status == "succeeded", stored.error
+        first, second = stored.counters["files"]
+        assert (first["resumed_from"], first["processed"], first["created"]) == (1, 2, 2)
+        assert (second["processed"], second["created"], second["failed"]) == (2, 2, 0)
+        # Lines before the checkpoint are not read again
+        monsters_by_slug = {m.slug: m for m in session.exec(select(Monster)).all()}
+        assert monsters_by_slug["wolf"].hp == 5
+        assert monsters_by_slug["bat"].hp == 1
+        # The restored uid map resolves translations of entities ingested before it
+        names = session.exec(select(MonsterTranslation.name)).all()
+        assert sorted(names) == ["Bat", "Wolf"]
+
+
+def test_only_one_process_leads_and_a_successor_takes_over() -> None:
+    lock_key = 0x7465737400000040  # not the real worker lock
+    events: list[str] = []
+    stops = {name: threading.Event() for name in ("a", "b")}
+    threads = {
+        name: threading.Thread(
+            target=hold_leadership,
+            args=(
+                engine,
+                lock_key,
+                stop,
+                lambda name=name: events.append(f"{name}:elected"),
+                lambda name=name: events.append(f"{name}:lost"),
+            ),
+            kwargs={"retry_seconds": 0.1},
+            daemon=True,
+        )
+        for name, stop in stops.items()
+    }
+    try:
+        threads["a"].start()
+        assert _wait_for(lambda: events == ["a:elected"])
+        threads["b"].start()
+        time.sleep(0.5)
+        assert events == ["a:elected"]
+
+        stops["a"].set()
+        threads["a"].join(timeout=5)
+        assert _wait_for(lambda: events == ["a:elected", "a:lost", "b:elected"])
+    finally:
+        for stop in stops.values():
+            stop.set()
+        for thread in threads.values():
+            thread.join(timeout=5)
+    assert events[-1] == "b:lost"
+
+
+def test_leader_worker_runner_runs_workers_only_while_leading() -> None:
+    with psycopg.connect(listen_dsn(engine), autocommit=True) as holder:
+        # Another process holds the worker lock
+        holder.execute("SELECT pg_advisory_lock(%s)", (WORKER_LEADER_LOCK,))
+        runner = LeaderWorkerRunner(engine, concurrency=1, shutdown_timeout=5)
+        runner.start()
+        try:
+            time.sleep(0.5)
+            assert not runner.is_leader
+
+            holder.execute("SELECT pg_advisory_unlock(%s)", (WORKER_LEADER_LOCK,))
+            assert _wait_for(lambda: runner.is_leader)
+            threads = list(runner._runner._threads)
+            assert threads and all(t.is_alive() for t in threads)
+        finally:
+            runner.shutdown(timeout=5)
+
+        assert not runner.is_leader
+        assert not any(t.is_alive() for t in threads)
+        # The lock was released with the leader's connection
+        row = holder.execute("SELECT pg_try_advisory_lock(%s)", (WORKER_LEADER_LOCK,)).fetchone()
+        assert row[0]
@@ -96,3 +96,96 @@ def test_delete_monster_and_verify_404(client) -> None:
     assert missing.status_code == HTTPStatus.NOT_FOUND
 
 
+
+
+def test_bulk_upsert_monsters_creates_updates_and_rejects_atomically(client) -> None:
+    items = [
+        {
+            "slug": "bulk-test-a",
+            "hp": 7,
+            "ac": 11,
+            "speed_fly": 30,
+            "translations": {"en": {"name": "A", "description": "a"}},
+        },
+        {"slug": "bulk-test-b", "hp": 8, "ac": 12},
+    ]
+    resp = client.post("/monsters/bulk", json=items)
+    assert resp.status_code == HTTPStatus.OK
+    created = resp.json()["items"]
+    assert [i["status"] for i in created] == ["created", "created"]
+    first_id = created[0]["id"]
+    assert client.get(f"/monsters/{first_id}").json()["is_flying"] is True
+
+    # One invalid item: nothing is written and each item reports its status
+    resp = client.post(
+        "/monsters/bulk", json=[{"id": first_id, "hp": 70}, {"slug": "bulk-test-c", "hp": "x"}]
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert [i["status"] for i in resp.json()["items"]] == ["valid", "invalid"]
+    assert client.get(f"/monsters/{first_id}").json()["hp"] == 7
+
+    resp = client.post("/monsters/bulk", json=[{"slug": "bulk-test-a", "hp": 70, "speed_fly": 0}])
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json()["items"][0]["status"] == "updated"
+    assert resp.json()["items"][0]["id"] == first_id
+    body = client.get(f"/monsters/{first_id}").json()
+    assert body["hp"] == 70 and body["ac"] == 11 and body["is_flying"] is False
+
+
+def test_list_monsters_page_filters_and_counts(client) -> None:
+    specs = [
+        {"hp": 5, "ac": 10, "cr": "1/4", "type": "beast", "size": "small"},
+        {"hp": 50, "ac": 15, "cr": "5", "type": "dragon", "size": "huge", "speed_fly": 60},
+        {"hp": 30, "ac": 12, "cr": "2", "type": "beast", "size": "large"},
+    ]
+    ids = [client.post("/monsters", json=spec).json()["id"] for spec in specs]
+
+    page = client.get("/monsters/list/page", params={"lang": "en", "limit": 2})
+    assert page.status_code == HTTPStatus.OK
+    body = page.json()
+    assert body["total"] == 3
+    assert [i["entity"]["id"] for i in body["items"]] == ids[:2]
+
+    beasts = client.get(
+        "/monsters/list/page",
+        params={"types": "beast", "cr": ["1/4", "2"], "sizes": ["large"], "is_flying": False},
+    ).json()
+    assert beasts["total"] == 1
+    assert beasts["items"][0]["entity"]["id"] == ids[2]
+
+    by_ids = client.get("/monsters/list/page", params={"ids": [ids[2], ids[0]]}).json()
+    assert [i["entity"]["id"] for i in by_ids["items"]] == [ids[0], ids[2]]
+
+    options = client.get("/monsters/list/options", params={"lang": "en"}).json()
+    assert sorted(o["code"] for o in options["types"]) == ["beast", "dragon"]
+
+
+def test_list_monsters_page_serves_the_bot_filter_params(client) -> None:
+    specs = [
+        {"hp": 1, "ac": 12, "cr": "0", "type": "beast", "size": "tiny", "speed_fly": 30},
+        {"hp": 9, "ac": 12, "cr": "3", "type": "undead", "is_legendary": False},
+        {"hp": 90, "ac": 18, "cr": "12", "type": "dragon", "is_legendary": True},
+    ]
+    ids = [client.post("/monsters", json=spec).json()["id"] for spec in specs]
+
+    # The bot's "0-3" CR bucket
+    low = client.get(
+        "/monsters/list/page", params={"cr": ["0", "1/8", "1/4", "1/2", "1", "2", "3"]}
+    ).json()
+    assert [i["entity"]["id"] for i in low["items"]] == ids[:2]
+    flying_tiny = client.get(
+        "/monsters/list/page", params={"sizes": ["tiny", "small"], "is_flying": True}
+    ).json()
+    assert [i["entity"]["id"] for i in flying_tiny["items"]] == [ids[0]]
+    # `false` also matches monsters whose flag is unset
+    not_legendary = client.get("/monsters/list/page", params={"is_legendary": False}).json()
+    assert not_legendary["total"] == 2
+
+    random_pick = client.get(
+        "/monsters/list/page", params={"order": "random", "limit": 1, "types": "dragon"}
+    ).json()
+    assert random_pick["total"] == 1
+    assert random_pick["items"][0]["entity"]["id"] == ids[2]
+    assert client.get("/monsters/list/page", params={"limit": 101}).status_code == (
+        HTTPStatus.UNPROCESSABLE_ENTITY
+    )
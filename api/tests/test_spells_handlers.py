@@ -56,6 +56,29 @@ def test_spells_list_headers(client) -> None:
     assert resp_wrapped.headers.get("Deprecation") in (None, "")
 
 
+def test_spells_list_etag_revalidation(client) -> None:
+    client.post("/spells", json={"school": "evocation"})
+    first = client.get("/spells/list/wrapped", params={"lang": "ru"})
+    assert first.status_code == HTTPStatus.OK
+    etag = first.headers["ETag"]
+
+    unchanged = client.get(
+        "/spells/list/wrapped", params={"lang": "ru"}, headers={"If-None-Match": etag}
+    )
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert unchanged.headers["ETag"] == etag
+    assert unchanged.content == b""
+
+    # Any catalog change bumps the version and with it the ETag
+    client.post("/spells", json={"school": "abjuration"})
+    changed = client.get(
+        "/spells/list/wrapped", params={"lang": "ru"}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == len(first.json()) + 1
+
+
 def test_get_spell_detail_valid_and_404(client) -> None:
     created = client.post("/spells", json={"school": "evocation"})
     spell_id = created.json()["id"]
@@ -99,3 +122,66 @@ def test_delete_spell_and_verify_404(client) -> None:
     assert missing.status_code == HTTPStatus.NOT_FOUND
 
 
+
+
+def test_bulk_upsert_spells_validates_enums_and_derives_fields(client) -> None:
+    items = [
+        {"slug": "bulk-spell-a", "school": "evocation", "duration": "Concentration, 1 minute"},
+        {"slug": "bulk-spell-b", "school": "not-a-school"},
+    ]
+    resp = client.post("/spells/bulk", json=items)
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert [i["status"] for i in resp.json()["items"]] == ["valid", "invalid"]
+
+    resp = client.post("/spells/bulk", json=items[:1])
+    assert resp.status_code == HTTPStatus.OK
+    spell_id = resp.json()["items"][0]["id"]
+    assert client.get(f"/spells/{spell_id}").json()["is_concentration"] is True
+
+
+def test_list_spells_page_filters_and_counts(client) -> None:
+    specs = [
+        {"school": "evocation", "level": 3, "classes": ["wizard"], "casting_time": "1 action"},
+        {"school": "abjuration", "level": 1, "classes": ["cleric"], "casting_time": "1 reaction"},
+        {"school": "evocation", "level": 7, "classes": ["sorcerer", "wizard"], "ritual": True},
+    ]
+    ids = [client.post("/spells", json=spec).json()["id"] for spec in specs]
+
+    body = client.get("/spells/list/page", params={"lang": "ru", "offset": 1}).json()
+    assert body["total"] == 3
+    assert [i["entity"]["id"] for i in body["items"]] == ids[1:]
+
+    wizard = client.get(
+        "/spells/list/page", params={"classes": ["wizard", "bard"], "levels": [1, 2, 3]}
+    ).json()
+    assert [i["entity"]["id"] for i in wizard["items"]] == [ids[0]]
+    reaction = client.get("/spells/list/page", params={"casting_times": "reaction"}).json()
+    assert [i["entity"]["id"] for i in reaction["items"]] == [ids[1]]
+    ritual = client.get("/spells/list/page", params={"ritual": True, "schools": "evocation"})
+    assert ritual.json()["total"] == 1
+
+    options = client.get("/spells/list/options", params={"lang": "en"}).json()
+    assert sorted(o["code"] for o in options["schools"]) == ["abjuration", "evocation"]
+    assert {o["code"] for o in options["classes"]} == {"cleric", "sorcerer", "wizard"}
+
+
+def test_list_spells_page_serves_the_bot_filter_params(client) -> None:
+    specs = [
+        {"school": "evocation", "level": 2, "duration": "Concentration, up to 1 minute"},
+        {"school": "evocation", "level": 4, "casting_time": "1 bonus action"},
+        {"school": "necromancy", "level": 9},
+    ]
+    ids = [client.post("/spells", json=spec).json()["id"] for spec in specs]
+
+    concentration = client.get("/spells/list/page", params={"is_concentration": True}).json()
+    assert [i["entity"]["id"] for i in concentration["items"]] == [ids[0]]
+    quick = client.get(
+        "/spells/list/page",
+        params={"casting_times": ["bonus_action", "reaction"], "levels": [4, 5]},
+    ).json()
+    assert [i["entity"]["id"] for i in quick["items"]] == [ids[1]]
+
+    counted = client.get("/spells/list/page", params={"schools": "evocation", "limit": 0}).json()
+    assert (counted["total"], counted["items"]) == (2, [])
+    page = client.get("/spells/list/page", params={"limit": 1, "offset": 2}).json()
+    assert [i["entity"]["id"] for i in page["items"]] == [ids[2]]
@@ -0,0 +1,125 @@
+from collections.abc import Iterator
+
+import pytest
+from dnd_helper_api.db import engine
+from dnd_helper_api.ingest.translations import TranslationUpserter
+from shared_models.enums import Language
+from shared_models.ui_translation import UiTranslation
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from shared_models import Monster, MonsterTranslation
+
+NS = "test_upserter"
+
+
+@pytest.fixture(autouse=True)
+def _clean_ui_translations() -> Iterator[None]:
+    yield
+    with Session(engine) as session:
+        session.exec(delete(UiTranslation).where(UiTranslation.namespace == NS))
+        session.commit()
+
+
+def _counters() -> dict[str, int]:
+    return {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+
+def _ui(key: str, text: str) -> dict:
+    return {"namespace": NS, "key": key, "lang": Language.EN, "text": text}
+
+
+def _ui_texts(session: Session) -> dict[str, str]:
+    rows = session.exec(select(UiTranslation).where(UiTranslation.namespace == NS)).all()
+    return {r.key: r.text for r in rows}
+
+
+def test_batches_count_created_updated_and_unchanged_rows() -> None:
+    with Session(engine) as session:
+        upserter = TranslationUpserter(session, "ui_translations", batch_rows=2)
+        counters = _counters()
+        for key in ("a", "b", "c"):
+            upserter.add(_ui(key, key.upper()), counters)
+        # The first two were written when the batch filled up
+        assert counters["created"] == 2
+        upserter.flush()
+        assert counters == {"created": 3, "updated": 0, "unchanged": 0, "failed": 0}
+
+        counters = _counters()
+        upserter.add(_ui("a", "A"), counters)
+        upserter.add(_ui("b", "bee"), counters)
+        upserter.flush()
+        assert counters == {"created": 0, "updated": 1, "unchanged": 1, "failed": 0}
+        assert _ui_texts(session) == {"a": "A", "b": "bee", "c": "C"}
+
+
+def test_repeated_keys_in_a_batch_apply_in_order() -> None:
+    with Session(engine) as session:
+        upserter = TranslationUpserter(session, "ui_translations")
+        counters = _counters()
+        upserter.add(_ui("a", "first"), counters)
+        upserter.add(_ui("a", "second"), counters)
+        upserter.flush()
+        assert _ui_texts(session) == {"a": "second"}
+        # Written and counted once per key
+        assert counters == {"created": 1, "updated": 0, "unchanged": 0, "failed": 0}
+
+
+def test_blank_names_and_missing_languages_keep_the_stored_values() -> None:
+    with Session(engine) as session:
+        monster = Monster(slug="wolf", hp=11, ac=13)
+        session.add(monster)
+        session.commit()
+        key = {"monster_id": monster.id, "lang": Language.EN}
+
+        upserter = TranslationUpserter(session, "monster_translations")
+        counters = _counters()
+        upserter.add({**key, "name": None, "languages_text": "Common"}, counters)
+        upserter.flush()
+        stored = session.exec(select(MonsterTranslation)).one()
+        assert (stored.name, stored.description, stored.languages_text) == ("", "", "Common")
+
+        upserter.add(
+            {**key, "name": "Wolf", "description": "A wolf", "traits": [{"name": "Keen"}]},
+            counters,
+        )
+        upserter.flush()
+        upserter.add(
+            {**key, "name": "", "description": None, "traits": None, "languages_text": None},
+            counters,
+        )
+        upserter.flush()
+        assert counters == {"created": 1, "updated": 2, "unchanged": 0, "failed": 0}
+
+        session.expire_all()
+        stored = session.exec(select(MonsterTranslation)).one()
+        assert (stored.name, stored.description, stored.languages_text) == (
+            "Wolf",
+            "A wolf",
+            "Common",
+        )
+        assert stored.traits is None
+
+
+def test_only_the_bad_rows_of_a_failed_batch_count_as_failed() -> None:
+    with Session(engine) as session:
+        monster = Monster(slug="wolf", hp=11, ac=13)
+        session.add(monster)
+        session.commit()
+
+        upserter = TranslationUpserter(session, "monster_translations")
+        counters = _counters()
+        upserter.add({"monster_id": 1_000_000, "lang": Language.EN, "name": "Ghost"}, counters)
+        upserter.add({"monster_id": monster.id, "lang": Language.EN, "name": "Wolf"}, counters)
+        upserter.add({"monster_id": 1_000_001, "lang": Language.RU, "name": "Призрак"}, counters)
+        upserter.add({"monster_id": monster.id, "lang": Language.RU, "name": "Волк"}, counters)
+        upserter.flush()
+        assert counters == {"created": 2, "updated": 0, "unchanged": 0, "failed": 2}
+        names = {t.name for t in session.exec(select(MonsterTranslation)).all()}
+        assert names == {"Wolf", "Волк"}
+
+        # The session is still usable
+        upserter = TranslationUpserter(session, "ui_translations")
+        upserter.add(_ui("a", "A"), counters)
+        upserter.flush()
+        assert counters["created"] == 3
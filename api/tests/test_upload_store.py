@@ -0,0 +1,107 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from dnd_helper_api.db import engine
+from dnd_helper_api.upload_store import blob_path, collect_garbage
+from shared_models.admin_job import AdminJob
+from sqlalchemy import update
+from sqlmodel import Session
+
+ADMIN = {"Authorization": "Bearer dev"}
+PAYLOAD = json.dumps({"ui_translations": []}).encode()
+
+
+def _upload(client, content: bytes, name: str = "ui.json", **form) -> dict:
+    resp = client.post(
+        "/admin-api/upload",
+        files={"file": (name, content, "application/json")},
+        data={"job_type": "ui_translations_import", **form},
+        headers=ADMIN,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_identical_uploads_share_a_blob_and_reuse_the_result(client, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ADMIN_UPLOAD_DIR", str(tmp_path))
+
+    first = _upload(client, PAYLOAD)
+    assert (first["status"], first["deduplicated"], first["reused_from"]) == ("queued", False, None)
+    path = blob_path(first["sha256"], "ui.json")
+    assert path.read_bytes() == PAYLOAD
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+    # Not reusable until it succeeded
+    assert _upload(client, PAYLOAD)["status"] == "queued"
+    with engine.begin() as conn:
+        conn.execute(
+            update(AdminJob)
+            .where(AdminJob.id == first["id"])
+            .values(
+                status="succeeded", counters={"created": 0}, finished_at=datetime.now(timezone.utc)
+            )
+        )
+
+    again = _upload(client, PAYLOAD, name="copy.json")
+    assert (again["sha256"], again["deduplicated"]) == (first["sha256"], True)
+    assert (again["status"], again["reused_from"]) == ("succeeded", first["id"])
+    with Session(engine) as session:
+        reused = session.get(AdminJob, again["id"])
+        assert reused.file_path == str(path)
+        assert reused.counters == {"created": 0, "reused_from": first["id"]}
+
+    # Other args or force run the job again
+    assert _upload(client, PAYLOAD, dry_run="true")["status"] == "queued"
+    assert _upload(client, PAYLOAD, force="true")["status"] == "queued"
+    assert _upload(client, PAYLOAD + b" ")["deduplicated"] is False
+
+
+def _file(path, age_seconds: float = 0) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def test_collect_garbage_removes_only_unreferenced_old_files(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ADMIN_UPLOAD_DIR", str(tmp_path))
+    day = 24 * 3600
+    blobs = tmp_path / "blobs" / "ab"
+    queued = _file(blobs / "queued.zip", 30 * day)
+    recent = _file(blobs / "recent.zip", 30 * day)
+    expired = _file(blobs / "expired.zip", 30 * day)
+    orphan = _file(blobs / "orphan.zip", 30 * day)
+    fresh = _file(blobs / "fresh.zip")
+    stray_tmp = _file(tmp_path / "tmp" / "upload-x", 30 * day)
+    legacy = _file(tmp_path / "1234_monsters.json", 30 * day)
+
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        session.add(AdminJob(job_type="bundle_ingest", status="queued", file_path=queued))
+        session.add(
+            AdminJob(
+                job_type="bundle_ingest",
+                status="succeeded",
+                file_path=recent,
+                finished_at=now - timedelta(days=1),
+            )
+        )
+        session.add(
+            AdminJob(
+                job_type="bundle_ingest",
+                status="failed",
+                file_path=expired,
+                finished_at=now - timedelta(days=30),
+            )
+        )
+        session.commit()
+
+        stats = collect_garbage(session, now=now)
+
+    assert (stats["removed"], stats["kept"], stats["bytes_freed"]) == (4, 3, 4)
+    remaining = {str(p) for p in tmp_path.rglob("*") if p.is_file()}
+    assert remaining == {queued, recent, fresh}
+    assert not {expired, orphan, stray_tmp, legacy} & remaining
@@ -4,7 +4,7 @@ import random
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
-from dnd_helper_bot.repositories.api_client import api_get_one
+from dnd_helper_bot.handlers.lang import _resolve_lang_by_user
 from dnd_helper_bot.utils.i18n import t
 from dnd_helper_bot.utils.nav import build_nav_row
 
@@ -19,33 +19,6 @@ def roll_dice(count: int, faces: int) -> list[int]:
     return [random.randint(1, faces) for _ in range(count)]
 
 
-async def _resolve_lang_by_user(update_or_query) -> str:
-    """Prefer DB user's language; fallback to Telegram UI language."""
-    try:
-        tg_user = None
-        if hasattr(update_or_query, "effective_user") and update_or_query.effective_user is not None:
-            tg_user = update_or_query.effective_user
-        elif hasattr(update_or_query, "from_user") and update_or_query.from_user is not None:
-            tg_user = update_or_query.from_user
-        tg_id = getattr(tg_user, "id", None)
-        if tg_id is not None:
-            user = await api_get_one(f"/users/by-telegram/{tg_id}")
-            lang = user.get("lang")
-            if lang in ("ru", "en"):
-                return lang
-    except Exception:
-        pass
-    try:
-        code = None
-        if hasattr(update_or_query, "effective_user") and update_or_query.effective_user is not None:
-            code = (update_or_query.effective_user.language_code or "ru").lower()
-        elif hasattr(update_or_query, "from_user") and update_or_query.from_user is not None:
-            code = (update_or_query.from_user.language_code or "ru").lower()
-        return "en" if str(code).startswith("en") else "ru"
-    except Exception:
-        return "ru"
-
-
 async def _nav_row(lang: str) -> list[InlineKeyboardButton]:
     return await build_nav_row(lang, back_callback="menu:main")
 
@@ -58,7 +31,7 @@ async def show_dice_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     context.user_data.pop("awaiting_dice_count", None)
     context.user_data.pop("awaiting_dice_faces", None)
     context.user_data.pop("dice_count", None)
-    lang = await _resolve_lang_by_user(update)
+    lang = await _resolve_lang_by_user(update, context)
     keyboard_rows = [
         [InlineKeyboardButton(await t("dice.quick.d20", lang), callback_data="dice:d20")],
         [InlineKeyboardButton(await t("dice.quick.d6", lang), callback_data="dice:d6")],
@@ -76,7 +49,7 @@ async def dice_roll(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     kind = query.data.split(":", 1)[1]
     chat_id = query.message.chat_id if query and query.message else None
     user_id = query.from_user.id if query and query.from_user else None
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     if kind == "custom":
         # Start two-step flow: ask for count first
         context.user_data["awaiting_dice_count"] = True
@@ -110,7 +83,7 @@ async def handle_dice_text_input(update: Update, context: ContextTypes.DEFAULT_T
     chat_id = update.effective_chat.id if update.effective_chat else None
     user_id = update.effective_user.id if update.effective_user else None
     text = (update.message.text or "").strip()
-    lang = await _resolve_lang_by_user(update)
+    lang = await _resolve_lang_by_user(update, context)
 
     if context.user_data.get("awaiting_dice_count"):
         try:
@@ -179,7 +152,7 @@ async def handle_dice_text_input(update: Update, context: ContextTypes.DEFAULT_T
 async def show_dice_menu_from_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     keyboard_rows = [
         [InlineKeyboardButton(await t("dice.quick.d20", lang), callback_data="dice:d20")],
         [InlineKeyboardButton(await t("dice.quick.d6", lang), callback_data="dice:d6")],
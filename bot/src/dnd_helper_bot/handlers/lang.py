@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from dnd_helper_bot.repositories.users import get_user
+
+
+def _telegram_user(update_or_query) -> Any:
+    # Update exposes `effective_user`, CallbackQuery exposes `from_user`
+    for attr in ("effective_user", "from_user"):
+        tg_user = getattr(update_or_query, attr, None)
+        if tg_user is not None:
+            return tg_user
+    return None
+
+
+def _guess_lang(update_or_query) -> str:
+    """Telegram UI language mapped to a supported one."""
+    try:
+        code = (_telegram_user(update_or_query).language_code or "ru").lower()
+        return "en" if code.startswith("en") else "ru"
+    except Exception:
+        return "ru"
+
+
+async def _resolve_lang_by_user(update_or_query, context: Optional[Any] = None) -> str:
+    """Prefer DB user's language (cached profile); fallback to Telegram UI language."""
+    tg_id = getattr(_telegram_user(update_or_query), "id", None)
+    if tg_id is not None:
+        try:
+            user = await get_user(tg_id, getattr(context, "user_data", None))
+            lang = user.get("lang")
+            if lang in ("ru", "en"):
+                return lang
+        except Exception:
+            pass
+    return _guess_lang(update_or_query)
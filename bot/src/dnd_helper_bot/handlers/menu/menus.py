@@ -17,7 +17,7 @@ async def show_bestiarie_menu(update, context: ContextTypes.DEFAULT_TYPE) -> Non
     user_id = update.effective_user.id if update.effective_user else None
     chat_id = update.effective_chat.id if update.effective_chat else None
     logger.info("Show bestiary menu", extra={"correlation_id": chat_id, "user_id": user_id})
-    lang = await _resolve_lang_by_user(update)
+    lang = await _resolve_lang_by_user(update, context)
     await update.message.reply_text(
         await t("menu.bestiary.title", lang) + ":",
         reply_markup=await build_monsters_root_keyboard(lang),
@@ -28,7 +28,7 @@ async def show_spells_menu(update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = update.effective_user.id if update.effective_user else None
     chat_id = update.effective_chat.id if update.effective_chat else None
     logger.info("Show spells menu", extra={"correlation_id": chat_id, "user_id": user_id})
-    lang = await _resolve_lang_by_user(update)
+    lang = await _resolve_lang_by_user(update, context)
     await update.message.reply_text(
         await t("menu.spells.title", lang) + ":",
         reply_markup=await build_spells_root_keyboard(lang),
@@ -45,7 +45,7 @@ async def show_main_menu_from_callback(update, context: ContextTypes.DEFAULT_TYP
         effective_user = None
         def __init__(self, q):
             self.effective_user = q.from_user if q and getattr(q, "from_user", None) else None
-    lang = await _resolve_lang_by_user(_QWrap(query))
+    lang = await _resolve_lang_by_user(_QWrap(query), context)
     await query.message.edit_text((await t("menu.main.title", lang)) + ":", reply_markup=await _build_main_menu_inline_i18n(lang))
 
 
@@ -59,7 +59,7 @@ async def show_bestiarie_menu_from_callback(update, context: ContextTypes.DEFAUL
         effective_user = None
         def __init__(self, q):
             self.effective_user = q.from_user if q and getattr(q, "from_user", None) else None
-    lang = await _resolve_lang_by_user(_QWrap(query))
+    lang = await _resolve_lang_by_user(_QWrap(query), context)
     kb = await build_monsters_root_keyboard(lang)
     rows = list(kb.inline_keyboard)
     back = await t("nav.back", lang)
@@ -78,7 +78,7 @@ async def show_spells_menu_from_callback(update, context: ContextTypes.DEFAULT_T
         effective_user = None
         def __init__(self, q):
             self.effective_user = q.from_user if q and getattr(q, "from_user", None) else None
-    lang = await _resolve_lang_by_user(_QWrap(query))
+    lang = await _resolve_lang_by_user(_QWrap(query), context)
     kb = await build_spells_root_keyboard(lang)
     rows = list(kb.inline_keyboard)
     back = await t("nav.back", lang)
@@ -2,29 +2,14 @@ import logging
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+from dnd_helper_bot.handlers.lang import _resolve_lang_by_user
 from dnd_helper_bot.repositories.api_client import api_get_one, api_patch, api_post
+from dnd_helper_bot.repositories.users import get_user, invalidate_user, store_user
 from dnd_helper_bot.utils.i18n import t
 
 logger = logging.getLogger(__name__)
 
 
-async def _resolve_lang_by_user(update_or_query) -> str:
-    try:
-        tg_id = update_or_query.effective_user.id if update_or_query and getattr(update_or_query, "effective_user", None) else None
-        if tg_id is not None:
-            user = await api_get_one(f"/users/by-telegram/{tg_id}")
-            lang = user.get("lang")
-            if lang in ("ru", "en"):
-                return lang
-    except Exception:
-        pass
-    try:
-        code = (update_or_query.effective_user.language_code or "ru").lower()
-        return "en" if code.startswith("en") else "ru"
-    except Exception:
-        return "ru"
-
-
 async def show_settings_from_callback(update, context) -> None:
     query = update.callback_query
     user_id = query.from_user.id if query and query.from_user else None
@@ -35,7 +20,7 @@ async def show_settings_from_callback(update, context) -> None:
         effective_user = None
         def __init__(self, q):
             self.effective_user = q.from_user if q and getattr(q, "from_user", None) else None
-    lang = await _resolve_lang_by_user(_QWrap(query))
+    lang = await _resolve_lang_by_user(_QWrap(query), context)
     await query.message.edit_text(await t("menu.settings.title", lang), reply_markup=await _build_language_keyboard(include_back=True, lang=lang))
 
 
@@ -62,7 +47,7 @@ async def set_language(update, context) -> None:
 
     user = None
     try:
-        user = await api_get_one(f"/users/by-telegram/{tg_id}")
+        user = await get_user(tg_id, context.user_data, fetch=api_get_one)
     except Exception:
         user = None
 
@@ -79,11 +64,17 @@ async def set_language(update, context) -> None:
             )
             user = created
         else:
-            await api_patch(f"/users/{user['id']}", {"lang": lang})
+            user = await api_patch(f"/users/{user['id']}", {"lang": lang})
     except Exception as exc:
+        # The cached profile may be the reason the write failed (e.g. user deleted)
+        invalidate_user(tg_id, context.user_data)
         logger.error("Failed to persist language", extra={"error": str(exc)})
         await query.edit_message_text("Ошибка сохранения настроек. Попробуйте ещё раз.")
         return
+    if isinstance(user, dict) and user.get("lang") == lang:
+        store_user(tg_id, user, context.user_data)
+    else:
+        invalidate_user(tg_id, context.user_data)
 
     await query.edit_message_text(
         (await t("menu.main.title", lang)) + ":",
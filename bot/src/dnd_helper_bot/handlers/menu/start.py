@@ -3,6 +3,7 @@ import logging
 from telegram.ext import ContextTypes
 
 from dnd_helper_bot.repositories.api_client import api_get_one
+from dnd_helper_bot.repositories.users import get_user
 from dnd_helper_bot.utils.i18n import t
 
 from .i18n import _build_main_menu_inline_i18n
@@ -18,7 +19,7 @@ async def start(update, context: ContextTypes.DEFAULT_TYPE) -> None:
     tg_id = update.effective_user.id if update.effective_user else None
     name = (update.effective_user.full_name or update.effective_user.username or "User") if update.effective_user else "User"
     try:
-        user = await api_get_one(f"/users/by-telegram/{tg_id}")
+        user = await get_user(tg_id, getattr(context, "user_data", None), fetch=api_get_one)
     except Exception:
         user = None
 
@@ -160,63 +160,40 @@ def _toggle_or_set_filters(pending: Dict[str, Any], token: str) -> Dict[str, Any
     return updated
 
 
-def _filter_monsters(items: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-    def cr_bucket_match(cr_value: Optional[float], buckets: Optional[Set[str]], legacy: Optional[str]) -> bool:
-        if buckets is None and legacy is None:
-            return True
-        if cr_value is None:
-            return False
-        # If new buckets are present, use OR across them
-        targets: List[str]
-        if isinstance(buckets, set) and buckets:
-            targets = list(buckets)
-        elif isinstance(legacy, str) and legacy:
-            targets = [legacy]
-        else:
-            return True
-        for rng in targets:
-            if rng == "03" and 0 <= cr_value <= 3:
-                return True
-            if rng == "48" and 4 <= cr_value <= 8:
-                return True
-            if rng == "9p" and cr_value >= 9:
-                return True
-        return False
-
-    result: List[Dict[str, Any]] = []
-    selected_types: Optional[Set[str]] = filters.get("types") if isinstance(filters.get("types"), set) else None
-    selected_sizes: Optional[Set[str]] = filters.get("sizes") if isinstance(filters.get("sizes"), set) else None
-    for m in items:
-        # Booleans (tri-state)
-        leg = filters.get("legendary")
-        if leg is True and not m.get("is_legendary", False):
-            continue
-        if leg is False and m.get("is_legendary", False):
-            continue
-        fly = filters.get("flying")
-        if fly is True and not m.get("is_flying", False):
-            continue
-        if fly is False and m.get("is_flying", False):
-            continue
-        # CR buckets
-        if not cr_bucket_match(m.get("cr"), filters.get("cr_buckets"), filters.get("cr_range")):
-            continue
-        # Size (multi-select OR); fallback to legacy single
-        if selected_sizes is not None:
-            if m.get("size") not in selected_sizes:
-                continue
-        else:
-            size = filters.get("size")
-            if size is not None and m.get("size") != size:
-                continue
-        # Types (multi-select OR)
-        if selected_types is not None:
-            # Monsters list does not currently include normalized type in the derived dict; skip until available
-            # Type filtering will be applied at render step if types are included
-            m_type: Optional[str] = m.get("type")
-            if m_type is None or m_type not in selected_types:
-                continue
-        result.append(m)
-    return result
-
-
+# CR codes per bucket: "03" -> 0..3, "48" -> 4..8, "9p" -> 9 and up
+_CR_BUCKET_CODES: Dict[str, List[str]] = {
+    "03": ["0", "1/8", "1/4", "1/2", "1", "2", "3"],
+    "48": [str(cr) for cr in range(4, 9)],
+    "9p": [str(cr) for cr in range(9, 31)],
+}
+# Size letters shown in the UI -> API size codes
+_SIZE_LETTER_CODES: Dict[str, List[str]] = {
+    "S": ["tiny", "small"],
+    "M": ["medium"],
+    "L": ["large", "huge", "gargantuan"],
+}
+
+
+def _monsters_query_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Applied filter state as `/monsters/list/page` query parameters (OR within a field)."""
+    params: Dict[str, Any] = {}
+    buckets = filters.get("cr_buckets") if isinstance(filters.get("cr_buckets"), set) else None
+    if not buckets and isinstance(filters.get("cr_range"), str) and filters["cr_range"]:
+        buckets = {filters["cr_range"]}
+    if buckets:
+        params["cr"] = [code for b in sorted(buckets) for code in _CR_BUCKET_CODES.get(b, [])]
+    # Size (multi-select OR); fallback to legacy single
+    sizes = filters.get("sizes") if isinstance(filters.get("sizes"), set) else None
+    if sizes is None and filters.get("size") is not None:
+        sizes = {filters["size"]}
+    if sizes is not None:
+        params["sizes"] = [c for s in sorted(sizes) for c in _SIZE_LETTER_CODES.get(s, [s])]
+    types = filters.get("types") if isinstance(filters.get("types"), set) else None
+    if types is not None:
+        params["types"] = sorted(types)
+    # Booleans (tri-state)
+    if filters.get("flying") in (True, False):
+        params["is_flying"] = filters["flying"]
+    if filters.get("legendary") in (True, False):
+        params["is_legendary"] = filters["legendary"]
+    return params
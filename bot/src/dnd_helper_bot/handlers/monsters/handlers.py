@@ -5,7 +5,7 @@ from typing import Any, Dict
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
-from dnd_helper_bot.repositories.api_client import api_get, api_get_one
+from dnd_helper_bot.repositories.api_client import api_get_one
 from dnd_helper_bot.utils.i18n import t
 
 from .filters import (
@@ -45,7 +45,7 @@ async def monster_detail(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             "monster_id": monster_id,
         },
     )
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     w = await api_get_one(f"/monsters/{monster_id}/wrapped", params={"lang": lang})
     e: Dict[str, Any] = w.get("entity") or {}
     tdata: Dict[str, Any] = w.get("translation") or {}
@@ -82,16 +82,21 @@ async def monster_random(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         "Monster random requested",
         extra={"correlation_id": query.message.chat_id if query and query.message else None},
     )
-    lang = await _resolve_lang_by_user(query)
-    wrapped_list = await api_get("/monsters/list/wrapped", params={"lang": lang})
-    if not wrapped_list:
+    lang = await _resolve_lang_by_user(query, context)
+    # Not shared: concurrent users must not all get the same pick
+    result = await api_get_one(
+        "/monsters/list/page",
+        params={"lang": lang, "order": "random", "limit": 1},
+        shared=False,
+    )
+    if not result.get("items"):
         logger.warning(
             "No monsters available for random",
             extra={"correlation_id": query.message.chat_id if query and query.message else None},
         )
         await query.edit_message_text(await t("list.empty.monsters", lang, default="Монстров нет."))
         return
-    w = __import__("random").choice(wrapped_list)
+    w = result["items"][0]
     e: Dict[str, Any] = w.get("entity") or {}
     tdata: Dict[str, Any] = w.get("translation") or {}
     labels: Dict[str, Any] = (w.get("labels") or {})
@@ -122,7 +127,7 @@ async def monster_search_prompt(update: Update, context: ContextTypes.DEFAULT_TY
         "Monster search prompt shown",
         extra={"correlation_id": query.message.chat_id if query and query.message else None},
     )
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     # Ensure default scope is set
     if not context.user_data.get("search_scope"):
         context.user_data["search_scope"] = "name"
@@ -1,15 +1,17 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
-from dnd_helper_bot.repositories.api_client import api_get
+from dnd_helper_bot.repositories.api_client import api_get_one
+from dnd_helper_bot.repositories.catalog import get_catalog
 from dnd_helper_bot.utils.i18n import t
 from dnd_helper_bot.utils.nav import build_nav_row
-from dnd_helper_bot.utils.pagination import PAGE_SIZE_LIST, paginate
+from dnd_helper_bot.utils.pagination import PAGE_SIZE_LIST
+from dnd_helper_bot.utils.render_cache import freeze, freeze_rows, memoized, thaw_rows
 
-from .filters import _filter_monsters, _get_filter_state
+from .filters import _get_filter_state, _monsters_query_params
 from .lang import _resolve_lang_by_user
 
 
@@ -17,7 +19,7 @@ async def _nav_row(lang: str, back_callback: str) -> list[InlineKeyboardButton]:
     return await build_nav_row(lang, back_callback)
 
 
-async def _build_filters_header(
+async def _compose_filters_header(
     applied: Dict[str, Any],
     lang: str,
     type_options: List[Tuple[str, str]],
@@ -100,67 +102,34 @@ async def _build_filters_header(
     return "; ".join(parts) if parts else (await t("list.all.monsters", lang, default=("All monsters" if lang == "en" else "Все монстры")))
 
 
-def _cr_to_float(value: Any) -> Optional[float]:
-    try:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-        s = str(value)
-        if "/" in s:
-            a, b = s.split("/", 1)
-            return float(a) / float(b)
-        return float(s)
-    except Exception:
-        return None
+async def _build_filters_header(
+    applied: Dict[str, Any],
+    lang: str,
+    type_options: List[Tuple[str, str]],
+) -> str:
+    return await memoized(
+        "monsters:header",
+        lang,
+        (freeze(applied), tuple(type_options)),
+        lambda: _compose_filters_header(applied, lang, type_options),
+    )
+
 
+def _project_options(options: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Type options for the filters keyboard: (code, label), sorted by label."""
+    types = options.get("types") or []
+    return [(str(o.get("code")), str(o.get("label") or o.get("code"))) for o in types]
 
-def _size_letter(code: Optional[str]) -> Optional[str]:
-    m = {"tiny": "S", "small": "S", "medium": "M", "large": "L", "huge": "L", "gargantuan": "L"}
-    return m.get(str(code).lower()) if code else None
+
+async def load_monster_type_options(lang: str) -> List[Tuple[str, str]]:
+    return await get_catalog("/monsters/list/options", lang, _project_options)
 
 
 async def render_monsters_list(query, context: ContextTypes.DEFAULT_TYPE, page: int) -> None:
     context.user_data["monsters_current_page"] = page
     pending, applied = _get_filter_state(context)
-    lang = await _resolve_lang_by_user(query)
-    wrapped_list: List[Dict[str, Any]] = await api_get("/monsters/list/wrapped", params={"lang": lang})
-
-    all_monsters: List[Dict[str, Any]] = []
-    type_map: Dict[str, str] = {}
-    for w in wrapped_list:
-        e = w.get("entity") or {}
-        t_tr = w.get("translation") or {}
-        lbls = w.get("labels") or {}
-        t_label = None
-        t_code = None
-        if isinstance(lbls, dict):
-            t_info = lbls.get("type")
-            if isinstance(t_info, dict):
-                t_code = (t_info.get("code") or "").strip().lower() or None
-                t_label = t_info.get("label") or None
-        if not t_code:
-            v = e.get("type")
-            t_code = (str(v).strip().lower() if v is not None else None) or None
-        if t_code and isinstance(t_label, str):
-            type_map.setdefault(t_code, t_label)
-        all_monsters.append(
-            {
-                "id": e.get("id"),
-                "name": t_tr.get("name") or "",
-                "description": t_tr.get("description") or "",
-                "is_legendary": e.get("is_legendary"),
-                "is_flying": e.get("is_flying"),
-                "cr": _cr_to_float(e.get("cr")),
-                "size": _size_letter(e.get("size")),
-                "type": t_code,
-            }
-        )
-
-    filtered = _filter_monsters(all_monsters, applied)
-    total = len(filtered)
-    # Prepare type options for keyboard (sorted by label)
-    type_options: List[Tuple[str, str]] = sorted(type_map.items(), key=lambda x: (x[1] or ""))
+    lang = await _resolve_lang_by_user(query, context)
+    type_options = await load_monster_type_options(lang)
     add_menu_open = bool(context.user_data.get("monsters_add_menu_open"))
     rows: List[List[InlineKeyboardButton]] = []
     # Manage view: show only filters UI, no entities
@@ -198,10 +167,19 @@ async def render_monsters_list(query, context: ContextTypes.DEFAULT_TYPE, page:
     top_label = await t("filters.change", lang) if _has_any_filters(applied) else await t("filters.add", lang)
     rows.append([InlineKeyboardButton(top_label, callback_data="mflt:add")])
 
-    page_items = paginate(filtered, page, PAGE_SIZE_LIST)
-    for m in page_items:
-        label = f"{m.get('name','')}"
-        rows.append([InlineKeyboardButton(label, callback_data=f"monster:detail:{m['id']}")])
+    # Only the current page is requested; filtering happens in the API
+    params = {
+        **_monsters_query_params(applied),
+        "lang": lang,
+        "limit": PAGE_SIZE_LIST,
+        "offset": (page - 1) * PAGE_SIZE_LIST,
+    }
+    result = await api_get_one("/monsters/list/page", params=params)
+    total = int(result.get("total") or 0)
+    for w in result.get("items") or []:
+        e = w.get("entity") or {}
+        label = str((w.get("translation") or {}).get("name") or "")
+        rows.append([InlineKeyboardButton(label, callback_data=f"monster:detail:{e.get('id')}")])
     nav: List[InlineKeyboardButton] = []
     if (page - 1) * PAGE_SIZE_LIST > 0:
         nav.append(InlineKeyboardButton("⬅️", callback_data=f"monster:list:page:{page-1}"))
@@ -224,7 +202,7 @@ async def render_monsters_list(query, context: ContextTypes.DEFAULT_TYPE, page:
         await query.answer()
 
 
-async def _build_filters_keyboard(pending: Dict[str, Any], lang: str, type_options: List[Tuple[str, str]], add_menu_open: bool) -> List[List[InlineKeyboardButton]]:
+async def _compose_filters_keyboard(pending: Dict[str, Any], lang: str, type_options: List[Tuple[str, str]], add_menu_open: bool) -> List[List[InlineKeyboardButton]]:
     rows: List[List[InlineKeyboardButton]] = []
 
     # Collapsed state: only one button "Add filters"
@@ -347,3 +325,23 @@ async def _build_filters_keyboard(pending: Dict[str, Any], lang: str, type_optio
     return rows
 
 
+async def _build_filters_keyboard(
+    pending: Dict[str, Any],
+    lang: str,
+    type_options: List[Tuple[str, str]],
+    add_menu_open: bool,
+) -> List[List[InlineKeyboardButton]]:
+    """Cached `_compose_filters_keyboard`; returns fresh row lists callers may extend."""
+
+    async def build() -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+        return freeze_rows(
+            await _compose_filters_keyboard(pending, lang, type_options, add_menu_open)
+        )
+
+    rows = await memoized(
+        "monsters:keyboard",
+        lang,
+        (freeze(pending), tuple(type_options), add_menu_open),
+        build,
+    )
+    return thaw_rows(rows)
@@ -10,6 +10,8 @@ from dnd_helper_bot.handlers.menu import (  # noqa: E402
 )
 from dnd_helper_bot.handlers.monsters.lang import _resolve_lang_by_user  # type: ignore
 from dnd_helper_bot.repositories.api_client import api_get, api_get_one
+from dnd_helper_bot.repositories.names import get_names, remember_names
+from dnd_helper_bot.repositories.users import get_user
 from dnd_helper_bot.utils.i18n import t  # noqa: E402
 from dnd_helper_bot.utils.nav import build_nav_row  # noqa: E402
 
@@ -28,7 +30,7 @@ async def handle_search_text(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Ensure user exists; if not, ask for language first
     try:
         tg_id = update.effective_user.id if update.effective_user else None
-        user = await api_get_one(f"/users/by-telegram/{tg_id}")
+        user = await get_user(tg_id, context.user_data, fetch=api_get_one)
         lang = user.get("lang", "ru")
     except Exception:
         logger.exception("Failed to fetch user by telegram id")
@@ -160,9 +162,11 @@ async def handle_search_text(update: Update, context: ContextTypes.DEFAULT_TYPE)
         context.user_data["search_active"] = True
         return
 
-    # Cache search session data
+    # Keep only the result ids per user; names go to the shared cache
+    ids = remember_names(target, lang, items)
     context.user_data["search_mode_target"] = target
-    context.user_data["search_items_cache"] = items
+    context.user_data["search_session"] = {"q": query_text, "scope": scope, "ids": ids}
+    context.user_data.pop("search_items_cache", None)
     context.user_data["search_current_page"] = 1
 
     # Render paginated results (page 1)
@@ -179,7 +183,7 @@ async def toggle_search_scope(update: Update, context: ContextTypes.DEFAULT_TYPE
     if value not in {"name", "name_description"}:
         value = "name"
     context.user_data["search_scope"] = value
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
 
     # Rebuild only the scope row and update current message markup, preserving other rows
     name_label = await t("search.scope.name", lang)
@@ -212,16 +216,17 @@ async def _build_scope_row_for_search(lang: str, context: ContextTypes.DEFAULT_T
 
 
 async def _render_search_results(update_or_query, context: ContextTypes.DEFAULT_TYPE, lang: str, page: int) -> None:
-    """Render cached search results with pagination and scope row.
+    """Render the current search session with pagination and scope row.
 
     Uses context.user_data keys:
       - search_mode_target: "monsters" | "spells"
-      - search_items_cache: List[wrapped items]
+      - search_session: {"q", "scope", "ids"}; names of the page come from the shared cache
       - search_message_id: for edit-in-place
     """
     target = context.user_data.get("search_mode_target") or "spells"
-    items: List[Dict[str, Any]] = context.user_data.get("search_items_cache") or []
-    total = len(items)
+    session = context.user_data.get("search_session") or {}
+    ids: List[int] = list(session.get("ids") or [])
+    total = len(ids)
     context.user_data["search_current_page"] = page
 
     # Build rows
@@ -231,32 +236,19 @@ async def _render_search_results(update_or_query, context: ContextTypes.DEFAULT_
     # Items for the page
     from dnd_helper_bot.utils.pagination import paginate
 
-    page_items = paginate(items, page)
-    if target == "monsters":
-        for m in page_items:
-            try:
-                e = m.get("entity") or {}
-                tr = m.get("translation") or {}
-                mid = e.get("id")
-                if mid is None:
-                    continue
-                label = tr.get("name") or tr.get("description") or "<no name>"
-                rows.append([InlineKeyboardButton(str(label), callback_data=f"monster:detail:{mid}")])
-            except Exception:
-                # Skip faulty item
-                continue
-    else:
-        for s in page_items:
-            try:
-                e = s.get("entity") or {}
-                tr = s.get("translation") or {}
-                sid = e.get("id")
-                if sid is None:
-                    continue
-                label = tr.get("name") or tr.get("description") or "<no name>"
-                rows.append([InlineKeyboardButton(str(label), callback_data=f"spell:detail:{sid}")])
-            except Exception:
-                continue
+    page_ids = paginate(ids, page)
+    try:
+        names = await get_names(target, lang, page_ids)
+    except Exception:
+        logger.exception("Failed to fetch search result names")
+        names = {}
+    detail = "monster" if target == "monsters" else "spell"
+    for entity_id in page_ids:
+        # Ids deleted since the search have no name
+        if entity_id in names:
+            rows.append(
+                [InlineKeyboardButton(names[entity_id], callback_data=f"{detail}:detail:{entity_id}")]
+            )
 
     # Page navigation
     nav: List[InlineKeyboardButton] = []
@@ -313,13 +305,11 @@ async def search_page_nav(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         target = str(context.user_data.get("search_mode_target") or "spells")
         page = int(context.user_data.get("search_current_page") or 1)
     context.user_data["search_mode_target"] = target
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
 
-    # Ensure items cached; if not, try to recompute from last query context if available
-    items = context.user_data.get("search_items_cache")
-    if not isinstance(items, list):
-        # No cache: degrade gracefully to first page empty
-        context.user_data["search_items_cache"] = []
+    # No session (expired or cleared): degrade gracefully to an empty page
+    if not isinstance(context.user_data.get("search_session"), dict):
+        context.user_data["search_session"] = {"ids": []}
     await _render_search_results(update, context, lang, page)
 
 
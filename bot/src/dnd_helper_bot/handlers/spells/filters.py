@@ -148,69 +148,35 @@ def _toggle_or_set_filters(pending: Dict[str, Any], token: str) -> Dict[str, Any
     return updated
 
 
-def _filter_spells(items: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-    def match_casting_time(value: Optional[str], want_bonus: bool, want_reaction: bool) -> bool:
-        if not (want_bonus or want_reaction):
-            return True
-        if value is None:
-            return False
-        v = str(value).lower()
-        bonus_ok = ("bonus_action" in v) or ("bonus action" in v)
-        react_ok = "reaction" in v
-        # OR semantics: if both selected, accept spells with either Bonus OR Reaction
-        conds: List[bool] = []
-        if want_bonus:
-            conds.append(bonus_ok)
-        if want_reaction:
-            conds.append(react_ok)
-        return any(conds)
-
-    def level_in_bucket(level: Optional[int], bucket: str) -> bool:
-        if level is None:
-            return False
-        if bucket == "13":
-            return 1 <= level <= 3
-        if bucket == "45":
-            return 4 <= level <= 5
-        if bucket == "69":
-            return 6 <= level <= 9
-        return False
-
-    result: List[Dict[str, Any]] = []
-    for s in items:
-        if filters.get("ritual") is True and not s.get("ritual", False):
-            continue
-        if filters.get("is_concentration") is True and not s.get("is_concentration", False):
-            continue
-        # Casting time: prefer new set-based field, fallback to legacy booleans
-        ct_set = filters.get("casting_time")
-        legacy_cast = filters.get("cast", {})
-        want_bonus = (ct_set is not None and "ba" in ct_set) or (ct_set is None and legacy_cast.get("bonus", False))
-        want_react = (ct_set is not None and "re" in ct_set) or (ct_set is None and legacy_cast.get("reaction", False))
-        if not match_casting_time(s.get("casting_time"), want_bonus, want_react):
-            continue
-        # Level: new set-based field preferred; fallback to legacy single-range
-        level_buckets = filters.get("level_buckets")
-        if level_buckets:
-            if not any(level_in_bucket(s.get("level"), b) for b in level_buckets):
-                continue
-        else:
-            legacy = filters.get("level_range")
-            if legacy is not None and not level_in_bucket(s.get("level"), legacy):
-                continue
-        # School: OR within field
-        school_selected = filters.get("school")
-        if school_selected:
-            scode = s.get("school")
-            if scode is None or scode not in school_selected:
-                continue
-        # Classes: intersection non-empty
-        classes_selected = filters.get("classes")
-        if classes_selected:
-            spell_classes = set(s.get("classes") or [])
-            if not (spell_classes & set(classes_selected)):
-                continue
-        result.append(s)
-    return result
+_LEVEL_BUCKETS: Dict[str, List[int]] = {"13": [1, 2, 3], "45": [4, 5], "69": [6, 7, 8, 9]}
+# UI casting time codes -> normalized API values
+_CASTING_TIME_CODES: Dict[str, str] = {"ba": "bonus_action", "re": "reaction"}
 
 
+def _spells_query_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Applied filter state as `/spells/list/page` query parameters (OR within a field)."""
+    params: Dict[str, Any] = {}
+    if filters.get("ritual") is True:
+        params["ritual"] = True
+    if filters.get("is_concentration") is True:
+        params["is_concentration"] = True
+    # Casting time: prefer new set-based field, fallback to legacy booleans
+    ct_set = filters.get("casting_time")
+    if ct_set is None:
+        legacy_cast = filters.get("cast") or {}
+        ct_set = {c for c, key in (("ba", "bonus"), ("re", "reaction")) if legacy_cast.get(key)}
+    if ct_set:
+        params["casting_times"] = sorted(
+            _CASTING_TIME_CODES[c] for c in ct_set if c in _CASTING_TIME_CODES
+        )
+    # Level: new set-based field preferred; fallback to legacy single-range
+    level_buckets = filters.get("level_buckets") or (
+        {filters["level_range"]} if filters.get("level_range") is not None else None
+    )
+    if level_buckets:
+        params["levels"] = [lvl for b in sorted(level_buckets) for lvl in _LEVEL_BUCKETS.get(b, [])]
+    if filters.get("school"):
+        params["schools"] = sorted(filters["school"])
+    if filters.get("classes"):
+        params["classes"] = sorted(filters["classes"])
+    return params
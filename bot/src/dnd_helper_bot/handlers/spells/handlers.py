@@ -5,7 +5,7 @@ from typing import Any, Dict
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
-from dnd_helper_bot.repositories.api_client import api_get, api_get_one
+from dnd_helper_bot.repositories.api_client import api_get_one
 from dnd_helper_bot.utils.i18n import t
 
 from .filters import (
@@ -45,7 +45,7 @@ async def spell_detail(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             "spell_id": spell_id,
         },
     )
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     w = await api_get_one(f"/spells/{spell_id}/wrapped", params={"lang": lang})
     e: Dict[str, Any] = w.get("entity") or {}
     tdata: Dict[str, Any] = w.get("translation") or {}
@@ -84,16 +84,21 @@ async def spell_random(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "Spell random requested",
         extra={"correlation_id": query.message.chat_id if query and query.message else None},
     )
-    lang = await _resolve_lang_by_user(query)
-    wrapped_list = await api_get("/spells/list/wrapped", params={"lang": lang})
-    if not wrapped_list:
+    lang = await _resolve_lang_by_user(query, context)
+    # Not shared: concurrent users must not all get the same pick
+    result = await api_get_one(
+        "/spells/list/page",
+        params={"lang": lang, "order": "random", "limit": 1},
+        shared=False,
+    )
+    if not result.get("items"):
         logger.warning(
             "No spells available for random",
             extra={"correlation_id": query.message.chat_id if query and query.message else None},
         )
         await query.edit_message_text(await t("list.empty.spells", lang, default="Заклинаний нет."))
         return
-    w = __import__("random").choice(wrapped_list)
+    w = result["items"][0]
     e: Dict[str, Any] = w.get("entity") or {}
     tdata: Dict[str, Any] = w.get("translation") or {}
     labels: Dict[str, Any] = w.get("labels") or {}
@@ -126,7 +131,7 @@ async def spell_search_prompt(update: Update, context: ContextTypes.DEFAULT_TYPE
         "Spell search prompt shown",
         extra={"correlation_id": query.message.chat_id if query and query.message else None},
     )
-    lang = await _resolve_lang_by_user(query)
+    lang = await _resolve_lang_by_user(query, context)
     # Ensure default scope is set
     if not context.user_data.get("search_scope"):
         context.user_data["search_scope"] = "name"
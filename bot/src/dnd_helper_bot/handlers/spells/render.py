@@ -1,15 +1,20 @@
+import logging
 from typing import Any, Dict, List, Tuple
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
-from dnd_helper_bot.repositories.api_client import api_get
+from dnd_helper_bot.repositories.api_client import api_get_one
+from dnd_helper_bot.repositories.catalog import get_catalog
 from dnd_helper_bot.utils.i18n import t
-from dnd_helper_bot.utils.pagination import PAGE_SIZE_LIST, paginate
+from dnd_helper_bot.utils.pagination import PAGE_SIZE_LIST
+from dnd_helper_bot.utils.render_cache import freeze, freeze_rows, memoized, thaw_rows
 
-from .filters import _filter_spells, _get_filter_state
+from .filters import _get_filter_state, _spells_query_params
 from .lang import _resolve_lang_by_user
 
+logger = logging.getLogger(__name__)
+
 
 async def _nav_row(lang: str, back_callback: str) -> list[InlineKeyboardButton]:
     from dnd_helper_bot.utils.nav import build_nav_row
@@ -17,7 +22,7 @@ async def _nav_row(lang: str, back_callback: str) -> list[InlineKeyboardButton]:
     return await build_nav_row(lang, back_callback)
 
 
-async def _build_filters_header(applied: Dict[str, Any], lang: str, school_items: List[Tuple[str, str]]) -> str:
+async def _compose_filters_header(applied: Dict[str, Any], lang: str, school_items: List[Tuple[str, str]]) -> str:
     # Nothing applied → "All spells"
     has_any = False
     for f in ("level_buckets", "level_range", "school", "casting_time", "classes", "ritual", "is_concentration"):
@@ -94,70 +99,40 @@ async def _build_filters_header(applied: Dict[str, Any], lang: str, school_items
         parts.append(f"{field_name}: {', '.join(sorted(classes))}")
 
     return "; ".join(parts) if parts else (await t("list.all.spells", lang, default=("All spells" if lang == "en" else "Все заклинания")))
+
+
+async def _build_filters_header(
+    applied: Dict[str, Any], lang: str, school_items: List[Tuple[str, str]]
+) -> str:
+    return await memoized(
+        "spells:header",
+        lang,
+        (freeze(applied), tuple(school_items)),
+        lambda: _compose_filters_header(applied, lang, school_items),
+    )
+
+
+def _project_options(options: Dict[str, Any]) -> Dict[str, List[Tuple[str, str]]]:
+    """School and class options for the filters keyboard: (code, label), sorted by label."""
+    result: Dict[str, List[Tuple[str, str]]] = {}
+    for field in ("schools", "classes"):
+        items = options.get(field) or []
+        result[field] = [(str(o.get("code")), str(o.get("label") or o.get("code"))) for o in items]
+    return result
+
+
+async def load_spell_filter_options(lang: str) -> Dict[str, List[Tuple[str, str]]]:
+    return await get_catalog("/spells/list/options", lang, _project_options)
+
+
 async def render_spells_list(query, context: ContextTypes.DEFAULT_TYPE, page: int) -> None:
     context.user_data["spells_current_page"] = page
     pending, applied = _get_filter_state(context)
-    lang = await _resolve_lang_by_user(query)
-    wrapped_list: List[Dict[str, Any]] = await api_get("/spells/list/wrapped", params={"lang": lang})
-
-    all_spells: List[Dict[str, Any]] = []
-    school_options: Dict[str, str] = {}
-    classes_options: Dict[str, str] = {}
-    for w in wrapped_list:
-        e = (w.get("entity") or {})
-        tdata = (w.get("translation") or {})
-        labels = (w.get("labels") or {})
-        # collect school label mapping if available
-        school_label_obj = labels.get("school") or {}
-        school_code = school_label_obj.get("code") if isinstance(school_label_obj, dict) else (e.get("school"))
-        school_label = school_label_obj.get("label") if isinstance(school_label_obj, dict) else (school_code or "")
-        if school_code:
-            school_options[str(school_code)] = str(school_label or school_code)
-        # collect classes labels/codes
-        for c in (labels.get("classes") or []):
-            code = str(c.get("code"))
-            label = str(c.get("label") or code)
-            if code:
-                classes_options[code] = label
-        all_spells.append(
-            {
-                "id": e.get("id"),
-                "name": tdata.get("name") or "",
-                "description": tdata.get("description") or "",
-                "ritual": e.get("ritual"),
-                "is_concentration": e.get("is_concentration"),
-                "casting_time": e.get("casting_time"),
-                "level": e.get("level"),
-                "school": e.get("school"),
-                "classes": [str(c.get("code")) for c in (labels.get("classes") or []) if c.get("code") is not None],
-            }
-        )
-
-    filtered = _filter_spells(all_spells, applied)
-    total = len(filtered)
-    try:
-        import logging
-        logging.getLogger(__name__).info(
-            "Spells filtered",
-            extra={
-                "total": total,
-                "page": page,
-                "visible_fields": list(pending.get("visible_fields") or []),
-                "selected": {
-                    "level_buckets": list(pending.get("level_buckets") or []),
-                    "school": list(pending.get("school") or []),
-                    "casting_time": list(pending.get("casting_time") or []),
-                    "classes": list(pending.get("classes") or []),
-                    "ritual": pending.get("ritual"),
-                    "is_concentration": pending.get("is_concentration"),
-                },
-            },
-        )
-    except Exception:
-        pass
+    lang = await _resolve_lang_by_user(query, context)
+    options = await load_spell_filter_options(lang)
     rows: List[List[InlineKeyboardButton]] = []
-    school_items_sorted = sorted(school_options.items(), key=lambda x: x[1].lower())
-    classes_items_sorted = sorted(classes_options.items(), key=lambda x: x[1].lower())
+    school_items_sorted = options["schools"]
+    classes_items_sorted = options["classes"]
     # Manage view: only filters UI, no entities
     add_menu_open = bool(context.user_data.get("spells_add_menu_open"))
     if add_menu_open:
@@ -195,6 +170,31 @@ async def render_spells_list(query, context: ContextTypes.DEFAULT_TYPE, page: in
     top_label = await t("filters.change", lang) if _has_any_filters(applied) else await t("filters.add", lang)
     rows.append([InlineKeyboardButton(top_label, callback_data="sflt:add")])
 
+    # Only the current page is requested; filtering happens in the API
+    params = {
+        **_spells_query_params(applied),
+        "lang": lang,
+        "limit": PAGE_SIZE_LIST,
+        "offset": (page - 1) * PAGE_SIZE_LIST,
+    }
+    result = await api_get_one("/spells/list/page", params=params)
+    total = int(result.get("total") or 0)
+    logger.info(
+        "Spells filtered",
+        extra={
+            "total": total,
+            "page": page,
+            "visible_fields": list(pending.get("visible_fields") or []),
+            "selected": {
+                "level_buckets": list(pending.get("level_buckets") or []),
+                "school": list(pending.get("school") or []),
+                "casting_time": list(pending.get("casting_time") or []),
+                "classes": list(pending.get("classes") or []),
+                "ritual": pending.get("ritual"),
+                "is_concentration": pending.get("is_concentration"),
+            },
+        },
+    )
     if total == 0:
         markup = InlineKeyboardMarkup(rows)
         await query.edit_message_text(
@@ -202,10 +202,10 @@ async def render_spells_list(query, context: ContextTypes.DEFAULT_TYPE, page: in
             reply_markup=markup,
         )
         return
-    page_items = paginate(filtered, page, PAGE_SIZE_LIST)
-    for s in page_items:
-        label = s.get("name", "")
-        rows.append([InlineKeyboardButton(label, callback_data=f"spell:detail:{s['id']}")])
+    for w in result.get("items") or []:
+        e = w.get("entity") or {}
+        label = str((w.get("translation") or {}).get("name") or "")
+        rows.append([InlineKeyboardButton(label, callback_data=f"spell:detail:{e.get('id')}")])
     nav: List[InlineKeyboardButton] = []
     if (page - 1) * PAGE_SIZE_LIST > 0:
         nav.append(InlineKeyboardButton("⬅️", callback_data=f"spell:list:page:{page-1}"))
@@ -221,7 +221,7 @@ async def render_spells_list(query, context: ContextTypes.DEFAULT_TYPE, page: in
     await query.edit_message_text(header + suffix, reply_markup=markup)
 
 
-async def _build_filters_keyboard(
+async def _compose_filters_keyboard(
     pending: Dict[str, Any],
     lang: str,
     school_items: List[Tuple[str, str]],
@@ -353,3 +353,23 @@ async def _build_filters_keyboard(
     return rows
 
 
+async def _build_filters_keyboard(
+    pending: Dict[str, Any],
+    lang: str,
+    school_items: List[Tuple[str, str]],
+    classes_items: List[Tuple[str, str]],
+) -> List[List[InlineKeyboardButton]]:
+    """Cached `_compose_filters_keyboard`; returns fresh row lists callers may extend."""
+
+    async def build() -> Tuple[Tuple[InlineKeyboardButton, ...], ...]:
+        return freeze_rows(
+            await _compose_filters_keyboard(pending, lang, school_items, classes_items)
+        )
+
+    rows = await memoized(
+        "spells:keyboard",
+        lang,
+        (freeze(pending), tuple(school_items), tuple(classes_items)),
+        build,
+    )
+    return thaw_rows(rows)
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 
+from redis.asyncio import Redis
 from telegram.ext import (
     ApplicationBuilder,
     CallbackQueryHandler,
@@ -35,6 +36,22 @@ from dnd_helper_bot.handlers.spells import (
     spells_list,
 )
 from dnd_helper_bot.logging_config import configure_logging
+from dnd_helper_bot.repositories.api_client import (
+    HTTP_STATS_SECONDS,
+    close_client,
+    log_pool_stats,
+    start_client,
+)
+from dnd_helper_bot.repositories.persistence import RedisPersistence
+from dnd_helper_bot.updates import ChatOrderedUpdateProcessor
+from dnd_helper_bot.utils.i18n import I18N_REFRESH_SECONDS, preload, refresh_periodically
+from dnd_helper_bot.webhook import run_webhook
+
+# "polling" (default) or "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling").strip().lower()
+# Updates handled at the same time; the updates of one chat still run one by one.
+# Kept below BOT_HTTP_MAX_CONNECTIONS so handlers rarely wait for a connection; 1 is sequential.
+CONCURRENT_UPDATES = max(1, int(os.getenv("BOT_CONCURRENT_UPDATES", "16")))
 
 
 async def _on_error(update, context) -> None:
@@ -51,6 +68,35 @@ async def _on_error(update, context) -> None:
             pass
 
 
+async def _log_pool_stats_periodically() -> None:
+    while True:
+        await asyncio.sleep(HTTP_STATS_SECONDS)
+        log_pool_stats()
+
+
+async def _post_init(application) -> None:
+    """Open the shared API client and load UI texts before the first update is handled."""
+    await start_client()
+    await preload()
+    if HTTP_STATS_SECONDS > 0:
+        application.bot_data["_pool_stats_task"] = asyncio.create_task(
+            _log_pool_stats_periodically()
+        )
+    if I18N_REFRESH_SECONDS > 0:
+        application.bot_data["_i18n_refresh_task"] = asyncio.create_task(refresh_periodically())
+
+
+async def _post_shutdown(application) -> None:
+    for name in ("_pool_stats_task", "_i18n_refresh_task"):
+        task = application.bot_data.pop(name, None)
+        if task is not None:
+            task.cancel()
+    await close_client()
+    # Runs after the application wrote its last state to the persistence
+    if isinstance(application.persistence, RedisPersistence):
+        await application.persistence.close()
+
+
 def main() -> None:
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     if not token:
@@ -58,7 +104,16 @@ def main() -> None:
 
     configure_logging(service_name=os.getenv("LOG_SERVICE_NAME", "bot"))
 
-    application = ApplicationBuilder().token(token).build()
+    builder = (
+        ApplicationBuilder().token(token).post_init(_post_init).post_shutdown(_post_shutdown)
+    )
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        # user_data survives restarts; without Redis it lives in process memory only
+        builder = builder.persistence(RedisPersistence(Redis.from_url(redis_url)))
+    if CONCURRENT_UPDATES > 1:
+        builder = builder.concurrent_updates(ChatOrderedUpdateProcessor(CONCURRENT_UPDATES))
+    application = builder.build()
 
     # Register global error handler
     application.add_error_handler(_on_error)
@@ -93,10 +148,13 @@ def main() -> None:
         CallbackQueryHandler(show_main_menu_from_callback, pattern=r"^menu:main$")
     )
 
-    application.run_polling()
+    if BOT_MODE == "webhook":
+        asyncio.run(run_webhook(application))
+    else:
+        application.run_polling()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
 
 
@@ -1,31 +1,168 @@
+"""HTTP access to the DnD Helper API.
+
+All calls share one `httpx.AsyncClient` with keep-alive connection pooling. It
+is opened on application startup (`start_client`), closed on shutdown
+(`close_client`) and created lazily on first use when neither ran (tests,
+scripts). `pool_stats()` reports request counters and pool occupancy for tuning
+`BOT_HTTP_*`.
+
+`api_get`/`api_get_one` are single-flight: concurrent calls with the same path
+and params (the language included) share one request and its parsed body.
+With `BOT_HTTP_GET_TTL` > 0 the body is also reused for that many seconds.
+Shared bodies are returned to every caller as the same object, so callers must
+not mutate them. Responses that differ per call (random picks) pass
+`shared=False`. Writes drop the reusable bodies and detach the GETs in flight
+(before and after the write request), so a read started after a write never
+joins or stores a body fetched before it. `coalesced` and `ttl_hits` in
+`pool_stats()` count the calls that did not send their own request.
+"""
+
+import asyncio
+import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://api:8000")
 logger = logging.getLogger(__name__)
 
+HTTP_MAX_CONNECTIONS = max(1, int(os.getenv("BOT_HTTP_MAX_CONNECTIONS", "20")))
+HTTP_MAX_KEEPALIVE = max(0, int(os.getenv("BOT_HTTP_MAX_KEEPALIVE", "10")))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("BOT_HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("BOT_HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("BOT_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("BOT_HTTP_POOL_TIMEOUT", "5"))
+HTTP2 = os.getenv("BOT_HTTP2", "false").lower() in {"1", "true", "yes"}
+# Interval of the pool stats log line; 0 disables
+HTTP_STATS_SECONDS = float(os.getenv("BOT_HTTP_STATS_SECONDS", "300"))
+# Reuse of GET bodies after the shared request completed; 0 disables
+HTTP_GET_TTL = float(os.getenv("BOT_HTTP_GET_TTL", "0"))
+HTTP_GET_CACHE_SIZE = max(1, int(os.getenv("BOT_HTTP_GET_CACHE_SIZE", "1000")))
+
+_client: Optional[httpx.AsyncClient] = None
+_stats: Dict[str, int] = {
+    "requests": 0,
+    "errors": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "coalesced": 0,
+    "ttl_hits": 0,
+}
+
+GetKey = Tuple[str, str]
+_gets_in_flight: Dict[GetKey, "asyncio.Task[Any]"] = {}
+# { (path, params): (stored_at, body) }, least recently used first
+_get_results: "OrderedDict[GetKey, Tuple[float, Any]]" = OrderedDict()
+# Bumped by writes; a GET started under an older generation does not store its body
+_get_generation = 0
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = HTTP2 and _http2_available()
+    if HTTP2 and not http2:
+        logger.warning("BOT_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1")
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT, pool=HTTP_POOL_TIMEOUT),
+    )
+
+
+async def start_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+        logger.info("API client started for %s", API_BASE_URL)
+    return _client
 
-def _build_headers(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
-    headers: Dict[str, str] = {}
-    if params and isinstance(params.get("lang"), str):
-        v = str(params["lang"]).strip().lower()
-        if v in {"ru", "en"}:
-            headers["Accept-Language"] = v
-    return headers
 
+async def close_client() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None and not client.is_closed:
+        log_pool_stats(client)
+        await client.aclose()
 
-async def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+
+def pool_stats(client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """Request counters plus open/idle connections of the shared pool."""
+    client = client or _client
+    stats: Dict[str, Any] = dict(_stats)
+    # httpcore does not expose pool metrics publicly; read them defensively
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+    stats["max_connections"] = HTTP_MAX_CONNECTIONS
+    stats["max_keepalive"] = HTTP_MAX_KEEPALIVE
+    return stats
+
+
+def log_pool_stats(client: Optional[httpx.AsyncClient] = None) -> None:
+    stats = pool_stats(client)
+    logger.info("API client pool: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+async def _request(
+    method: str,
+    path: str,
+    label: str,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    log_error_body: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
     url = f"{API_BASE_URL}{path}"
-    logger.info("API GET", extra={"url": url})
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.get(url, params=params or {}, headers=_build_headers(params))
-        logger.info("API GET response", extra={"url": url, "status_code": resp.status_code})
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as exc:
+    logger.info(label, extra={"url": url})
+    _stats["requests"] += 1
+    _stats["in_flight"] += 1
+    _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    try:
+        resp = await get_client().request(
+            method,
+            path,
+            params=params if method == "GET" else None,
+            json=json,
+            headers={**_build_headers(params), **(headers or {})},
+        )
+    except httpx.HTTPError:
+        _stats["errors"] += 1
+        raise
+    finally:
+        _stats["in_flight"] -= 1
+    logger.info(f"{label} response", extra={"url": url, "status_code": resp.status_code})
+    if resp.status_code == httpx.codes.NOT_MODIFIED:
+        # Only sent in reply to conditional requests; the caller keeps its copy
+        return resp
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError:
+        _stats["errors"] += 1
+        if log_error_body:
             # Log response body to aid debugging (422 details, etc.)
             body_text = None
             try:
@@ -33,60 +170,122 @@ async def api_get(path: str, params: Optional[Dict[str, Any]] = None) -> List[Di
             except Exception:
                 body_text = None
             logger.error(
-                "API GET error",
+                f"{label} error",
                 extra={
                     "url": url,
                     "status_code": resp.status_code,
                     "response_body": (body_text if body_text is not None else "<unavailable>"),
                 },
             )
-            raise exc
-        return resp.json()
+        raise
+    return resp
 
 
-async def api_get_one(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    url = f"{API_BASE_URL}{path}"
-    logger.info("API GET ONE", extra={"url": url})
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.get(url, params=params or {}, headers=_build_headers(params))
-        logger.info("API GET ONE response", extra={"url": url, "status_code": resp.status_code})
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as exc:
-            body_text = None
-            try:
-                body_text = resp.text
-            except Exception:
-                body_text = None
-            logger.error(
-                "API GET ONE error",
-                extra={
-                    "url": url,
-                    "status_code": resp.status_code,
-                    "response_body": (body_text if body_text is not None else "<unavailable>"),
-                },
-            )
-            raise exc
-        return resp.json()
+def _build_headers(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if params and isinstance(params.get("lang"), str):
+        v = str(params["lang"]).strip().lower()
+        if v in {"ru", "en"}:
+            headers["Accept-Language"] = v
+    return headers
 
 
-async def api_post(path: str, json: Dict[str, Any]) -> Dict[str, Any]:
-    url = f"{API_BASE_URL}{path}"
-    logger.info("API POST", extra={"url": url})
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.post(url, json=json)
-        logger.info("API POST response", extra={"url": url, "status_code": resp.status_code})
-        resp.raise_for_status()
+def _get_key(path: str, params: Dict[str, Any]) -> GetKey:
+    return path, json.dumps(params, sort_keys=True, default=str)
+
+
+async def _fetch_json(key: GetKey, path: str, label: str, params: Dict[str, Any]) -> Any:
+    generation = _get_generation
+    resp = await _request("GET", path, label, params=params, log_error_body=True)
+    body = resp.json()
+    if HTTP_GET_TTL > 0 and generation == _get_generation:
+        _get_results[key] = (time.monotonic(), body)
+        _get_results.move_to_end(key)
+        while len(_get_results) > HTTP_GET_CACHE_SIZE:
+            _get_results.popitem(last=False)
+    return body
+
+
+def _get_finished(key: GetKey, task: "asyncio.Task[Any]") -> None:
+    if _gets_in_flight.get(key) is task:
+        del _gets_in_flight[key]
+
+
+async def _shared_get(path: str, label: str, params: Optional[Dict[str, Any]]) -> Any:
+    params = params or {}
+    key = _get_key(path, params)
+    cached = _get_results.get(key)
+    if cached is not None:
+        if time.monotonic() - cached[0] < HTTP_GET_TTL:
+            _stats["ttl_hits"] += 1
+            return cached[1]
+        del _get_results[key]
+    task = _gets_in_flight.get(key)
+    # A finished task may still be registered until its done callback runs
+    if task is None or task.done():
+        task = asyncio.ensure_future(_fetch_json(key, path, label, params))
+        task.add_done_callback(lambda done: _get_finished(key, done))
+        _gets_in_flight[key] = task
+    else:
+        _stats["coalesced"] += 1
+    # Shield: a cancelled handler must not cancel the request other handlers wait on
+    return await asyncio.shield(task)
+
+
+def clear_get_cache() -> None:
+    """Forget reusable and in-flight GET bodies; callers already waiting keep theirs."""
+    global _get_generation
+    _get_generation += 1
+    _gets_in_flight.clear()
+    _get_results.clear()
+
+
+async def api_get(
+    path: str, params: Optional[Dict[str, Any]] = None, shared: bool = True
+) -> List[Dict[str, Any]]:
+    if not shared:
+        resp = await _request("GET", path, "API GET", params=params or {}, log_error_body=True)
         return resp.json()
+    return await _shared_get(path, "API GET", params)
 
 
-async def api_patch(path: str, json: Dict[str, Any]) -> Dict[str, Any]:
-    url = f"{API_BASE_URL}{path}"
-    logger.info("API PATCH", extra={"url": url})
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.patch(url, json=json)
-        logger.info("API PATCH response", extra={"url": url, "status_code": resp.status_code})
-        resp.raise_for_status()
+async def api_get_one(
+    path: str, params: Optional[Dict[str, Any]] = None, shared: bool = True
+) -> Dict[str, Any]:
+    """Single JSON object; `shared=False` for responses that differ per call (random picks)."""
+    if not shared:
+        resp = await _request("GET", path, "API GET ONE", params=params or {}, log_error_body=True)
         return resp.json()
+    return await _shared_get(path, "API GET ONE", params)
+
+
+async def api_get_if_changed(
+    path: str, params: Optional[Dict[str, Any]] = None, etag: Optional[str] = None
+) -> Tuple[Optional[Any], httpx.Headers]:
+    """Conditional GET: (body, headers), body is None when `etag` is still current."""
+    headers = {"If-None-Match": etag} if etag else None
+    resp = await _request(
+        "GET", path, "API GET IF CHANGED", params=params or {}, log_error_body=True, headers=headers
+    )
+    if resp.status_code == httpx.codes.NOT_MODIFIED:
+        return None, resp.headers
+    return resp.json(), resp.headers
+
+
+async def _write(method: str, path: str, label: str, json: Dict[str, Any]) -> Dict[str, Any]:
+    # Reused and in-flight GET bodies may predate the write; GETs sent while it
+    # runs may too, so detach them again once it is done
+    clear_get_cache()
+    try:
+        resp = await _request(method, path, label, json=json)
+    finally:
+        clear_get_cache()
+    return resp.json()
 
 
+async def api_post(path: str, json: Dict[str, Any]) -> Dict[str, Any]:
+    return await _write("POST", path, "API POST", json)
+
+
+async def api_patch(path: str, json: Dict[str, Any]) -> Dict[str, Any]:
+    return await _write("PATCH", path, "API PATCH", json)
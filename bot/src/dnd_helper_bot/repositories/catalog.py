@@ -0,0 +1,98 @@
+"""Per-language catalog cache for list navigation.
+
+List renderers and the random pickers need the whole monster/spell catalog, but
+only a compact projection of it. `get_catalog(path, lang, project)` keeps that
+projection per (path, lang) in process memory with stale-while-revalidate
+semantics:
+
+- the first call downloads the wrapped list; concurrent callers share the request;
+- later calls return the cached projection immediately. Once it is older than
+  `BOT_CATALOG_REVALIDATE_SECONDS`, a background task revalidates it with
+  `If-None-Match`. The API answers 304 while the catalog version is unchanged;
+  otherwise the new projection replaces the old one;
+- when revalidation fails the stale copy keeps being served and the next call
+  retries.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dnd_helper_bot.repositories.api_client import api_get_if_changed
+
+logger = logging.getLogger(__name__)
+
+CATALOG_REVALIDATE_SECONDS = float(os.getenv("BOT_CATALOG_REVALIDATE_SECONDS", "60"))
+
+Project = Callable[[Any], Any]
+
+
+@dataclass
+class _Entry:
+    data: Any
+    etag: Optional[str]
+    version: Optional[str]
+    checked_at: float
+
+
+_entries: Dict[Tuple[str, str], _Entry] = {}
+# Initial loads and revalidations in flight, at most one per key
+_loading: Dict[Tuple[str, str], "asyncio.Task[_Entry]"] = {}
+
+
+async def _load(key: Tuple[str, str], project: Project) -> _Entry:
+    path, lang = key
+    entry = _entries.get(key)
+    body, headers = await api_get_if_changed(
+        path, params={"lang": lang}, etag=entry.etag if entry is not None else None
+    )
+    now = time.monotonic()
+    if body is None and entry is not None:
+        entry.checked_at = now
+        return entry
+    entry = _Entry(
+        data=project(body or []),
+        etag=headers.get("etag"),
+        version=headers.get("x-catalog-version"),
+        checked_at=now,
+    )
+    _entries[key] = entry
+    logger.info(f"Catalog {path} [{lang}] loaded at version {entry.version}")
+    return entry
+
+
+def _finished(key: Tuple[str, str], task: "asyncio.Task[_Entry]") -> None:
+    if _loading.get(key) is task:
+        del _loading[key]
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Catalog {key[0]} [{key[1]}] refresh failed: {task.exception()!r}")
+
+
+def _start(key: Tuple[str, str], project: Project) -> "asyncio.Task[_Entry]":
+    task = _loading.get(key)
+    # A finished task may still be registered until its done callback runs
+    if task is None or task.done():
+        task = asyncio.ensure_future(_load(key, project))
+        task.add_done_callback(lambda done: _finished(key, done))
+        _loading[key] = task
+    return task
+
+
+async def get_catalog(path: str, lang: str, project: Project) -> Any:
+    """Projection of the list at `path` in `lang`; waits only when nothing is cached yet."""
+    key = (path, lang)
+    entry = _entries.get(key)
+    if entry is None:
+        # Shield: a cancelled handler must not cancel the load other handlers wait on
+        return (await asyncio.shield(_start(key, project))).data
+    if time.monotonic() - entry.checked_at >= CATALOG_REVALIDATE_SECONDS:
+        _start(key, project)
+    return entry.data
+
+
+def clear_catalog() -> None:
+    _entries.clear()
+    _loading.clear()
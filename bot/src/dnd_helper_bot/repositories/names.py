@@ -0,0 +1,71 @@
+"""Display names of monsters and spells, shared by all users of the process.
+
+Search sessions keep only result ids (see `handlers.search`). The buttons of a
+results page need names; they come from this TTL+LRU map keyed by
+(kind, lang, id). It is filled from every search response, and ids missing from
+it are fetched in one request to `/{kind}/list/page?ids=...`.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from dnd_helper_bot.repositories.api_client import api_get_one
+
+NAME_CACHE_TTL = float(os.getenv("BOT_NAME_CACHE_TTL", "3600"))
+NAME_CACHE_SIZE = max(1, int(os.getenv("BOT_NAME_CACHE_SIZE", "20000")))
+
+NameKey = Tuple[str, str, int]
+# { (kind, lang, id): (stored_at, name) }, least recently used first
+_names: "OrderedDict[NameKey, Tuple[float, str]]" = OrderedDict()
+
+
+def _label(item: Dict[str, Any]) -> str:
+    tr = item.get("translation") or {}
+    return str(tr.get("name") or tr.get("description") or "<no name>")
+
+
+def remember_names(kind: str, lang: str, items: Iterable[Dict[str, Any]]) -> List[int]:
+    """Cache the names of wrapped `items`; returns their ids in order."""
+    now = time.monotonic()
+    ids: List[int] = []
+    for item in items:
+        entity_id = (item.get("entity") or {}).get("id")
+        if entity_id is None:
+            continue
+        key = (kind, lang, int(entity_id))
+        _names[key] = (now, _label(item))
+        _names.move_to_end(key)
+        ids.append(int(entity_id))
+    while len(_names) > NAME_CACHE_SIZE:
+        _names.popitem(last=False)
+    return ids
+
+
+async def get_names(kind: str, lang: str, ids: Sequence[int]) -> Dict[int, str]:
+    """Names of `ids` in `lang`; ids that no longer exist are left out."""
+    now = time.monotonic()
+    names: Dict[int, str] = {}
+    missing: List[int] = []
+    for entity_id in ids:
+        entry = _names.get((kind, lang, entity_id))
+        if entry is not None and now - entry[0] < NAME_CACHE_TTL:
+            _names.move_to_end((kind, lang, entity_id))
+            names[entity_id] = entry[1]
+        else:
+            missing.append(entity_id)
+    if missing:
+        page = await api_get_one(
+            f"/{kind}/list/page", params={"lang": lang, "ids": missing, "limit": len(missing)}
+        )
+        remember_names(kind, lang, page.get("items") or [])
+        for entity_id in missing:
+            entry = _names.get((kind, lang, entity_id))
+            if entry is not None:
+                names[entity_id] = entry[1]
+    return names
+
+
+def clear_names() -> None:
+    _names.clear()
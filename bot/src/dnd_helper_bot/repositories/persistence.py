@@ -0,0 +1,242 @@
+"""Redis persistence for `context.user_data` and conversation states.
+
+Enabled when `REDIS_URL` is set (see `main.py`). Without it the bot keeps the
+python-telegram-bot default: state in process memory, lost on restart.
+
+- Loading is lazy. Nothing is read on startup; a user's data is read from Redis
+  by `refresh_user_data`, which runs before each update of that user is handled.
+- Values are JSON with sets tagged, compressed with zlib above
+  `BOT_STATE_COMPRESS_BYTES`.
+- Keys in `EPHEMERAL_KEYS` (search results and prompts) live in a separate Redis
+  key that expires after `BOT_STATE_EPHEMERAL_TTL`; the rest expires after
+  `BOT_STATE_TTL` without activity.
+- Writes are write-behind: the application hands over changed users every
+  `BOT_STATE_FLUSH_SECONDS`, and one run is written with a single pipeline.
+- Users idle for `BOT_STATE_IDLE_SECONDS` are evicted from memory after their
+  data was written, so memory stays bounded by the active users. Their next
+  update reloads the data.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from telegram.ext import BasePersistence, PersistenceInput
+
+logger = logging.getLogger(__name__)
+
+STATE_TTL = int(os.getenv("BOT_STATE_TTL", str(30 * 24 * 3600)))
+STATE_EPHEMERAL_TTL = int(os.getenv("BOT_STATE_EPHEMERAL_TTL", "3600"))
+STATE_FLUSH_SECONDS = float(os.getenv("BOT_STATE_FLUSH_SECONDS", "10"))
+STATE_IDLE_SECONDS = float(os.getenv("BOT_STATE_IDLE_SECONDS", "900"))
+STATE_COMPRESS_BYTES = int(os.getenv("BOT_STATE_COMPRESS_BYTES", "512"))
+STATE_PREFIX = os.getenv("BOT_STATE_PREFIX", "dnd_bot")
+
+# Transient search/prompt state; losing it only resets the current search
+EPHEMERAL_KEYS = frozenset(
+    {
+        "search_session",
+        "search_current_page",
+        "search_active",
+        "search_message_id",
+        "search_mode_target",
+        "awaiting_monster_query",
+        "awaiting_spell_query",
+    }
+)
+
+_RAW = b"j"
+_ZLIB = b"z"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=str)}
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+
+def _object_hook(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and "__set__" in value:
+        return set(value["__set__"])
+    return value
+
+
+def dumps(value: Any) -> bytes:
+    raw = json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False)
+    data = raw.encode("utf-8")
+    if len(data) > STATE_COMPRESS_BYTES:
+        return _ZLIB + zlib.compress(data)
+    return _RAW + data
+
+
+def loads(data: Optional[bytes]) -> Any:
+    if not data:
+        return None
+    body = zlib.decompress(data[1:]) if data[:1] == _ZLIB else data[1:]
+    return json.loads(body, object_hook=_object_hook)
+
+
+class RedisPersistence(BasePersistence[Dict[str, Any], Dict[str, Any], Dict[str, Any]]):
+    """`BasePersistence` storing user data and conversations in Redis."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str = STATE_PREFIX,
+        update_interval: float = STATE_FLUSH_SECONDS,
+        idle_seconds: float = STATE_IDLE_SECONDS,
+    ) -> None:
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, callback_data=False),
+            update_interval=update_interval,
+        )
+        self._redis = redis
+        self._prefix = prefix
+        # A user is evicted only after a flush run had the chance to write their data
+        self._idle_seconds = max(idle_seconds, 2 * update_interval)
+        # The application's user_data dicts of loaded users and when they were last used
+        self._live: Dict[int, Dict[str, Any]] = {}
+        self._last_seen: Dict[int, float] = {}
+        self._last_sweep = time.monotonic()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._writer: Optional["asyncio.Task[None]"] = None
+
+    def _user_keys(self, user_id: int) -> Tuple[str, str]:
+        base = f"{self._prefix}:user:{user_id}"
+        return base, f"{base}:eph"
+
+    async def _read_user(self, user_id: int) -> Dict[str, Any]:
+        durable, ephemeral = await self._redis.mget(self._user_keys(user_id))
+        return {**(loads(durable) or {}), **(loads(ephemeral) or {})}
+
+    def _evict_idle(self, now: float) -> None:
+        self._last_sweep = now
+        evicted = 0
+        for user_id, seen in list(self._last_seen.items()):
+            if now - seen < self._idle_seconds or user_id in self._pending:
+                continue
+            del self._last_seen[user_id]
+            data = self._live.pop(user_id, None)
+            if data is not None:
+                # Keep the (empty) dict the application holds; refresh reloads it
+                data.clear()
+                evicted += 1
+        if evicted:
+            logger.info(f"Bot state: evicted {evicted} idle users, {len(self._live)} in memory")
+
+    async def _write_batches(self) -> None:
+        # Updates arriving while a batch is written join the next loop iteration
+        await asyncio.sleep(0)
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            pipe = self._redis.pipeline(transaction=False)
+            for user_id, data in batch.items():
+                durable_key, ephemeral_key = self._user_keys(user_id)
+                durable = {k: v for k, v in data.items() if k not in EPHEMERAL_KEYS}
+                ephemeral = {k: v for k, v in data.items() if k in EPHEMERAL_KEYS}
+                for key, part, ttl in (
+                    (durable_key, durable, STATE_TTL),
+                    (ephemeral_key, ephemeral, STATE_EPHEMERAL_TTL),
+                ):
+                    if part:
+                        pipe.set(key, dumps(part), ex=ttl)
+                    else:
+                        pipe.delete(key)
+            try:
+                await pipe.execute()
+            except Exception:
+                # Keep the batch for the next run unless newer data arrived meanwhile
+                self._pending = {**batch, **self._pending}
+                raise
+        now = time.monotonic()
+        if now - self._last_sweep >= self.update_interval:
+            self._evict_idle(now)
+
+    async def get_user_data(self) -> Dict[int, Dict[str, Any]]:
+        return {}
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        self._last_seen[user_id] = now
+        if self._live.get(user_id) is not user_data:
+            stored = await self._read_user(user_id)
+            for key, value in stored.items():
+                user_data.setdefault(key, value)
+            self._live[user_id] = user_data
+        if now - self._last_sweep >= self.update_interval:
+            self._evict_idle(now)
+
+    async def update_user_data(self, user_id: int, data: Dict[str, Any]) -> None:
+        if user_id not in self._live:
+            # Changed without being loaded (e.g. by a job): keep what Redis already has
+            if not data:
+                return
+            data = {**await self._read_user(user_id), **data}
+        self._pending[user_id] = data
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_batches())
+        await asyncio.shield(self._writer)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._pending.pop(user_id, None)
+        self._live.pop(user_id, None)
+        self._last_seen.pop(user_id, None)
+        await self._redis.delete(*self._user_keys(user_id))
+
+    async def get_conversations(self, name: str) -> Dict[Tuple[Any, ...], object]:
+        stored = await self._redis.hgetall(f"{self._prefix}:conv:{name}")
+        return {
+            tuple(json.loads(key)): loads(value) for key, value in (stored or {}).items()
+        }
+
+    async def update_conversation(
+        self, name: str, key: Tuple[Any, ...], new_state: Optional[object]
+    ) -> None:
+        field = json.dumps(list(key), separators=(",", ":"))
+        if new_state is None:
+            await self._redis.hdel(f"{self._prefix}:conv:{name}", field)
+        else:
+            await self._redis.hset(f"{self._prefix}:conv:{name}", field, dumps(new_state))
+
+    async def flush(self) -> None:
+        if self._pending:
+            if self._writer is None or self._writer.done():
+                self._writer = asyncio.ensure_future(self._write_batches())
+            await self._writer
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    # Chat data, bot data and callback data are not persisted (see store_data)
+
+    async def get_chat_data(self) -> Dict[int, Dict[str, Any]]:
+        return {}
+
+    async def get_bot_data(self) -> Dict[str, Any]:
+        return {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def update_chat_data(self, chat_id: int, data: Dict[str, Any]) -> None:
+        return None
+
+    async def update_bot_data(self, data: Dict[str, Any]) -> None:
+        return None
+
+    async def update_callback_data(self, data: Any) -> None:
+        return None
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        return None
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[str, Any]) -> None:
+        return None
+
+    async def refresh_bot_data(self, bot_data: Dict[str, Any]) -> None:
+        return None
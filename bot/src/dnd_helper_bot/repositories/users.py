@@ -0,0 +1,162 @@
+"""Cached user profiles (`/users/by-telegram/{id}`).
+
+Handlers need the user's language on nearly every update. Profiles are kept in a
+process-wide TTL+LRU map keyed by telegram id and mirrored in
+`context.user_data["user_profile"]`, so a lookup normally needs no request.
+Concurrent misses for one id share a single request. A 404 (unregistered user)
+is remembered for `BOT_USER_MISSING_TTL` seconds and raised as `UserNotFound`
+without a request. Writers call `store_user` (or `invalidate_user`) after
+changing a profile, which also drops the negative entry.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional, Tuple
+
+import httpx
+
+from dnd_helper_bot.repositories.api_client import api_get_one
+
+USER_CACHE_TTL = float(os.getenv("BOT_USER_CACHE_TTL", "300"))
+USER_CACHE_SIZE = max(1, int(os.getenv("BOT_USER_CACHE_SIZE", "10000")))
+USER_MISSING_TTL = float(os.getenv("BOT_USER_MISSING_TTL", "30"))
+USER_DATA_KEY = "user_profile"
+
+Fetch = Callable[..., Awaitable[Dict[str, Any]]]
+
+# { telegram_id: (stored_at, profile) }, least recently used first
+_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_inflight: Dict[int, "asyncio.Task[Dict[str, Any]]"] = {}
+# { telegram_id: stored_at } of ids the API answered 404 for
+_missing: "OrderedDict[int, float]" = OrderedDict()
+
+
+class UserNotFound(LookupError):
+    """The API has no user with this telegram id."""
+
+
+def _known_missing(tg_id: int) -> bool:
+    stored_at = _missing.get(tg_id)
+    if stored_at is None:
+        return False
+    if time.time() - stored_at < USER_MISSING_TTL:
+        return True
+    del _missing[tg_id]
+    return False
+
+
+def _remember_missing(tg_id: int) -> None:
+    _missing[tg_id] = time.time()
+    _missing.move_to_end(tg_id)
+    while len(_missing) > USER_CACHE_SIZE:
+        _missing.popitem(last=False)
+
+
+def _fresh(stored_at: Any) -> bool:
+    return isinstance(stored_at, (int, float)) and time.time() - stored_at < USER_CACHE_TTL
+
+
+def _remember(tg_id: int, stored_at: float, user: Dict[str, Any]) -> None:
+    _cache[tg_id] = (stored_at, user)
+    _cache.move_to_end(tg_id)
+    while len(_cache) > USER_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def _mirror(user_data: Optional[MutableMapping[str, Any]], stored_at: float, user: Dict) -> None:
+    if user_data is not None:
+        user_data[USER_DATA_KEY] = {"stored_at": stored_at, "user": user}
+
+
+def cached_user(
+    tg_id: int, user_data: Optional[MutableMapping[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Fresh cached profile or None; never calls the API."""
+    entry = _cache.get(tg_id)
+    if entry is not None:
+        if _fresh(entry[0]):
+            _cache.move_to_end(tg_id)
+            _mirror(user_data, *entry)
+            return entry[1]
+        del _cache[tg_id]
+    mirrored = user_data.get(USER_DATA_KEY) if user_data is not None else None
+    if isinstance(mirrored, dict) and isinstance(mirrored.get("user"), dict):
+        if _fresh(mirrored.get("stored_at")):
+            _remember(tg_id, mirrored["stored_at"], mirrored["user"])
+            return mirrored["user"]
+        user_data.pop(USER_DATA_KEY, None)
+    return None
+
+
+def store_user(
+    tg_id: int, user: Dict[str, Any], user_data: Optional[MutableMapping[str, Any]] = None
+) -> None:
+    """Replace the cached profile, e.g. with the response of a write."""
+    # A lookup started before the write must not overwrite it when it completes
+    _inflight.pop(tg_id, None)
+    _missing.pop(tg_id, None)
+    stored_at = time.time()
+    _remember(tg_id, stored_at, user)
+    _mirror(user_data, stored_at, user)
+
+
+def invalidate_user(tg_id: int, user_data: Optional[MutableMapping[str, Any]] = None) -> None:
+    _inflight.pop(tg_id, None)
+    _missing.pop(tg_id, None)
+    _cache.pop(tg_id, None)
+    if user_data is not None:
+        user_data.pop(USER_DATA_KEY, None)
+
+
+async def _load(tg_id: int, fetch: Fetch) -> Dict[str, Any]:
+    task = asyncio.current_task()
+    try:
+        try:
+            user = await fetch(f"/users/by-telegram/{tg_id}")
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != httpx.codes.NOT_FOUND:
+                raise
+            if _inflight.get(tg_id) is task:
+                _remember_missing(tg_id)
+            raise UserNotFound(tg_id) from exc
+        if isinstance(user, dict) and _inflight.get(tg_id) is task:
+            _remember(tg_id, time.time(), user)
+        return user
+    finally:
+        if _inflight.get(tg_id) is task:
+            del _inflight[tg_id]
+
+
+async def get_user(
+    tg_id: int,
+    user_data: Optional[MutableMapping[str, Any]] = None,
+    fetch: Optional[Fetch] = None,
+) -> Dict[str, Any]:
+    """Profile of `tg_id`, from the cache when fresh.
+
+    Unregistered users raise `UserNotFound`, cached briefly; other API errors
+    propagate and are not cached.
+    """
+    user = cached_user(tg_id, user_data)
+    if user is not None:
+        return user
+    if _known_missing(tg_id):
+        raise UserNotFound(tg_id)
+    task = _inflight.get(tg_id)
+    if task is None:
+        task = asyncio.ensure_future(_load(tg_id, fetch or api_get_one))
+        _inflight[tg_id] = task
+    # Shield: a cancelled handler must not cancel the lookup other handlers wait on
+    user = await asyncio.shield(task)
+    entry = _cache.get(tg_id)
+    if entry is not None and entry[1] is user:
+        _mirror(user_data, *entry)
+    return user
+
+
+def clear_cache() -> None:
+    _cache.clear()
+    _inflight.clear()
+    _missing.clear()
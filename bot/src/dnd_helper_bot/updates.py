@@ -0,0 +1,60 @@
+"""Concurrent update processing that keeps each chat's updates in order.
+
+Updates of different chats run concurrently, up to `BOT_CONCURRENT_UPDATES` at
+a time. Updates of one chat (or of one user, for updates without a chat) run
+one at a time in arrival order, so filter toggles and page switches in a chat
+never race on its `user_data`. An update takes a concurrency slot only once its
+chat's turn has come, so a flooding chat holds at most one slot and never
+stalls the other chats.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+def _order_key(update: object) -> Optional[int]:
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    def __init__(self, max_concurrent_updates: int) -> None:
+        super().__init__(max_concurrent_updates)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        # Updates holding or waiting for each lock; a lock is dropped at zero
+        self._users: Dict[int, int] = {}
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = _order_key(update)
+        if key is None:
+            await super().process_update(update, coroutine)
+            return
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            # asyncio.Lock wakes waiters first come, first served; the slot is
+            # taken after the chat's turn so queued updates do not hold one
+            async with lock, self._semaphore:
+                await coroutine
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -1,24 +1,141 @@
+"""UI texts from `/i18n/ui`, cached per (lang, namespace) in process memory.
+
+- `preload()` fetches every configured language and namespace concurrently on
+  startup, so the first updates after a restart do not wait for the API;
+- a miss (e.g. a namespace that was not preloaded) starts one request per key;
+  concurrent callers share it;
+- `refresh()` revalidates every cached key with `If-None-Match`; the bot runs it
+  every `BOT_I18N_REFRESH_SECONDS`, so admin edits show up without a restart.
+  A failed refresh keeps the cached texts.
+
+`i18n_version()` changes whenever cached texts change; caches of rendered
+texts include it in their keys (see `utils.render_cache`).
+"""
+
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from dnd_helper_bot.repositories.api_client import api_get_if_changed
 
-from dnd_helper_bot.repositories.api_client import api_get_one
+logger = logging.getLogger(__name__)
+
+I18N_LANGUAGES = [
+    v.strip().lower() for v in os.getenv("BOT_I18N_LANGUAGES", "ru,en").split(",") if v.strip()
+]
+I18N_NAMESPACES = [
+    v.strip() for v in os.getenv("BOT_I18N_NAMESPACES", "bot").split(",") if v.strip()
+]
+# Interval of the background refresh; 0 disables
+I18N_REFRESH_SECONDS = float(os.getenv("BOT_I18N_REFRESH_SECONDS", "300"))
 
 # Cache structure: { lang: { namespace: { key: text } } }
 _cache: Dict[str, Dict[str, Dict[str, str]]] = {}
+_etags: Dict[Tuple[str, str], Optional[str]] = {}
+# Loads and refreshes in flight, at most one per (lang, namespace)
+_loading: Dict[Tuple[str, str], "asyncio.Task[Dict[str, str]]"] = {}
+_version = 0
+
+
+def i18n_version() -> int:
+    return _version
+
+
+def set_texts(lang: str, namespace: str, texts: Dict[str, str]) -> None:
+    """Replace the cached texts of (lang, namespace)."""
+    global _version
+    _cache.setdefault(lang, {})[namespace] = texts
+    _version += 1
+
+
+async def _load(lang: str, ns: str) -> Dict[str, str]:
+    cached = _cache.get(lang, {}).get(ns)
+    data, headers = await api_get_if_changed(
+        "/i18n/ui",
+        params={"ns": ns, "lang": lang},
+        etag=_etags.get((lang, ns)) if cached is not None else None,
+    )
+    if data is None and cached is not None:
+        return cached
+    if not isinstance(data, dict):
+        data = {}
+    texts = {str(k): str(v) for k, v in data.items()}
+    set_texts(lang, ns, texts)
+    _etags[(lang, ns)] = headers.get("etag")
+    return texts
+
+
+def _finished(key: Tuple[str, str], task: "asyncio.Task[Dict[str, str]]") -> None:
+    if _loading.get(key) is task:
+        del _loading[key]
+
+
+def _start(lang: str, ns: str) -> "asyncio.Task[Dict[str, str]]":
+    key = (lang, ns)
+    task = _loading.get(key)
+    # A finished task may still be registered until its done callback runs
+    if task is None or task.done():
+        task = asyncio.ensure_future(_load(lang, ns))
+        task.add_done_callback(lambda done: _finished(key, done))
+        _loading[key] = task
+    return task
 
 
 async def _ensure_namespace(lang: str, namespace: str = "bot") -> Dict[str, str]:
     lang = (lang or "ru").lower()
     ns = namespace or "bot"
-    if lang not in _cache:
-        _cache[lang] = {}
-    if ns not in _cache[lang]:
-        data = await api_get_one("/i18n/ui", params={"ns": ns, "lang": lang})
-        if not isinstance(data, dict):
-            data = {}
-        _cache[lang][ns] = {str(k): str(v) for k, v in data.items()}
-    return _cache[lang][ns]
+    cached = _cache.get(lang, {}).get(ns)
+    if cached is not None:
+        return cached
+    # Shield: a cancelled handler must not cancel the load other handlers wait on
+    return await asyncio.shield(_start(lang, ns))
+
+
+async def _gather(keys: Iterable[Tuple[str, str]], action: str) -> int:
+    keys = list(keys)
+    results = await asyncio.gather(
+        *(_start(lang, ns) for lang, ns in keys), return_exceptions=True
+    )
+    failed = 0
+    for (lang, ns), result in zip(keys, results, strict=True):
+        if isinstance(result, BaseException):
+            failed += 1
+            logger.warning(f"UI translations {ns} [{lang}] {action} failed: {result!r}")
+    return len(keys) - failed
+
+
+async def preload(
+    languages: Optional[Iterable[str]] = None, namespaces: Optional[Iterable[str]] = None
+) -> int:
+    """Load all (lang, namespace) pairs concurrently; returns how many succeeded."""
+    namespaces = list(namespaces or I18N_NAMESPACES)
+    keys = [(lang, ns) for lang in (languages or I18N_LANGUAGES) for ns in namespaces]
+    loaded = await _gather(keys, "preload")
+    logger.info(f"UI translations preloaded: {loaded}/{len(keys)}")
+    return loaded
+
+
+async def refresh() -> int:
+    """Revalidate every cached (lang, namespace); returns how many succeeded."""
+    keys = [(lang, ns) for lang, namespaces in _cache.items() for ns in namespaces]
+    return await _gather(keys, "refresh")
+
+
+async def refresh_periodically() -> None:
+    while True:
+        await asyncio.sleep(I18N_REFRESH_SECONDS)
+        await refresh()
+
+
+def clear_i18n() -> None:
+    global _version
+    _version += 1
+    _cache.clear()
+    _etags.clear()
+    _loading.clear()
 
 
 async def t(key: str, lang: str, default: str | None = None, namespace: str = "bot") -> str:
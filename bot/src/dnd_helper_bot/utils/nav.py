@@ -1,18 +1,22 @@
 from telegram import InlineKeyboardButton
 
 from dnd_helper_bot.utils.i18n import t
+from dnd_helper_bot.utils.render_cache import memoized
 
 
 async def build_nav_row(lang: str, back_callback: str, main_callback: str = "menu:main") -> list[InlineKeyboardButton]:
     """Build a standardized navigation row [Back, Main].
 
     Labels are resolved via i18n; absence of keys should be treated as an error.
+    The buttons are cached per language; each call returns a new list.
     """
-    back_label = await t("nav.back", lang)
-    main_label = await t("nav.main", lang)
-    return [
-        InlineKeyboardButton(back_label, callback_data=back_callback),
-        InlineKeyboardButton(main_label, callback_data=main_callback),
-    ]
 
+    async def build() -> tuple[InlineKeyboardButton, ...]:
+        back_label = await t("nav.back", lang)
+        main_label = await t("nav.main", lang)
+        return (
+            InlineKeyboardButton(back_label, callback_data=back_callback),
+            InlineKeyboardButton(main_label, callback_data=main_callback),
+        )
 
+    return list(await memoized("nav", lang, (back_callback, main_callback), build))
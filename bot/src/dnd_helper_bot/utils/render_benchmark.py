@@ -0,0 +1,149 @@
+"""Time filter menu rendering with and without the render cache.
+
+Usage (inside the bot container):
+
+    python -m dnd_helper_bot.utils.render_benchmark --iterations 2000
+
+Fills the UI text cache with synthetic texts (no API calls), then renders the
+monster and spell filter keyboards, headers and the navigation row for a few
+filter states: "cold" clears the render cache before every render, "warm"
+reuses it. Prints microseconds per render for both.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from dnd_helper_bot.handlers.monsters.filters import _default_monsters_filters
+from dnd_helper_bot.handlers.monsters.render import (
+    _build_filters_header as monsters_header,
+)
+from dnd_helper_bot.handlers.monsters.render import (
+    _build_filters_keyboard as monsters_keyboard,
+)
+from dnd_helper_bot.handlers.spells.filters import _default_spells_filters
+from dnd_helper_bot.handlers.spells.render import (
+    _build_filters_header as spells_header,
+)
+from dnd_helper_bot.handlers.spells.render import (
+    _build_filters_keyboard as spells_keyboard,
+)
+from dnd_helper_bot.utils.i18n import clear_i18n, set_texts
+from dnd_helper_bot.utils.nav import build_nav_row
+from dnd_helper_bot.utils.render_cache import clear_render_cache, render_cache_stats
+
+BENCH_LANG = "en"
+
+TYPE_OPTIONS = [(f"type{i}", f"Type {i}") for i in range(14)]
+SCHOOL_OPTIONS = [(f"school{i}", f"School {i}") for i in range(8)]
+CLASS_OPTIONS = [(f"class{i}", f"Class {i}") for i in range(12)]
+
+Render = Tuple[str, Callable[[], Awaitable[Any]]]
+
+_KEYS = (
+    "filters.add", "filters.any", "filters.any.class", "filters.any.concentration",
+    "filters.any.level", "filters.any.school", "filters.apply", "filters.cast.bonus",
+    "filters.cast.reaction", "filters.change", "filters.concentration", "filters.cr.03",
+    "filters.cr.48", "filters.cr.9p", "filters.field.casting_time", "filters.field.class",
+    "filters.field.concentration", "filters.field.cr", "filters.field.flying",
+    "filters.field.legendary", "filters.field.level", "filters.field.school",
+    "filters.field.size", "filters.field.type", "filters.flying.no", "filters.flying.yes",
+    "filters.level.13", "filters.level.45", "filters.level.69", "filters.no",
+    "filters.remove", "filters.reset", "filters.ritual", "filters.size.L", "filters.size.M",
+    "filters.size.S", "filters.yes", "list.all.monsters", "list.all.spells", "nav.back",
+    "nav.main",
+)
+
+
+def _monster_states() -> List[Dict[str, Any]]:
+    base = _default_monsters_filters()
+    expanded = {**base, "visible_fields": ["cr_buckets", "types", "sizes", "flying"]}
+    return [
+        base,
+        expanded,
+        {**expanded, "cr_buckets": {"03", "48"}, "types": {"type1", "type4"}},
+        {**expanded, "sizes": {"M"}, "flying": True},
+    ]
+
+
+def _spell_states() -> List[Dict[str, Any]]:
+    base = _default_spells_filters()
+    expanded = {
+        **base,
+        "visible_fields": [
+            "level_buckets", "school", "casting_time", "ritual", "is_concentration", "classes",
+        ],
+        "add_menu_open": True,
+    }
+    return [
+        base,
+        expanded,
+        {**expanded, "level_buckets": {"13"}, "school": {"school2", "school5"}},
+        {**expanded, "classes": {"class3"}, "ritual": True, "casting_time": {"ba"}},
+    ]
+
+
+def _renders() -> List[Render]:
+    renders: List[Render] = []
+    for state in _monster_states():
+        renders.append(
+            (
+                "monsters keyboard",
+                lambda s=state: monsters_keyboard(s, BENCH_LANG, TYPE_OPTIONS, True),
+            )
+        )
+        renders.append(
+            ("monsters header", lambda s=state: monsters_header(s, BENCH_LANG, TYPE_OPTIONS))
+        )
+    for state in _spell_states():
+        renders.append(
+            (
+                "spells keyboard",
+                lambda s=state: spells_keyboard(s, BENCH_LANG, SCHOOL_OPTIONS, CLASS_OPTIONS),
+            )
+        )
+        renders.append(
+            ("spells header", lambda s=state: spells_header(s, BENCH_LANG, SCHOOL_OPTIONS))
+        )
+    renders.append(("nav row", lambda: build_nav_row(BENCH_LANG, "menu:monsters")))
+    return renders
+
+
+async def _time(renders: List[Render], iterations: int, cold: bool) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for _ in range(iterations):
+        for name, render in renders:
+            if cold:
+                clear_render_cache()
+            started = time.perf_counter()
+            await render()
+            totals[name] = totals.get(name, 0.0) + time.perf_counter() - started
+            counts[name] = counts.get(name, 0) + 1
+    return {name: totals[name] / counts[name] * 1e6 for name in totals}
+
+
+async def _run(iterations: int) -> None:
+    clear_i18n()
+    set_texts(BENCH_LANG, "bot", {key: f"{key} label" for key in _KEYS})
+    renders = _renders()
+    cold = await _time(renders, iterations, cold=True)
+    clear_render_cache()
+    warm = await _time(renders, iterations, cold=False)
+    print(f"{'render':<20}{'cold us':>12}{'warm us':>12}{'speedup':>10}")
+    for name in cold:
+        speedup = cold[name] / warm[name]
+        print(f"{name:<20}{cold[name]:>12.1f}{warm[name]:>12.1f}{speedup:>9.1f}x")
+    print(f"cache: {render_cache_stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="Renders per filter state")
+    args = parser.parse_args()
+    asyncio.run(_run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Memoized rendering of keyboards and labels that depend only on their inputs.
+
+Filter menus, filter headers and navigation rows resolve many i18n keys and
+build dozens of buttons, although most users see the same few combinations.
+`memoized(kind, lang, state, build)` returns the value built earlier for the
+same (kind, lang, i18n version, normalized state) and calls `build` only on a
+miss. `InlineKeyboardButton` is immutable, so cached buttons can be shared;
+keyboards are cached as tuples of rows and callers copy them into lists.
+
+The whole cache is dropped when the i18n version changes, so refreshed texts
+show up on the next render. At most `BOT_RENDER_CACHE_SIZE` entries are kept,
+least recently used first out.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, List, Sequence, Tuple, TypeVar
+
+from dnd_helper_bot.utils.i18n import i18n_version
+
+RENDER_CACHE_SIZE = max(1, int(os.getenv("BOT_RENDER_CACHE_SIZE", "4096")))
+
+T = TypeVar("T")
+
+_cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+_cache_version = i18n_version()
+_stats = {"hits": 0, "misses": 0}
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable form of a filter state; sets compare by content, dicts by items."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted((freeze(v) for v in value), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def freeze_rows(rows: Sequence[Sequence[Any]]) -> Tuple[Tuple[Any, ...], ...]:
+    return tuple(tuple(row) for row in rows)
+
+
+def thaw_rows(rows: Sequence[Sequence[Any]]) -> List[List[Any]]:
+    return [list(row) for row in rows]
+
+
+async def memoized(kind: str, lang: str, state: Hashable, build: Callable[[], Awaitable[T]]) -> T:
+    global _cache_version
+    version = i18n_version()
+    if version != _cache_version:
+        _cache.clear()
+        _cache_version = version
+    key = (kind, lang, state)
+    if key in _cache:
+        _stats["hits"] += 1
+        _cache.move_to_end(key)
+        return _cache[key]
+    _stats["misses"] += 1
+    value = await build()
+    # Texts may have been refreshed while building; such a value is not kept
+    if i18n_version() == version:
+        _cache[key] = value
+        while len(_cache) > RENDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return value
+
+
+def render_cache_stats() -> dict:
+    return {**_stats, "size": len(_cache)}
+
+
+def clear_render_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,90 @@
+"""Webhook serving mode (`BOT_MODE=webhook`).
+
+A small Starlette app receives Telegram's update POSTs and feeds them into the
+application's update queue; uvicorn serves it on `BOT_WEBHOOK_LISTEN:BOT_WEBHOOK_PORT`.
+On startup the webhook is registered with Telegram as
+`BOT_WEBHOOK_URL/BOT_WEBHOOK_PATH`. When `BOT_WEBHOOK_SECRET` is set, requests
+without the matching `X-Telegram-Bot-Api-Secret-Token` header are rejected.
+Long polling (`BOT_MODE=polling`, the default) needs none of this.
+"""
+
+import logging
+import os
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_URL = os.getenv("BOT_WEBHOOK_URL", "")
+WEBHOOK_PATH = os.getenv("BOT_WEBHOOK_PATH", "telegram").strip("/")
+WEBHOOK_LISTEN = os.getenv("BOT_WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("BOT_WEBHOOK_PORT", "8080"))
+WEBHOOK_SECRET = os.getenv("BOT_WEBHOOK_SECRET", "")
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def build_webhook_app(
+    application: Application, path: str = WEBHOOK_PATH, secret: str = WEBHOOK_SECRET
+) -> Starlette:
+    async def receive_update(request: Request) -> Response:
+        if secret and request.headers.get(SECRET_HEADER) != secret:
+            logger.warning("Webhook request with a wrong secret token rejected")
+            return Response(status_code=403)
+        try:
+            update = Update.de_json(await request.json(), application.bot)
+        except Exception:
+            logger.warning("Webhook request with an invalid update body rejected")
+            return Response(status_code=400)
+        await application.update_queue.put(update)
+        return Response(status_code=200)
+
+    async def health(request: Request) -> Response:
+        return PlainTextResponse("ok")
+
+    return Starlette(
+        routes=[
+            Route(f"/{path}", receive_update, methods=["POST"]),
+            Route("/healthz", health, methods=["GET"]),
+        ]
+    )
+
+
+async def run_webhook(application: Application) -> None:
+    """Serve updates over the webhook until uvicorn receives SIGINT/SIGTERM."""
+    if not WEBHOOK_URL:
+        raise RuntimeError("BOT_WEBHOOK_URL is not set")
+    server = uvicorn.Server(
+        uvicorn.Config(
+            build_webhook_app(application),
+            host=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            log_config=None,
+        )
+    )
+    # Same lifecycle as run_polling, which calls the post_* hooks itself
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+        await application.bot.set_webhook(
+            url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET or None,
+            allowed_updates=Update.ALL_TYPES,
+        )
+        await application.start()
+        logger.info(f"Webhook listening on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+        try:
+            await server.serve()
+        finally:
+            await application.stop()
+    finally:
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
@@ -0,0 +1,26 @@
+import pytest
+from dnd_helper_bot.repositories.api_client import clear_get_cache
+from dnd_helper_bot.repositories.catalog import clear_catalog
+from dnd_helper_bot.repositories.names import clear_names
+from dnd_helper_bot.repositories.users import clear_cache
+from dnd_helper_bot.utils.i18n import clear_i18n
+from dnd_helper_bot.utils.render_cache import clear_render_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # Profiles, catalogs, UI texts, GET bodies, names and rendered menus are cached
+    # per process; keep tests independent of each other
+    clear_cache()
+    clear_catalog()
+    clear_i18n()
+    clear_get_cache()
+    clear_names()
+    clear_render_cache()
+    yield
+    clear_cache()
+    clear_catalog()
+    clear_i18n()
+    clear_get_cache()
+    clear_names()
+    clear_render_cache()
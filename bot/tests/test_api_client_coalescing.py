@@ -0,0 +1,110 @@
+import asyncio
+
+import dnd_helper_bot.repositories.api_client as api_client
+import httpx
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRequest:
+    def __init__(self) -> None:
+        self.calls: list = []
+        self.gate = asyncio.Event()
+
+    async def __call__(self, method, path, label, params=None, json=None, **kwargs):
+        self.calls.append((method, path, params))
+        if method == "GET":
+            await self.gate.wait()
+        return httpx.Response(200, json={"path": path, "params": params})
+
+
+async def test_identical_concurrent_gets_share_one_request(monkeypatch):
+    fake = FakeRequest()
+    monkeypatch.setattr(api_client, "_request", fake)
+    before = api_client.pool_stats()["coalesced"]
+
+    same = [
+        api_client.api_get_one("/monsters/list/wrapped", {"lang": "ru"}) for _ in range(5)
+    ]
+    other = api_client.api_get_one("/monsters/list/wrapped", {"lang": "en"})
+    pending = asyncio.gather(*same, other)
+    await asyncio.sleep(0)
+    fake.gate.set()
+    results = await pending
+
+    assert len(fake.calls) == 2
+    assert results[0] is results[4]
+    assert results[5]["params"] == {"lang": "en"}
+    assert api_client.pool_stats()["coalesced"] - before == 4
+
+    # Without a TTL a later call sends its own request
+    await api_client.api_get_one("/monsters/list/wrapped", {"lang": "ru"})
+    assert len(fake.calls) == 3
+
+    # Unshared calls never wait on each other
+    fake.gate.clear()
+    params = {"lang": "ru", "order": "random", "limit": 1}
+    pending = asyncio.gather(
+        *(api_client.api_get_one("/monsters/list/page", params, shared=False) for _ in range(2))
+    )
+    await asyncio.sleep(0)
+    fake.gate.set()
+    await pending
+    assert len(fake.calls) == 5
+
+
+async def test_ttl_reuses_body_until_a_write(monkeypatch):
+    fake = FakeRequest()
+    fake.gate.set()
+    monkeypatch.setattr(api_client, "_request", fake)
+    monkeypatch.setattr(api_client, "HTTP_GET_TTL", 60.0)
+
+    first = await api_client.api_get("/spells/list/options", {"lang": "en"})
+    assert await api_client.api_get("/spells/list/options", {"lang": "en"}) is first
+    assert len(fake.calls) == 1
+
+    await api_client.api_patch("/users/1", json={"lang": "en"})
+    await api_client.api_get("/spells/list/options", {"lang": "en"})
+    assert [c[0] for c in fake.calls] == ["GET", "PATCH", "GET"]
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached(monkeypatch):
+    calls = []
+
+    async def failing(method, path, label, params=None, **kwargs):
+        calls.append(path)
+        await asyncio.sleep(0)
+        raise httpx.ConnectError("api down")
+
+    monkeypatch.setattr(api_client, "_request", failing)
+    monkeypatch.setattr(api_client, "HTTP_GET_TTL", 60.0)
+    results = await asyncio.gather(
+        *(api_client.api_get_one("/users/by-telegram/1") for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+    assert len(calls) == 1
+    with pytest.raises(httpx.ConnectError):
+        await api_client.api_get_one("/users/by-telegram/1")
+    assert len(calls) == 2
+
+
+async def test_reads_after_a_write_do_not_join_a_get_sent_before_it(monkeypatch):
+    fake = FakeRequest()
+    monkeypatch.setattr(api_client, "_request", fake)
+    monkeypatch.setattr(api_client, "HTTP_GET_TTL", 60.0)
+
+    before = asyncio.ensure_future(api_client.api_get_one("/users/by-telegram/1"))
+    await asyncio.sleep(0.01)
+    await api_client.api_patch("/users/1", json={"lang": "en"})
+    after = asyncio.ensure_future(api_client.api_get_one("/users/by-telegram/1"))
+    await asyncio.sleep(0.01)
+    fake.gate.set()
+    first, second = await asyncio.gather(before, after)
+
+    assert [c[0] for c in fake.calls] == ["GET", "PATCH", "GET"]
+    assert first is not second
+    # Only the body fetched after the write is reused
+    assert await api_client.api_get_one("/users/by-telegram/1") is second
+    assert len(fake.calls) == 3
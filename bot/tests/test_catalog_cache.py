@@ -0,0 +1,82 @@
+import asyncio
+
+import dnd_helper_bot.repositories.catalog as catalog
+import httpx
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.version = 1
+        self.calls: list = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, path, params=None, etag=None):
+        self.calls.append((path, params, etag))
+        await self.gate.wait()
+        current = f'W/"{self.version}"'
+        headers = httpx.Headers({"ETag": current, "X-Catalog-Version": str(self.version)})
+        if etag == current:
+            return None, headers
+        return [{"v": self.version}], headers
+
+
+def _project(items):
+    return [item["v"] for item in items]
+
+
+async def test_first_load_is_shared_and_then_served_from_memory(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(catalog, "api_get_if_changed", api)
+
+    results = await asyncio.gather(
+        *(catalog.get_catalog("/spells/list/wrapped", "en", _project) for _ in range(5))
+    )
+
+    assert results == [[1]] * 5
+    assert len(api.calls) == 1
+    assert await catalog.get_catalog("/spells/list/wrapped", "en", _project) == [1]
+    assert len(api.calls) == 1
+    # Languages are cached separately
+    await catalog.get_catalog("/spells/list/wrapped", "ru", _project)
+    assert api.calls[-1][1] == {"lang": "ru"}
+
+
+async def test_stale_entry_is_served_while_revalidating(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(catalog, "api_get_if_changed", api)
+    await catalog.get_catalog("/monsters/list/wrapped", "en", _project)
+    monkeypatch.setattr(catalog, "CATALOG_REVALIDATE_SECONDS", 0.0)
+
+    # Unchanged catalog: conditional request, 304, same projection kept
+    await catalog.get_catalog("/monsters/list/wrapped", "en", _project)
+    await asyncio.sleep(0)
+    assert api.calls[-1][2] == 'W/"1"'
+
+    # Changed catalog: the stale copy is returned without waiting for the download
+    api.version = 2
+    api.gate.clear()
+    stale = await catalog.get_catalog("/monsters/list/wrapped", "en", _project)
+    assert stale == [1]
+    api.gate.set()
+    await asyncio.sleep(0.01)
+    fresh = await catalog.get_catalog("/monsters/list/wrapped", "en", _project)
+    assert fresh == [2]
+
+
+async def test_failed_revalidation_keeps_stale_copy(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(catalog, "api_get_if_changed", api)
+    await catalog.get_catalog("/monsters/list/wrapped", "en", _project)
+    monkeypatch.setattr(catalog, "CATALOG_REVALIDATE_SECONDS", 0.0)
+
+    async def failing(*args, **kwargs):
+        raise httpx.ConnectError("api down")
+
+    monkeypatch.setattr(catalog, "api_get_if_changed", failing)
+    assert await catalog.get_catalog("/monsters/list/wrapped", "en", _project) == [1]
+    await asyncio.sleep(0.01)
+    assert await catalog.get_catalog("/monsters/list/wrapped", "en", _project) == [1]
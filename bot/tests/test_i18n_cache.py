@@ -0,0 +1,69 @@
+import asyncio
+
+import dnd_helper_bot.utils.i18n as i18n
+import httpx
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.texts = {"hello": "Hello"}
+        self.calls: list = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, path, params=None, etag=None):
+        self.calls.append((params["lang"], params["ns"], etag))
+        await self.gate.wait()
+        current = f'W/"{len(self.texts)}"'
+        headers = httpx.Headers({"ETag": current})
+        if etag == current:
+            return None, headers
+        return dict(self.texts), headers
+
+
+async def test_concurrent_misses_share_one_request(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(i18n, "api_get_if_changed", api)
+    api.gate.clear()
+
+    pending = asyncio.gather(*(i18n.t("hello", "en") for _ in range(10)))
+    await asyncio.sleep(0)
+    api.gate.set()
+
+    assert await pending == ["Hello"] * 10
+    assert api.calls == [("en", "bot", None)]
+    assert await i18n.t("missing", "en", default="x") == "x"
+    assert len(api.calls) == 1
+
+
+async def test_preload_and_refresh(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(i18n, "api_get_if_changed", api)
+
+    assert await i18n.preload(["ru", "en"], ["bot"]) == 2
+    assert sorted(call[0] for call in api.calls) == ["en", "ru"]
+
+    # Unchanged texts: conditional requests answered with 304
+    assert await i18n.refresh() == 2
+    assert all(call[2] == 'W/"1"' for call in api.calls[2:])
+
+    api.texts["bye"] = "Bye"
+    await i18n.refresh()
+    assert await i18n.t("bye", "ru") == "Bye"
+    assert len(api.calls) == 6
+
+
+async def test_failed_refresh_keeps_cached_texts(monkeypatch):
+    api = FakeApi()
+    monkeypatch.setattr(i18n, "api_get_if_changed", api)
+    await i18n.preload(["en"], ["bot"])
+
+    async def failing(*args, **kwargs):
+        raise httpx.ConnectError("api down")
+
+    monkeypatch.setattr(i18n, "api_get_if_changed", failing)
+    assert await i18n.refresh() == 0
+    assert await i18n.t("hello", "en") == "Hello"
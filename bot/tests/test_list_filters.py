@@ -0,0 +1,61 @@
+from dnd_helper_bot.handlers.monsters.filters import (
+    _default_monsters_filters,
+    _monsters_query_params,
+)
+from dnd_helper_bot.handlers.spells.filters import _default_spells_filters, _spells_query_params
+
+
+def test_default_filters_send_no_query_params() -> None:
+    assert _monsters_query_params(_default_monsters_filters()) == {}
+    assert _spells_query_params(_default_spells_filters()) == {}
+
+
+def test_monster_cr_buckets_cover_every_cr_in_range() -> None:
+    params = _monsters_query_params({"cr_buckets": {"03"}})
+    assert params["cr"] == ["0", "1/8", "1/4", "1/2", "1", "2", "3"]
+
+    params = _monsters_query_params({"cr_buckets": {"9p", "48"}})
+    assert params["cr"] == [str(cr) for cr in range(4, 31)]
+
+    # Legacy single range
+    assert _monsters_query_params({"cr_range": "48"})["cr"] == ["4", "5", "6", "7", "8"]
+
+
+def test_monster_sizes_types_and_flags() -> None:
+    params = _monsters_query_params(
+        {"sizes": {"S", "L"}, "types": {"undead", "beast"}, "flying": True, "legendary": False}
+    )
+    assert params == {
+        "sizes": ["large", "huge", "gargantuan", "tiny", "small"],
+        "types": ["beast", "undead"],
+        "is_flying": True,
+        "is_legendary": False,
+    }
+    # Legacy single size
+    assert _monsters_query_params({"size": "M"}) == {"sizes": ["medium"]}
+
+
+def test_spell_filters() -> None:
+    params = _spells_query_params(
+        {
+            "ritual": True,
+            "is_concentration": True,
+            "casting_time": {"re", "ba"},
+            "level_buckets": {"45", "13"},
+            "school": {"necromancy", "evocation"},
+            "classes": {"wizard", "cleric"},
+        }
+    )
+    assert params == {
+        "ritual": True,
+        "is_concentration": True,
+        "casting_times": ["bonus_action", "reaction"],
+        "levels": [1, 2, 3, 4, 5],
+        "schools": ["evocation", "necromancy"],
+        "classes": ["cleric", "wizard"],
+    }
+
+
+def test_spell_legacy_filters() -> None:
+    params = _spells_query_params({"cast": {"bonus": True}, "level_range": "69"})
+    assert params == {"casting_times": ["bonus_action"], "levels": [6, 7, 8, 9]}
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from dnd_helper_bot.repositories import persistence
+from dnd_helper_bot.repositories.persistence import RedisPersistence, dumps, loads
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append(("set", key, value, ex))
+
+    def delete(self, key):
+        self.ops.append(("delete", key, None, None))
+
+    async def execute(self):
+        self.redis.executed += 1
+        for op, key, value, ex in self.ops:
+            if op == "set":
+                self.redis.data[key] = value
+                self.redis.ttls[key] = ex
+            else:
+                self.redis.data.pop(key, None)
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of `redis.asyncio.Redis` the persistence uses."""
+
+    def __init__(self) -> None:
+        self.data: dict = {}
+        self.ttls: dict = {}
+        self.hashes: dict = {}
+        self.executed = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    async def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key.encode()] = value
+
+    async def hdel(self, name, key):
+        self.hashes.get(name, {}).pop(key.encode(), None)
+
+
+def test_serialization_keeps_sets_and_compresses_large_values():
+    value = {"types": {"dragon", "beast"}, "visible_fields": ["cr_buckets"], "n": None}
+    assert loads(dumps(value)) == value
+    big = {"items": [{"name": "Goblin", "id": i} for i in range(100)]}
+    packed = dumps(big)
+    assert packed[:1] == b"z" and len(packed) < len(str(big))
+    assert loads(packed) == big
+
+
+@pytest.mark.asyncio
+async def test_user_data_survives_restart_with_ephemeral_ttl():
+    redis = FakeRedis()
+    first = RedisPersistence(redis, update_interval=10)
+    alice: dict = {}
+    await first.refresh_user_data(1, alice)
+    alice.update(
+        monsters_filters_applied={"types": {"dragon"}},
+        search_session={"q": "wolf", "scope": "name", "ids": [7]},
+    )
+    await asyncio.gather(
+        first.update_user_data(1, dict(alice)), first.update_user_data(2, {"lang": "en"})
+    )
+    # One flush run, one pipeline
+    assert redis.executed == 1
+    assert redis.ttls["dnd_bot:user:1:eph"] == persistence.STATE_EPHEMERAL_TTL
+    assert redis.ttls["dnd_bot:user:1"] == persistence.STATE_TTL
+
+    restarted = RedisPersistence(redis, update_interval=10)
+    assert await restarted.get_user_data() == {}
+    loaded: dict = {}
+    await restarted.refresh_user_data(1, loaded)
+    assert loaded == alice
+
+    # Emptied ephemeral state deletes its key
+    loaded.pop("search_session")
+    await restarted.update_user_data(1, dict(loaded))
+    assert "dnd_bot:user:1:eph" not in redis.data
+
+
+@pytest.mark.asyncio
+async def test_idle_users_are_evicted_and_reloaded():
+    redis = FakeRedis()
+    store = RedisPersistence(redis, update_interval=1, idle_seconds=2)
+
+    held: dict = {}
+    await store.refresh_user_data(1, held)
+    held["monsters_current_page"] = 3
+    await store.update_user_data(1, dict(held))
+
+    # Five seconds pass without updates from user 1
+    store._last_seen[1] -= 5
+    store._last_sweep -= 5
+    await store.refresh_user_data(2, {})
+    assert held == {}
+
+    # An empty update for an evicted user must not wipe the stored state
+    await store.update_user_data(1, {})
+    await store.refresh_user_data(1, held)
+    assert held == {"monsters_current_page": 3}
+
+
+@pytest.mark.asyncio
+async def test_conversation_states_roundtrip():
+    redis = FakeRedis()
+    store = RedisPersistence(redis)
+    await store.update_conversation("search", (10, 20), "awaiting_query")
+    await store.update_conversation("search", (10, 21), "awaiting_query")
+    await store.update_conversation("search", (10, 21), None)
+    assert await store.get_conversations("search") == {(10, 20): "awaiting_query"}
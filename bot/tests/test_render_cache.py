@@ -0,0 +1,51 @@
+import dnd_helper_bot.utils.i18n as i18n
+import pytest
+from dnd_helper_bot.handlers.monsters.filters import _default_monsters_filters
+from dnd_helper_bot.handlers.monsters.render import _build_filters_keyboard
+from dnd_helper_bot.utils.nav import build_nav_row
+from dnd_helper_bot.utils.render_cache import freeze, render_cache_stats
+
+
+def test_freeze_normalizes_sets_and_dicts():
+    a = {"types": {"b", "a"}, "visible_fields": ["types"], "cast": {"x": 1, "y": 2}}
+    b = {"cast": {"y": 2, "x": 1}, "visible_fields": ["types"], "types": {"a", "b"}}
+    assert freeze(a) == freeze(b)
+    assert freeze({"types": {"a"}}) != freeze({"types": ["a"]})
+
+
+@pytest.mark.asyncio
+async def test_nav_row_cached_until_texts_change(monkeypatch):
+    calls = []
+
+    async def fake_ensure(lang, namespace):
+        calls.append(lang)
+        return i18n._cache.get(lang, {}).get(namespace, {})
+
+    monkeypatch.setattr(i18n, "_ensure_namespace", fake_ensure)
+    i18n.set_texts("en", "bot", {"nav.back": "Back", "nav.main": "Main"})
+
+    first = await build_nav_row("en", "menu:monsters")
+    first.append("extra")
+    second = await build_nav_row("en", "menu:monsters")
+    assert [b.text for b in second] == ["Back", "Main"]
+    assert len(calls) == 2
+
+    i18n.set_texts("en", "bot", {"nav.back": "Go back", "nav.main": "Main"})
+    third = await build_nav_row("en", "menu:monsters")
+    assert third[0].text == "Go back"
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_filters_keyboard_keyed_by_state():
+    i18n.set_texts("en", "bot", {"filters.add": "Add filters"})
+    state = {**_default_monsters_filters(), "types": {"beast"}}
+    options = [("beast", "Beast"), ("dragon", "Dragon")]
+
+    rows = await _build_filters_keyboard(state, "en", options, True)
+    again = await _build_filters_keyboard({**state, "types": {"beast"}}, "en", options, True)
+    assert again == rows and again is not rows
+    assert render_cache_stats()["hits"] >= 1
+
+    other = await _build_filters_keyboard({**state, "types": {"dragon"}}, "en", options, True)
+    assert other != rows
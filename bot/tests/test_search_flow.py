@@ -65,3 +65,53 @@ async def test_monster_search_uses_scope_param_and_renders_scope_label(monkeypat
     assert update.message.last_text.startswith("[Name]\nSearch results:")
 
 
+
+
+async def test_search_session_keeps_ids_and_refetches_missing_names(monkeypatch):
+    search_mod = importlib.import_module("dnd_helper_bot.handlers.search")
+    names_mod = importlib.import_module("dnd_helper_bot.repositories.names")
+
+    async def ok_api_get_one(*args, **kwargs):
+        return {"lang": "en"}
+
+    async def fake_api_get(path: str, params: dict | None = None):
+        return [
+            {"entity": {"id": i}, "translation": {"name": f"Wolf {i}", "description": "x" * 500}}
+            for i in range(1, 8)
+        ]
+
+    async def fake_t(key: str, lang: str, default: str | None = None, namespace: str = "bot"):
+        return key
+
+    monkeypatch.setattr(search_mod, "api_get_one", ok_api_get_one)
+    monkeypatch.setattr(search_mod, "api_get", fake_api_get)
+    monkeypatch.setattr(search_mod, "t", fake_t)
+    monkeypatch.setattr(nav, "t", fake_t)
+
+    update = make_message_update(user_lang="en", text="wolf")
+    context = DummyContext(user_data={"awaiting_monster_query": True})
+    await search_mod.handle_search_text(update, context)
+
+    assert context.user_data["search_session"] == {
+        "q": "wolf",
+        "scope": "name",
+        "ids": [1, 2, 3, 4, 5, 6, 7],
+    }
+    assert "search_items_cache" not in context.user_data
+
+    # After the shared names are gone (restart, eviction), page 2 fetches only its ids
+    names_mod.clear_names()
+    fetched = {}
+
+    async def fake_page(path: str, params: dict | None = None):
+        fetched["path"], fetched["ids"] = path, list(params["ids"])
+        return {"items": [{"entity": {"id": 7}, "translation": {"name": "Wolf 7"}}]}
+
+    monkeypatch.setattr(names_mod, "api_get_one", fake_page)
+    await search_mod._render_search_results(update, context, "en", page=2)
+
+    assert fetched == {"path": "/monsters/list/page", "ids": [6, 7]}
+    rows = update.message.last_kwargs["reply_markup"].inline_keyboard
+    buttons = [b for row in rows for b in row if b.callback_data.startswith("monster:detail:")]
+    # Id 6 no longer exists and is skipped
+    assert [(b.text, b.callback_data) for b in buttons] == [("Wolf 7", "monster:detail:7")]
@@ -0,0 +1,102 @@
+import asyncio
+import types
+
+import httpx
+import pytest
+from dnd_helper_bot.updates import ChatOrderedUpdateProcessor
+from dnd_helper_bot.webhook import SECRET_HEADER, build_webhook_app
+from telegram import Update
+
+pytestmark = pytest.mark.asyncio
+
+
+def _message_update(update_id: int, chat_id: int, text: str = "hi") -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+            "text": text,
+        },
+    }
+
+
+async def test_same_chat_runs_in_order_other_chats_concurrently():
+    processor = ChatOrderedUpdateProcessor(8)
+    log: list = []
+    release = asyncio.Event()
+
+    async def handle(name: str, wait: bool) -> None:
+        log.append(f"start {name}")
+        if wait:
+            await release.wait()
+        log.append(f"end {name}")
+
+    updates = [
+        (Update.de_json(_message_update(1, 10), None), "a1", True),
+        (Update.de_json(_message_update(2, 10), None), "a2", False),
+        (Update.de_json(_message_update(3, 20), None), "b1", False),
+    ]
+    async with processor:
+        tasks = [
+            asyncio.ensure_future(processor.process_update(update, handle(name, wait)))
+            for update, name, wait in updates
+        ]
+        await asyncio.sleep(0.01)
+        # Chat 20 is not blocked by chat 10; a2 waits for a1
+        assert log == ["start a1", "start b1", "end b1"]
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert log[3:] == ["end a1", "start a2", "end a2"]
+    assert processor._locks == {}
+
+
+async def test_webhook_queues_posted_updates_and_checks_secret():
+    application = types.SimpleNamespace(bot=None, update_queue=asyncio.Queue())
+    app = build_webhook_app(application, path="hook", secret="s3cret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+        ok = await client.post(
+            "/hook", json=_message_update(5, 10, "wolf"), headers={SECRET_HEADER: "s3cret"}
+        )
+        forbidden = await client.post("/hook", json=_message_update(6, 10))
+        invalid = await client.post("/hook", content=b"nope", headers={SECRET_HEADER: "s3cret"})
+        health = await client.get("/healthz")
+
+    assert (ok.status_code, forbidden.status_code, invalid.status_code) == (200, 403, 400)
+    assert health.text == "ok"
+    update = application.update_queue.get_nowait()
+    assert update.update_id == 5 and update.message.text == "wolf"
+    assert application.update_queue.empty()
+
+
+async def test_a_flooding_chat_does_not_stall_other_chats():
+    processor = ChatOrderedUpdateProcessor(2)
+    log: list = []
+    release = asyncio.Event()
+
+    async def handle(name: str) -> None:
+        log.append(f"start {name}")
+        if name == "a1":
+            await release.wait()
+        log.append(f"end {name}")
+
+    flood = [(Update.de_json(_message_update(i, 10), None), f"a{i}") for i in range(1, 6)]
+    other = (Update.de_json(_message_update(9, 20), None), "b1")
+    async with processor:
+        tasks = [
+            asyncio.ensure_future(processor.process_update(update, handle(name)))
+            for update, name in [*flood, other]
+        ]
+        await asyncio.sleep(0.01)
+        # Chat 10's queued updates hold no slot
+        assert log == ["start a1", "start b1", "end b1"]
+        assert processor.current_concurrent_updates == 1
+        release.set()
+        await asyncio.gather(*tasks)
+
+    assert log[3:] == ["end a1"] + [f"{e} a{i}" for i in range(2, 6) for e in ("start", "end")]
+    assert processor.current_concurrent_updates == 0
@@ -0,0 +1,109 @@
+import asyncio
+import importlib
+import types
+
+import dnd_helper_bot.repositories.users as users
+import httpx
+import pytest
+from factories import DummyUser
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_misses_share_one_request():
+    calls = []
+
+    async def fetch(path: str):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return {"id": 7, "lang": "en"}
+
+    results = await asyncio.gather(*(users.get_user(42, fetch=fetch) for _ in range(10)))
+
+    assert calls == ["/users/by-telegram/42"]
+    assert all(r == {"id": 7, "lang": "en"} for r in results)
+    # Served from the cache afterwards
+    assert await users.get_user(42, fetch=fetch) == {"id": 7, "lang": "en"}
+    assert len(calls) == 1
+
+
+async def test_profile_is_mirrored_in_user_data_and_expires(monkeypatch):
+    async def fetch(path: str):
+        return {"id": 7, "lang": "ru"}
+
+    user_data: dict = {}
+    await users.get_user(42, user_data, fetch=fetch)
+    assert user_data[users.USER_DATA_KEY]["user"]["lang"] == "ru"
+
+    # Process cache lost (e.g. restart): the user_data mirror still answers
+    users.clear_cache()
+    assert users.cached_user(42, user_data) == {"id": 7, "lang": "ru"}
+
+    monkeypatch.setattr(users, "USER_CACHE_TTL", 0.0)
+    assert users.cached_user(42, user_data) is None
+    assert users.USER_DATA_KEY not in user_data
+
+
+async def test_set_language_writes_through_cache(monkeypatch):
+    settings = importlib.import_module("dnd_helper_bot.handlers.menu.settings")
+    calls = []
+
+    async def fake_api_get_one(path: str, params=None):
+        calls.append(path)
+        return {"id": 7, "lang": "ru"}
+
+    async def fake_api_patch(path: str, json: dict):
+        return {"id": 7, "lang": json["lang"]}
+
+    async def fake_t(key: str, lang: str, default=None, namespace: str = "bot"):
+        return key
+
+    async def fake_menu(lang: str):
+        return None
+
+    monkeypatch.setattr(settings, "api_get_one", fake_api_get_one)
+    monkeypatch.setattr(settings, "api_patch", fake_api_patch)
+    monkeypatch.setattr(settings, "t", fake_t)
+    monkeypatch.setattr(settings, "_build_main_menu_inline_i18n", fake_menu)
+
+    class Query:
+        data = "lang:set:en"
+        from_user = DummyUser(id=42, full_name="Test User", language_code="ru")
+
+        async def answer(self):
+            return None
+
+        async def edit_message_text(self, *args, **kwargs):
+            return None
+
+    context = types.SimpleNamespace(user_data={})
+    await settings.set_language(types.SimpleNamespace(callback_query=Query()), context)
+
+    assert calls == ["/users/by-telegram/42"]
+    assert users.cached_user(42)["lang"] == "en"
+    assert context.user_data[users.USER_DATA_KEY]["user"]["lang"] == "en"
+
+
+async def test_unregistered_users_are_cached_until_they_register(monkeypatch):
+    calls = []
+
+    async def fetch(path: str):
+        calls.append(path)
+        request = httpx.Request("GET", f"http://api{path}")
+        raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404))
+
+    for _ in range(3):
+        with pytest.raises(users.UserNotFound):
+            await users.get_user(42, fetch=fetch)
+    assert calls == ["/users/by-telegram/42"]
+
+    # Registering replaces the negative entry
+    users.store_user(42, {"id": 7, "lang": "en"})
+    assert await users.get_user(42, fetch=fetch) == {"id": 7, "lang": "en"}
+
+    users.invalidate_user(42)
+    monkeypatch.setattr(users, "USER_MISSING_TTL", 0.0)
+    for _ in range(2):
+        with pytest.raises(users.UserNotFound):
+            await users.get_user(42, fetch=fetch)
+    assert len(calls) == 3
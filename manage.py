@@ -103,33 +103,50 @@ def cmd_ultimate_restart(_: argparse.Namespace) -> None:
     if not job_id:
         sys.stderr.write("Ingest response missing id: " + out + "\n")
         raise SystemExit(1)
-    # Poll job status up to 60s
-    for _ in range(60):
-        rc, out, err = run_capture([
+    # Follow job progress over Server-Sent Events until the job finishes
+    proc = subprocess.Popen(
+        [
             "docker", "run", "--rm",
             "--network", "dnd_helper_default",
             "curlimages/curl:8.10.1",
-            "-sS",
+            "-sS", "-N",
+            "--max-time", "600",
             "-H", f"Authorization: Bearer {admin_token}",
-            f"http://api:8000/admin-api/ingest/jobs/{job_id}",
-        ])
-        if rc != 0:
-            sys.stderr.write(err)
-            raise SystemExit(rc)
-        try:
-            data = _json.loads(out)
-            status = str(data.get("status") or "")
-        except Exception:
-            sys.stderr.write("Failed to parse job status: " + out + "\n")
-            raise SystemExit(1)
-        if status == "succeeded":
-            break
-        if status == "failed":
-            sys.stderr.write("Ingest job failed: " + out + "\n")
-            raise SystemExit(2)
-        time.sleep(1)
-    else:
-        sys.stderr.write("Ingest job did not complete within timeout\n")
+            f"http://api:8000/admin-api/ingest/jobs/{job_id}/events",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    event = ""
+    data: dict = {}
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        line = line.rstrip("\n")
+        if line.startswith("event:"):
+            event = line.split(":", 1)[1].strip()
+        elif line.startswith("data:"):
+            try:
+                data = _json.loads(line.split(":", 1)[1])
+            except Exception:
+                continue
+            progress = (data.get("counters") or {}).get("progress") or {}
+            summary = (data.get("counters") or {}).get("summary") or {}
+            sys.stdout.write(
+                f"[{data.get('status')}] rows={summary.get('processed', 0)}"
+                f"/{progress.get('rows_expected') or '?'}"
+                f" rate={progress.get('rows_per_sec', 0)}/s"
+                f" eta={progress.get('eta_seconds')}s\n"
+            )
+            sys.stdout.flush()
+            if event == "done":
+                break
+    proc.wait()
+    status = str(data.get("status") or "")
+    if status == "failed":
+        sys.stderr.write("Ingest job failed: " + _json.dumps(data) + "\n")
+        raise SystemExit(2)
+    if status != "succeeded":
+        sys.stderr.write("Ingest job did not complete (event stream ended)\n")
         raise SystemExit(3)
 
 
@@ -198,6 +215,54 @@ def cmd_upgrade(_: argparse.Namespace) -> None:
     ])
 
 
+def cmd_bench_ingest(args: argparse.Namespace) -> None:
+    """Benchmark per-row vs bulk (COPY) bundle ingest inside the API container."""
+    run_command([
+        "docker", "compose", "exec", "-T", "api",
+        "python", "-m", "dnd_helper_api.ingest.benchmark",
+        "--rows", str(args.rows), "--modes", args.modes,
+    ])
+
+
+def cmd_bench_render(args: argparse.Namespace) -> None:
+    """Benchmark cached vs uncached filter menu rendering inside the bot container."""
+    run_command([
+        "docker", "compose", "exec", "-T", "bot",
+        "python", "-m", "dnd_helper_bot.utils.render_benchmark",
+        "--iterations", str(args.iterations),
+    ])
+
+
+def cmd_backfill_derived(args: argparse.Namespace) -> None:
+    """Recompute derived monster/spell columns in chunks inside the API container."""
+    cmd = [
+        "docker", "compose", "exec", "-T", "api",
+        "python", "-m", "dnd_helper_api.backfill",
+        "--tables", args.tables, "--batch-rows", str(args.batch_rows), "--sleep", str(args.sleep),
+    ]
+    if args.restart:
+        cmd.append("--restart")
+    run_command(cmd)
+
+
+def cmd_export_bundle(args: argparse.Namespace) -> None:
+    """Export the catalog DB as an ingestible bundle, streamed out of the API container."""
+    fmt = args.format or ("tar.gz" if args.out.endswith((".tar.gz", ".tgz")) else "zip")
+    with open(args.out, "wb") as out:
+        result = subprocess.run(
+            [
+                "docker", "compose", "exec", "-T", "api",
+                "python", "-m", "dnd_helper_api.ingest.export",
+                "--out", "-", "--format", fmt, "--mode", args.mode,
+            ],
+            check=False,
+            stdout=out,
+        )
+    if result.returncode != 0:
+        os.unlink(args.out)
+        raise SystemExit(result.returncode)
+
+
 def cmd_lint(args: argparse.Namespace) -> None:
     """Run Ruff linter inside dedicated container (ruff service)."""
     command = [
@@ -268,6 +333,45 @@ def build_parser() -> argparse.ArgumentParser:
     )
     upgrade.set_defaults(func=cmd_upgrade)
 
+    bench_ingest = subparsers.add_parser(
+        "bench_ingest",
+        help="Benchmark bundle ingest rows/sec: per-row vs bulk COPY (API service)",
+    )
+    bench_ingest.add_argument("--rows", type=int, default=2000, help="Entities per type")
+    bench_ingest.add_argument("--modes", default="row,bulk", help="Comma-separated: row, bulk")
+    bench_ingest.set_defaults(func=cmd_bench_ingest)
+
+    bench_render = subparsers.add_parser(
+        "bench_render",
+        help="Benchmark filter menu rendering with and without the render cache (bot service)",
+    )
+    bench_render.add_argument(
+        "--iterations", type=int, default=2000, help="Renders per filter state"
+    )
+    bench_render.set_defaults(func=cmd_bench_render)
+
+    backfill_derived = subparsers.add_parser(
+        "backfill_derived",
+        help="Recompute derived monster/spell columns in resumable chunks (API service)",
+    )
+    backfill_derived.add_argument("--tables", default="monster,spell", help="Comma-separated")
+    backfill_derived.add_argument("--batch-rows", type=int, default=1000, help="Rows per chunk")
+    backfill_derived.add_argument("--sleep", type=float, default=0.0, help="Pause between chunks")
+    backfill_derived.add_argument("--restart", action="store_true", help="Ignore saved progress")
+    backfill_derived.set_defaults(func=cmd_backfill_derived)
+
+    export_bundle = subparsers.add_parser(
+        "export_bundle",
+        help="Export the catalog as a bundle archive (.zip or .tar.gz) that bundle ingest accepts",
+    )
+    export_bundle.add_argument("--out", required=True, help="Archive path on the host")
+    export_bundle.add_argument("--format", choices=["zip", "tar.gz"], help="Default: from --out")
+    export_bundle.add_argument(
+        "--mode", choices=["upsert", "authoritative_snapshot"], default="upsert",
+        help="Manifest mode",
+    )
+    export_bundle.set_defaults(func=cmd_export_bundle)
+
     lint = subparsers.add_parser(
         "lint",
         help="Run Ruff linter (containerized)",
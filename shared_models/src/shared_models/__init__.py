@@ -6,6 +6,7 @@ Place SQLModel ORM and validation models here to be reused across services.
 from .admin_audit import AdminAudit
 from .admin_job import AdminJob
 from .base import BaseModel
+from .catalog import CatalogPayload, CatalogState
 from .enum_translation import EnumTranslation
 from .enums import CasterClass, DangerLevel, SpellSchool
 from .monster import Monster
@@ -29,6 +30,8 @@ __all__ = [
     "UiTranslation",
     "AdminAudit",
     "AdminJob",
+    "CatalogState",
+    "CatalogPayload",
 ]
 
 
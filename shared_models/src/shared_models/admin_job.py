@@ -24,6 +24,8 @@ class AdminJob(BaseModel, table=True):
     job_type: str = Field(index=True)
     args: Optional[dict] = Field(default=None, sa_type=JSONB)
     file_path: Optional[str] = Field(default=None)
+    # sha256 of the uploaded file; blobs are stored (and deduplicated) under it
+    file_sha256: Optional[str] = Field(default=None, max_length=64, index=True)
 
     status: str = Field(index=True)  # queued | running | succeeded | failed
     counters: Optional[dict] = Field(default=None, sa_type=JSONB)
@@ -42,3 +44,21 @@ class AdminJob(BaseModel, table=True):
         sa_column_kwargs={"nullable": True},
     )
 
+    # Queue lease: a running job belongs to `worker_id` until `lease_expires_at`.
+    # Workers extend the lease via heartbeats; expired leases are reclaimed.
+    worker_id: Optional[str] = Field(default=None, index=True)
+    lease_expires_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"nullable": True},
+    )
+    heartbeat_at: datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"nullable": True},
+    )
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+    # Resume point for bundle ingest: file index, line offset, uid->id maps, counters
+    checkpoint: Optional[dict] = Field(default=None, sa_type=JSONB)
+
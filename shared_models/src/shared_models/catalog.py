@@ -0,0 +1,30 @@
+from typing import Optional
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import TEXT
+from sqlmodel import Field
+
+from .base import BaseModel
+
+
+class CatalogState(BaseModel, table=True):
+    """Single-row catalog version; bumped in the transaction that changes content."""
+
+    __tablename__ = "catalog_state"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0)
+
+
+class CatalogPayload(BaseModel, table=True):
+    """Pre-serialized JSON response body of a catalog read endpoint.
+
+    A row is only served while its `version` equals `CatalogState.version`.
+    """
+
+    __tablename__ = "catalog_payloads"
+
+    kind: str = Field(primary_key=True)  # e.g. "monsters:list_wrapped"
+    lang: str = Field(sa_type=String(), primary_key=True)
+    version: int = Field(index=True)
+    body: Optional[str] = Field(default=None, sa_type=TEXT)
@@ -4,6 +4,7 @@ from enum import Enum
 class DangerLevel(str, Enum):
     """Challenge Rating values for monsters (final)."""
 
+    CR_0 = "0"
     CR_1_8 = "1/8"
     CR_1_4 = "1/4"
     CR_1_2 = "1/2"